@@ -6,6 +6,9 @@ echo "==> Installing dependencies"
 pip install --upgrade pip
 pip install -r requirements.txt
 
+echo "==> Installing headless Chromium for the browser service"
+python3 -m playwright install chromium
+
 echo "==> Collecting static files"
 python3 manage.py collectstatic --noinput
 
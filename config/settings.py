@@ -83,6 +83,120 @@ GITHUB_CLIENT_SECRET = os.getenv("GITHUB_CLIENT_SECRET")
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 
+# --------------------------------------------------
+# PLATFORM SYNC
+# --------------------------------------------------
+
+# Thread pool size and per-platform timeouts (seconds) for "sync all"
+SYNC_ALL_MAX_WORKERS = int(os.getenv("SYNC_ALL_MAX_WORKERS", "5"))
+SYNC_DEFAULT_TIMEOUT = 30
+SYNC_TIMEOUTS = {
+    "github": 30,
+    "leetcode": 20,
+    "gfg": 90,
+    "codechef": 25,
+    "hackerrank": 25,
+}
+
+# Freshness window per platform (seconds): a sync inside it is a no-op and
+# the profile page only refreshes accounts older than this in the background
+SYNC_DEFAULT_TTL = 900
+SYNC_TTL = {
+    "github": 900,
+    "leetcode": 900,
+    "gfg": 1800,
+    "codechef": 900,
+    "hackerrank": 900,
+}
+SYNC_REVALIDATE_BACKOFF = 300
+
+# One fetch per PlatformAccount at a time, whichever job or view asked for
+# it; a claim left by a crashed sync expires after this many seconds
+SYNC_CLAIM_TIMEOUT = 600
+
+# run_jobs stamps a running job every JOB_HEARTBEAT_INTERVAL seconds; a job
+# left "running" without a stamp for JOB_STALE_AFTER seconds lost its worker
+# (crash, restart, deploy) and is queued again
+JOB_HEARTBEAT_INTERVAL = 30
+JOB_STALE_AFTER = 120
+
+# Run sync and AI requests inside the request with the async fetchers
+# instead of queueing a job. Only worth it when serving config.asgi.
+SYNC_INLINE = os.getenv("SYNC_INLINE", "False").lower() == "true"
+
+# Shared HTTP client (core/services/http_client.py)
+HTTP_POOL_HOSTS = 10
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+HTTP_MAX_RETRIES = 2
+HTTP_BACKOFF_FACTOR = 0.5
+
+# Async client (ASGI views): connections shared by every in-flight request
+ASYNC_HTTP_MAX_CONNECTIONS = 200
+ASYNC_HTTP_MAX_KEEPALIVE = 50
+
+# Headless browser pool (`manage.py browser_service`) used for GFG pages
+# (Render's fromService hostport gives "host:port", without a scheme)
+BROWSER_SERVICE_URL = os.getenv("BROWSER_SERVICE_URL", "http://127.0.0.1:8765")
+if "://" not in BROWSER_SERVICE_URL:
+    BROWSER_SERVICE_URL = f"http://{BROWSER_SERVICE_URL}"
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+BROWSER_MAX_PAGES = int(os.getenv("BROWSER_MAX_PAGES", "50"))
+BROWSER_MAX_RSS_MB = int(os.getenv("BROWSER_MAX_RSS_MB", "700"))
+BROWSER_ALLOWED_HOSTS = ["www.geeksforgeeks.org", "auth.geeksforgeeks.org"]
+
+# Shared per-host token bucket (requests/sec, burst) and circuit breaker.
+# Only hosts listed here are throttled.
+HOST_LIMITS = {
+    "leetcode.com": {"rate": 2, "burst": 5},
+    "www.codechef.com": {"rate": 2, "burst": 5},
+    "www.hackerrank.com": {"rate": 2, "burst": 5},
+    "github.com": {"rate": 5, "burst": 10},
+    "api.github.com": {"rate": 5, "burst": 10},
+    "api.groq.com": {"rate": 2, "burst": 4},
+}
+HOST_LIMIT_MAX_WAIT = 5
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_COOLDOWN = 60
+
+# Logins per aliased GitHub GraphQL query in bulk syncs, and the longest
+# we will sleep waiting for the GraphQL budget to reset
+GITHUB_GRAPHQL_BATCH = 50
+GITHUB_RATE_LIMIT_MAX_SLEEP = 900
+
+# Users per aliased LeetCode GraphQL query in bulk syncs
+LEETCODE_GRAPHQL_BATCH = 20
+
+# XP formula version applied by syncs (core.services.xp.XP_FORMULAS). Stored
+# stats were scored with 1; switching is explicit: preview with
+# `recompute_xp --formula 2 --dry-run`, then set it and run `recompute_xp`
+XP_FORMULA_VERSION = int(os.getenv("XP_FORMULA_VERSION", "1"))
+
+# Stats changes within this many seconds share one leaderboard re-rank job;
+# the leaderboard page reads LeaderboardEntry, LEADERBOARD_PAGE_SIZE per page
+LEADERBOARD_REFRESH_DELAY = 30
+LEADERBOARD_PAGE_SIZE = 50
+
+# Each process ranks profiles from an in-memory index (core.services.rank_index):
+# it picks up other processes' stats changes every RANK_INDEX_SYNC_INTERVAL
+# seconds and is rebuilt from UserStats every RANK_INDEX_REBUILD_INTERVAL
+RANK_INDEX_SYNC_INTERVAL = 10
+RANK_INDEX_REBUILD_INTERVAL = 3600
+
+# Upstream origin per platform. PLATFORM_STANDIN_URL points every one of
+# them at the offline stand-in (python manage.py platform_standin).
+PLATFORM_URLS = {
+    "leetcode": "https://leetcode.com",
+    "github_api": "https://api.github.com",
+    "github_web": "https://github.com",
+    "codechef": "https://www.codechef.com",
+    "hackerrank": "https://www.hackerrank.com",
+    "gfg_api": "https://authapi.geeksforgeeks.org",
+    "gfg": "https://www.geeksforgeeks.org",
+}
+PLATFORM_STANDIN_URL = os.getenv("PLATFORM_STANDIN_URL", "").rstrip("/")
+if PLATFORM_STANDIN_URL:
+    PLATFORM_URLS = {name: f"{PLATFORM_STANDIN_URL}/{name}" for name in PLATFORM_URLS}
+
 # --------------------------------------------------
 # APPLICATIONS
 # --------------------------------------------------
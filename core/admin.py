@@ -16,9 +16,15 @@ from .models import (
     Platform,
     PlatformAccount,
     DailyActivity,
+    PlatformSnapshot,
     UserHeatmap,
     UserStats,
+    PlatformStats,
     LeaderboardEntry,
+    XPRollup,
+    XPDistribution,
+    BackgroundJob,
+    ExternalHost,
 )
 
 # ==================================================
@@ -135,11 +141,17 @@ class PlatformAdmin(admin.ModelAdmin):
 
 @admin.register(PlatformAccount)
 class PlatformAccountAdmin(admin.ModelAdmin):
-    list_display = ("user", "platform", "username", "last_synced")
+    list_display = ("user", "platform", "username", "last_synced", "fetch_strategy")
     search_fields = ("user__username", "username", "platform__name")
     list_filter = ("platform", "last_synced")
 
 
+@admin.register(ExternalHost)
+class ExternalHostAdmin(admin.ModelAdmin):
+    list_display = ("host", "tokens", "failures", "opened_until")
+    search_fields = ("host",)
+
+
 @admin.register(DailyActivity)
 class DailyActivityAdmin(admin.ModelAdmin):
     list_display = ("account", "date", "xp")
@@ -148,6 +160,14 @@ class DailyActivityAdmin(admin.ModelAdmin):
     date_hierarchy = "date"
 
 
+@admin.register(PlatformSnapshot)
+class PlatformSnapshotAdmin(admin.ModelAdmin):
+    list_display = ("account", "taken_at", "solved", "rating", "repos", "contributions", "xp", "xp_delta")
+    list_filter = ("account__platform",)
+    search_fields = ("account__user__username", "account__username")
+    date_hierarchy = "taken_at"
+
+
 @admin.register(UserHeatmap)
 class UserHeatmapAdmin(admin.ModelAdmin):
     list_display = ("user", "date", "activity_score", "total_xp")
@@ -166,9 +186,42 @@ class UserStatsAdmin(admin.ModelAdmin):
     search_fields = ("user__username",)
 
 
+@admin.register(PlatformStats)
+class PlatformStatsAdmin(admin.ModelAdmin):
+    list_display = ("user", "platform", "solved", "xp", "updated_at")
+    list_filter = ("platform",)
+    search_fields = ("user__username",)
+    readonly_fields = ("updated_at",)
+
+
 @admin.register(LeaderboardEntry)
 class LeaderboardEntryAdmin(admin.ModelAdmin):
     list_display = ("rank", "user", "xp")
     ordering = ("rank",)
     search_fields = ("user__username",)
-    readonly_fields = ("updated_at",)
\ No newline at end of file
+    readonly_fields = ("updated_at",)
+
+
+@admin.register(XPRollup)
+class XPRollupAdmin(admin.ModelAdmin):
+    list_display = ("user", "platform", "period", "start", "xp")
+    list_filter = ("platform", "period")
+    search_fields = ("user__username",)
+    date_hierarchy = "start"
+
+
+@admin.register(XPDistribution)
+class XPDistributionAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "updated_at")
+    readonly_fields = ("updated_at",)
+
+# ==================================================
+#                BACKGROUND JOBS
+# ==================================================
+
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "kind", "user", "status", "attempts", "created_at", "finished_at")
+    list_filter = ("kind", "status")
+    search_fields = ("user__username",)
+    readonly_fields = ("created_at", "started_at", "finished_at")
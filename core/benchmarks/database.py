@@ -0,0 +1,34 @@
+"""
+Throwaway database for benchmarks that write (users, accounts, stats,
+jobs), so they never touch the configured one.
+"""
+
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+@contextmanager
+def throwaway_database():
+    """
+    Run the block against a freshly migrated test database (Django's test
+    database for the default alias), destroyed afterwards.
+    """
+    connection = connections[DEFAULT_DB_ALIAS]
+    old_name = connection.settings_dict["NAME"]
+    tmpdir = None
+    if connection.vendor == "sqlite":
+        # a file rather than :memory:, so benchmark threads share it
+        tmpdir = tempfile.mkdtemp(prefix="studystack-bench-")
+        connection.settings_dict["TEST"]["NAME"] = str(Path(tmpdir) / "bench.sqlite3")
+
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        if tmpdir:
+            shutil.rmtree(tmpdir, ignore_errors=True)
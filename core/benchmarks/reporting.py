@@ -0,0 +1,9 @@
+"""Helpers shared by the benchmark and bulk-resync commands."""
+
+
+def percentile(values, pct):
+    """Nearest-rank `pct` percentile of `values` (0.0 when empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))]
@@ -0,0 +1,302 @@
+"""
+Offline stand-in for every platform the syncs talk to.
+
+Serves the recorded responses in core/benchmarks/fixtures under
+/<platform>/... (the keys of settings.PLATFORM_URLS), with configurable
+latency, injected 5xx errors and a per-platform request rate above which
+it answers 429 + Retry-After. Point the syncs at it with
+PLATFORM_STANDIN_URL, or override settings.PLATFORM_URLS with
+`standin.platform_urls()` in-process.
+
+Logins starting with "missing" are unknown users on every platform.
+"""
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from django.conf import settings
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+MISSING_PREFIX = "missing"
+
+
+def _missing(username):
+    return username.lower().startswith(MISSING_PREFIX)
+
+
+class Recordings:
+    """The fixture files, read once; "{username}" is filled in per request."""
+
+    def __init__(self, fixtures=FIXTURES_DIR):
+        self.fixtures = Path(fixtures)
+        self._cache = {}
+
+    def text(self, name, username=""):
+        if name not in self._cache:
+            self._cache[name] = (self.fixtures / name).read_text(encoding="utf-8")
+        return self._cache[name].replace("{username}", username)
+
+    def json(self, name, username=""):
+        return json.loads(self.text(name, username))
+
+
+# =========================================
+# Routes: (method, platform, path regex) -> handler(recordings, match, query, body)
+# Handlers return (status, content type, body) or None for 404.
+# =========================================
+def _json(body):
+    return 200, "application/json", json.dumps(body)
+
+
+def _html(text):
+    return 200, "text/html; charset=utf-8", text
+
+
+def _graphql_variables(body):
+    return (json.loads(body or b"{}").get("variables") or {})
+
+
+def _leetcode_graphql(recordings, match, query, body):
+    variables = _graphql_variables(body)
+    user = recordings.json("leetcode_user.json")
+
+    if "username" in variables:
+        if _missing(variables["username"]):
+            return _json({"data": {"matchedUser": None, "userContestRanking": None}})
+        return _json({"data": user})
+
+    # aliased bulk query: m{i}/c{i} per $u{i}
+    data, errors = {}, []
+    for key, username in variables.items():
+        i = key[1:]
+        if _missing(username):
+            data[f"m{i}"] = data[f"c{i}"] = None
+            errors.append({"message": "That user does not exist.", "path": [f"m{i}"]})
+        else:
+            data[f"m{i}"] = user["matchedUser"]
+            data[f"c{i}"] = user["userContestRanking"]
+    return _json({"data": data, **({"errors": errors} if errors else {})})
+
+
+def _github_graphql(recordings, match, query, body):
+    node = recordings.json("github_graphql_user.json")
+    reset_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() + 3600))
+
+    data = {"rateLimit": {"cost": 1, "remaining": 4999, "resetAt": reset_at}}
+    errors = []
+    for key, login in _graphql_variables(body).items():
+        if _missing(login):
+            data[key] = None
+            errors.append({"type": "NOT_FOUND", "path": [key]})
+        else:
+            data[key] = node
+    return _json({"data": data, **({"errors": errors} if errors else {})})
+
+
+def _user_route(fixture, render):
+    def handler(recordings, match, query, body):
+        username = match.group("username")
+        if _missing(username):
+            return None
+        return render(recordings.text(fixture, username))
+    return handler
+
+
+def _gfg_api(recordings, match, query, body):
+    handle = (query.get("handle") or [""])[0]
+    if not handle or _missing(handle):
+        return None
+    return 200, "application/json", recordings.text("gfg_profile.json", handle)
+
+
+def _gfg_page(recordings, match, query, body):
+    username = match.group("username")
+    if _missing(username):
+        return None
+    next_data = recordings.text("gfg_profile.json", username)
+    return _html(
+        f'<html><body><div id="__next"></div>'
+        f'<script id="__NEXT_DATA__" type="application/json">{next_data}</script>'
+        f"</body></html>"
+    )
+
+
+ROUTES = [
+    ("POST", "leetcode", r"/graphql/?", _leetcode_graphql),
+    ("POST", "github_api", r"/graphql", _github_graphql),
+    ("GET", "github_api", r"/users/(?P<username>[^/]+)",
+     _user_route("github_user.json", lambda text: (200, "application/json", text))),
+    ("GET", "github_web", r"/users/(?P<username>[^/]+)/contributions",
+     _user_route("github_contributions.html", _html)),
+    ("GET", "codechef", r"/users/(?P<username>[^/]+)",
+     _user_route("codechef_profile.html", _html)),
+    ("GET", "hackerrank", r"/rest/hackers/(?P<username>[^/]+)/profile",
+     _user_route("hackerrank_profile.json", lambda text: (200, "application/json", text))),
+    ("GET", "hackerrank", r"/profile/(?P<username>[^/]+)",
+     _user_route("hackerrank_profile.html", _html)),
+    ("GET", "gfg_api", r"/api-get/user-profile-info/?", _gfg_api),
+    ("GET", "gfg", r"/profile/(?P<username>[^/]+)/?", _gfg_page),
+]
+ROUTES = [(method, platform, re.compile(pattern), handler) for method, platform, pattern, handler in ROUTES]
+
+
+# =========================================
+# Server
+# =========================================
+class PlatformStandin:
+    """
+    Threaded HTTP server replaying the recordings.
+
+        with PlatformStandin(latency=0.3, error_rate=0.05) as standin:
+            with override_settings(PLATFORM_URLS=standin.platform_urls()):
+                sync_platform(user, "leetcode")
+
+    `latency` (+ up to `jitter`) seconds is added to every response,
+    `error_rate` of requests get a 503, and above `rate` requests/sec per
+    platform (burst = rate) requests get a 429 with Retry-After: 1.
+    GET responses carry an ETag and honour If-None-Match.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0,
+                 error_rate=0.0, rate=None, fixtures=FIXTURES_DIR, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate = rate
+        self.recordings = Recordings(fixtures)
+        self.requests = Counter()  # (platform, status) -> count
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._buckets = {}  # platform -> (tokens, refilled_at)
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def platform_urls(self):
+        return {name: f"{self.url}/{name}" for name in settings.PLATFORM_URLS}
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # -------------------------
+    # Fault injection
+    # -------------------------
+    def _delay(self):
+        with self._lock:
+            extra = self._random.uniform(0, self.jitter) if self.jitter else 0.0
+        return self.latency + extra
+
+    def _should_fail(self):
+        if not self.error_rate:
+            return False
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def _take_token(self, platform):
+        if not self.rate:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            tokens, refilled_at = self._buckets.get(platform, (float(self.rate), now))
+            tokens = min(float(self.rate), tokens + (now - refilled_at) * self.rate)
+            if tokens < 1:
+                self._buckets[platform] = (tokens, now)
+                return False
+            self._buckets[platform] = (tokens - 1, now)
+            return True
+
+    def _respond(self, method, path, query, body, headers):
+        platform, _, rest = path.lstrip("/").partition("/")
+        rest = "/" + rest
+
+        if not self._take_token(platform):
+            return platform, 429, "application/json", '{"message": "rate limited"}', {"Retry-After": "1"}
+
+        time.sleep(self._delay())
+
+        if self._should_fail():
+            return platform, 503, "text/plain", "upstream unavailable", {}
+
+        for route_method, route_platform, pattern, handler in ROUTES:
+            if route_method != method or route_platform != platform:
+                continue
+            match = pattern.fullmatch(rest)
+            if match:
+                result = handler(self.recordings, match, query, body)
+                if result is None:
+                    break
+                status, content_type, text = result
+                extra = {}
+                if method == "GET":
+                    etag = '"%s"' % hashlib.sha1(text.encode()).hexdigest()[:16]
+                    extra["ETag"] = etag
+                    if headers.get("If-None-Match") == etag:
+                        return platform, 304, content_type, "", extra
+                return platform, status, content_type, text, extra
+
+        return platform, 404, "application/json", '{"message": "Not Found"}', {}
+
+    def _handler_class(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _serve(self):
+                parts = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+
+                platform, status, content_type, text, extra = standin._respond(
+                    self.command, parts.path, parse_qs(parts.query), body, self.headers
+                )
+                with standin._lock:
+                    standin.requests[(platform, status)] += 1
+
+                payload = text.encode()
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in extra.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                if payload:
+                    self.wfile.write(payload)
+
+            do_GET = _serve
+            do_POST = _serve
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
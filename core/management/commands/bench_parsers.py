@@ -0,0 +1,80 @@
+import time
+import tracemalloc
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+from django.core.management.base import BaseCommand
+
+from core.services.codechef import parse_codechef_html
+from core.services.github import parse_github_calendar, parse_github_contributions
+from core.services.hackerrank import parse_hackerrank_html
+
+FIXTURES_DIR = Path(__file__).resolve().parents[2] / "benchmarks" / "fixtures"
+
+# fixture file -> parsers run over it
+PARSERS = {
+    "codechef_profile.html": [("codechef", parse_codechef_html)],
+    "github_contributions.html": [
+        ("github contributions", parse_github_contributions),
+        ("github calendar", lambda html: len(parse_github_calendar(html)["days"])),
+    ],
+    "hackerrank_profile.html": [("hackerrank", parse_hackerrank_html)],
+}
+
+
+def _full_soup_text(html):
+    """What every scraper used to do first: whole BeautifulSoup tree + get_text()."""
+    return len(BeautifulSoup(html, "lxml").get_text("\n", strip=True))
+
+
+def _measure(func, html, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        result = func(html)
+    elapsed_ms = (time.perf_counter() - started) * 1000 / iterations
+
+    # one extra run under tracemalloc so tracing overhead stays out of the timing
+    tracemalloc.start()
+    func(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, elapsed_ms, peak / 1024
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the profile page parsers over saved HTML fixtures and report peak "
+        "Python heap use (tracemalloc; libxml2's own buffers are not included)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--fixtures", default=str(FIXTURES_DIR),
+                            help="Directory with the saved profile pages")
+        parser.add_argument("--baseline", action="store_true",
+                            help="Also time a full BeautifulSoup parse + get_text() of each page")
+
+    def handle(self, *args, **options):
+        fixtures = Path(options["fixtures"])
+        iterations = options["iterations"]
+
+        self.stdout.write(f"{'parser':<24} {'fixture':<26} {'KB':>7} {'ms/parse':>9} {'peak KB':>9}  result")
+
+        for name, parsers in PARSERS.items():
+            path = fixtures / name
+            if not path.exists():
+                self.stderr.write(f"missing fixture: {path}")
+                continue
+
+            html = path.read_text(encoding="utf-8")
+            size_kb = len(html.encode()) / 1024
+
+            if options["baseline"]:
+                parsers = [*parsers, ("bs4 full page (old)", _full_soup_text)]
+
+            for label, func in parsers:
+                result, elapsed_ms, peak_kb = _measure(func, html, iterations)
+                self.stdout.write(
+                    f"{label:<24} {name:<26} {size_kb:>7.0f} {elapsed_ms:>9.2f} {peak_kb:>9.0f}  {result}"
+                )
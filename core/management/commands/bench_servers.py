@@ -0,0 +1,145 @@
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.models import User
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from core.benchmarks.reporting import percentile
+from core.benchmarks.standin import PlatformStandin
+from core.models import Platform, PlatformAccount
+
+BENCH_USER_PREFIX = "bench_sync_"
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare concurrent LeetCode sync throughput under gunicorn sync workers "
+        "and a single uvicorn ASGI worker, against a local slow upstream. "
+        "The servers write bench users and syncs to the configured database, "
+        "so it only runs with DEBUG or --allow-writes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100,
+                            help="Bench accounts, one sync request each")
+        parser.add_argument("--concurrency", type=int, default=100,
+                            help="Client requests in flight at once")
+        parser.add_argument("--latency", type=float, default=0.5,
+                            help="Upstream response time in seconds")
+        parser.add_argument("--workers", type=int, default=2,
+                            help="gunicorn sync workers (Procfile uses 2)")
+        parser.add_argument("--port", type=int, default=8901)
+        parser.add_argument("--allow-writes", action="store_true",
+                            help="Run against the configured database even without DEBUG")
+
+    def handle(self, *args, **options):
+        if not (settings.DEBUG or options["allow_writes"]):
+            raise CommandError(
+                "bench_servers creates users and syncs in the configured database; "
+                "run it with DEBUG or pass --allow-writes"
+            )
+
+        upstream = PlatformStandin(latency=options["latency"]).start()
+
+        cookies = self._create_users(options["users"])
+        servers = [
+            (
+                f"gunicorn, {options['workers']} sync workers",
+                [sys.executable, "-m", "gunicorn", "config.wsgi:application",
+                 "--workers", str(options["workers"]), "--bind", f"127.0.0.1:{options['port']}",
+                 "--timeout", "120", "--log-level", "warning"],
+            ),
+            (
+                "uvicorn, 1 ASGI worker",
+                [sys.executable, "-m", "uvicorn", "config.asgi:application",
+                 "--host", "127.0.0.1", "--port", str(options["port"]), "--log-level", "warning"],
+            ),
+        ]
+
+        env = {
+            **os.environ,
+            "SYNC_INLINE": "true",
+            "PLATFORM_STANDIN_URL": upstream.url,
+        }
+
+        try:
+            for label, command in servers:
+                PlatformAccount.objects.filter(
+                    user__username__startswith=BENCH_USER_PREFIX
+                ).update(last_synced=None)
+
+                process = subprocess.Popen(command, cwd=settings.BASE_DIR, env=env)
+                try:
+                    self._wait_until_up(options["port"])
+                    self._run(label, options, cookies)
+                finally:
+                    process.terminate()
+                    process.wait(timeout=30)
+        finally:
+            upstream.stop()
+            User.objects.filter(username__startswith=BENCH_USER_PREFIX).delete()
+
+    def _create_users(self, count):
+        platform, _ = Platform.objects.get_or_create(
+            slug="leetcode", defaults={"name": "LeetCode", "base_url": "https://leetcode.com"}
+        )
+        User.objects.filter(username__startswith=BENCH_USER_PREFIX).delete()
+
+        cookies = []
+        for i in range(count):
+            user = User.objects.create_user(f"{BENCH_USER_PREFIX}{i}")
+            PlatformAccount.objects.create(user=user, platform=platform, username=f"bench{i}")
+
+            session = SessionStore()
+            session[SESSION_KEY] = str(user.pk)
+            session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+            session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+            session.create()
+            cookies.append({settings.SESSION_COOKIE_NAME: session.session_key})
+        return cookies
+
+    def _wait_until_up(self, port, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                requests.get(f"http://127.0.0.1:{port}{reverse('health_check')}", timeout=1)
+                return
+            except requests.RequestException:
+                time.sleep(0.2)
+        raise RuntimeError(f"server on port {port} did not start")
+
+    def _run(self, label, options, cookies):
+        url = f"http://127.0.0.1:{options['port']}{reverse('leetcode_sync')}"
+
+        def one(cookie):
+            started = time.monotonic()
+            response = requests.get(
+                url, cookies=cookie, allow_redirects=False, timeout=300,
+                headers={"X-Forwarded-Proto": "https"},
+            )
+            return response.status_code, time.monotonic() - started
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            results = list(pool.map(one, cookies))
+        elapsed = time.monotonic() - started
+
+        latencies = [seconds for _, seconds in results]
+        ok = sum(1 for status, _ in results if status == 302)
+        synced = PlatformAccount.objects.filter(
+            user__username__startswith=BENCH_USER_PREFIX, last_synced__isnull=False
+        ).count()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{label}: {len(results)} syncs in {elapsed:.2f}s "
+            f"({len(results) / elapsed:.1f} syncs/sec), {ok} ok, {synced} accounts synced, "
+            f"p50 {percentile(latencies, 50):.2f}s, p95 {percentile(latencies, 95):.2f}s"
+        ))
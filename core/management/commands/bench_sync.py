@@ -0,0 +1,188 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+
+from core.benchmarks.database import throwaway_database
+from core.benchmarks.reporting import percentile
+from core.benchmarks.standin import PlatformStandin
+from core.models import Platform, PlatformAccount
+from core.services.http_client import metered
+from core.services.sync import PLATFORM_FETCHERS, bulk_fetchers, save_account, sync_platform
+
+BENCH_USER_PREFIX = "bench_standin_"
+
+PLATFORM_NAMES = {
+    "github": ("GitHub", "https://github.com"),
+    "leetcode": ("LeetCode", "https://leetcode.com"),
+    "gfg": ("GeeksforGeeks", "https://www.geeksforgeeks.org"),
+    "codechef": ("CodeChef", "https://www.codechef.com"),
+    "hackerrank": ("HackerRank", "https://www.hackerrank.com"),
+}
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _timed(func, *args):
+    """Run func(*args); return (elapsed, queries, requests, error)."""
+    queries = _QueryCounter()
+    started = time.monotonic()
+    error = None
+    try:
+        with metered() as usage, connection.execute_wrapper(queries):
+            func(*args)
+    except Exception as e:
+        error = e
+    finally:
+        if threading.current_thread() is not threading.main_thread():
+            connection.close()
+    return time.monotonic() - started, queries.count, usage["requests"], error
+
+
+def _sync_bulk(fetcher, accounts):
+    for account, fields, error in fetcher(accounts):
+        if error is not None:
+            raise error
+        save_account(account, fields)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark each sync_* function and the bulk paths against the offline "
+        "platform stand-in: throughput, p95 latency and DB queries per sync. "
+        "Runs in a throwaway test database, never the configured one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=20)
+        parser.add_argument("--platform", action="append", choices=sorted(PLATFORM_FETCHERS),
+                            help="Only benchmark these platforms (repeatable)")
+        parser.add_argument("--concurrency", type=int, default=1,
+                            help="Syncs in flight at once (threads)")
+        parser.add_argument("--rounds", type=int, default=2,
+                            help="Round 1 is cold; later rounds revalidate with ETags")
+        parser.add_argument("--no-bulk", action="store_true",
+                            help="Skip the aliased GraphQL bulk paths")
+        parser.add_argument("--latency", type=float, default=0.2,
+                            help="Stand-in seconds per response")
+        parser.add_argument("--jitter", type=float, default=0.05)
+        parser.add_argument("--error-rate", type=float, default=0.0,
+                            help="Fraction of stand-in responses that are 503s")
+        parser.add_argument("--rate", type=float, default=None,
+                            help="Stand-in requests/sec per platform before 429s")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        slugs = options["platform"] or list(PLATFORM_FETCHERS)
+        standin = PlatformStandin(
+            latency=options["latency"],
+            jitter=options["jitter"],
+            error_rate=options["error_rate"],
+            rate=options["rate"],
+            seed=options["seed"],
+        )
+
+        self.stdout.write(
+            f"{'path':<22} {'round':>5} {'syncs':>6} {'errors':>6} {'syncs/s':>8} "
+            f"{'p50 s':>7} {'p95 s':>7} {'queries':>8} {'requests':>9}"
+        )
+
+        with throwaway_database(), standin, override_settings(PLATFORM_URLS=standin.platform_urls()):
+            users = self._create_users(options["users"], slugs)
+            for round_number in range(1, options["rounds"] + 1):
+                for slug in slugs:
+                    self._bench(
+                        f"sync {slug}", round_number, options["concurrency"],
+                        [(sync_platform, user, slug) for user in users],
+                    )
+
+            if not options["no_bulk"]:
+                self._bench_bulk(slugs, options["concurrency"])
+
+        self.stdout.write("stand-in responses: " + ", ".join(
+            f"{platform} {status} x{count}"
+            for (platform, status), count in sorted(standin.requests.items())
+        ))
+
+    def _create_users(self, count, slugs):
+        platforms = {}
+        for slug in slugs:
+            name, base_url = PLATFORM_NAMES[slug]
+            platforms[slug], _ = Platform.objects.get_or_create(
+                slug=slug, defaults={"name": name, "base_url": base_url}
+            )
+
+        users = []
+        for i in range(count):
+            user = User.objects.create_user(f"{BENCH_USER_PREFIX}{i}")
+            PlatformAccount.objects.bulk_create([
+                PlatformAccount(user=user, platform=platform, username=f"bench{i}")
+                for platform in platforms.values()
+            ])
+            users.append(user)
+        return users
+
+    def _bench_bulk(self, slugs, concurrency):
+        # bulk GitHub needs a token; the stand-in accepts any
+        token_was_set = "GITHUB_TOKEN" in os.environ
+        os.environ.setdefault("GITHUB_TOKEN", "standin")
+        try:
+            for slug, (fetcher, batch_size) in bulk_fetchers().items():
+                if slug not in slugs:
+                    continue
+                accounts = list(
+                    PlatformAccount.objects
+                    .filter(user__username__startswith=BENCH_USER_PREFIX, platform__slug=slug)
+                    .select_related("platform", "user")
+                    .order_by("pk")
+                )
+                batches = [accounts[i:i + batch_size] for i in range(0, len(accounts), batch_size)]
+                self._bench(
+                    f"bulk {slug} x{batch_size}", 1, concurrency,
+                    [(_sync_bulk, fetcher, batch) for batch in batches],
+                    sizes=[len(batch) for batch in batches],
+                )
+        finally:
+            if not token_was_set:
+                os.environ.pop("GITHUB_TOKEN", None)
+
+    def _bench(self, label, round_number, concurrency, calls, sizes=None):
+        """Run `calls` (func, *args) and report one row; `sizes` = syncs per call."""
+        sizes = sizes or [1] * len(calls)
+
+        started = time.monotonic()
+        if concurrency > 1:
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                results = list(pool.map(lambda call: _timed(*call), calls))
+        else:
+            results = [_timed(*call) for call in calls]
+        elapsed = time.monotonic() - started
+
+        syncs = sum(sizes)
+        errors = sum(size for size, result in zip(sizes, results) if result[3] is not None)
+        # a bulk call's latency, queries and requests are shared by its accounts
+        latencies = [result[0] for result in results]
+        queries = sum(result[1] for result in results) / syncs
+        requests = sum(result[2] for result in results) / syncs
+
+        self.stdout.write(
+            f"{label:<22} {round_number:>5} {syncs:>6} {errors:>6} {syncs / elapsed:>8.1f} "
+            f"{percentile(latencies, 50):>7.2f} {percentile(latencies, 95):>7.2f} "
+            f"{queries:>8.1f} {requests:>9.2f}"
+        )
+        for result in results:
+            if result[3] is not None:
+                self.stderr.write(f"  {label}: {result[3]}")
+                break
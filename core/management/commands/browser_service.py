@@ -0,0 +1,45 @@
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.services.browser import serve
+
+
+class Command(BaseCommand):
+    help = "Run the headless browser pool used for GFG page rendering"
+
+    def add_arguments(self, parser):
+        default = urlsplit(settings.BROWSER_SERVICE_URL)
+        parser.add_argument("--host", default=default.hostname or "127.0.0.1")
+        parser.add_argument("--port", type=int, default=default.port or 8765)
+        parser.add_argument(
+            "--browsers", type=int, default=settings.BROWSER_POOL_SIZE,
+            help="Warm browsers kept alive (= max pages rendering at once)",
+        )
+        parser.add_argument(
+            "--max-pages", type=int, default=settings.BROWSER_MAX_PAGES,
+            help="Recycle a browser after this many pages",
+        )
+        parser.add_argument(
+            "--max-rss-mb", type=int, default=settings.BROWSER_MAX_RSS_MB,
+            help="Recycle a browser when the service uses more memory than this",
+        )
+        parser.add_argument(
+            "--max-queue", type=int, default=20,
+            help="Pending renders accepted before answering 503",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"Browser service on {options['host']}:{options['port']} "
+            f"({options['browsers']} browsers)"
+        )
+        serve(
+            options["host"],
+            options["port"],
+            options["browsers"],
+            options["max_pages"],
+            options["max_rss_mb"],
+            options["max_queue"],
+        )
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from core.benchmarks.standin import FIXTURES_DIR, PlatformStandin
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve recorded LeetCode/GitHub/CodeChef/HackerRank/GFG responses locally; "
+        "run the app with PLATFORM_STANDIN_URL set to the printed URL"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8899)
+        parser.add_argument("--latency", type=float, default=0.0,
+                            help="Seconds added to every response")
+        parser.add_argument("--jitter", type=float, default=0.0,
+                            help="Up to this many extra seconds, uniformly random")
+        parser.add_argument("--error-rate", type=float, default=0.0,
+                            help="Fraction of requests answered with a 503")
+        parser.add_argument("--rate", type=float, default=None,
+                            help="Requests/sec per platform before answering 429")
+        parser.add_argument("--fixtures", default=str(FIXTURES_DIR),
+                            help="Directory with the recorded responses")
+
+    def handle(self, *args, **options):
+        standin = PlatformStandin(
+            host=options["host"],
+            port=options["port"],
+            latency=options["latency"],
+            jitter=options["jitter"],
+            error_rate=options["error_rate"],
+            rate=options["rate"],
+            fixtures=options["fixtures"],
+        )
+        self.stdout.write(f"PLATFORM_STANDIN_URL={standin.url}")
+
+        try:
+            standin.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for (platform, status), count in sorted(standin.requests.items()):
+                self.stdout.write(f"  {platform} {status}: {count}")
@@ -0,0 +1,144 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, Sum, When
+
+from core.models import Platform, PlatformStats, UserStats
+from core.services.distribution import rebuild_distribution
+from core.services.leaderboard import refresh_leaderboard
+from core.services.stats import rebuild_totals
+from core.services.xp import XP_FORMULAS, rescorable, xp_expression
+
+
+def _ranks(totals):
+    """{user_id: rank} by XP, highest first; ties share a rank (1, 1, 3)."""
+    ranks = {}
+    rank = previous = None
+    ordered = sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+    for position, (user_id, xp) in enumerate(ordered, 1):
+        if xp != previous:
+            rank, previous = position, xp
+        ranks[user_id] = rank
+    return ranks
+
+
+class Command(BaseCommand):
+    help = (
+        "Rescore stored PlatformStats counters with an XP formula version and "
+        "rebuild UserStats totals and levels, reporting the rank shifts. Rows "
+        "missing a counter the formula reads keep their stored XP"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--formula", type=int, default=None,
+                            help="XP_FORMULAS version (default: settings.XP_FORMULA_VERSION)")
+        parser.add_argument("--dry-run", action="store_true",
+                            help="Only report what would change")
+        parser.add_argument("--chunk-size", type=int, default=1000,
+                            help="Users rescored per UPDATE/transaction")
+        parser.add_argument("--top", type=int, default=20,
+                            help="Largest rank shifts to list")
+
+    def handle(self, *args, **options):
+        version = options["formula"] or settings.XP_FORMULA_VERSION
+        if version not in XP_FORMULAS:
+            raise CommandError(f"Unknown formula version {version}; have {sorted(XP_FORMULAS)}")
+        if version != settings.XP_FORMULA_VERSION and not options["dry_run"]:
+            # the next sync would score with the configured version again
+            raise CommandError(
+                f"Syncs use XP_FORMULA_VERSION={settings.XP_FORMULA_VERSION}; set it to "
+                f"{version} before applying, or preview with --dry-run"
+            )
+
+        platforms = dict(Platform.objects.values_list("id", "slug"))
+        expression = xp_expression(platforms, version)
+        eligible = rescorable(platforms, version)
+        before = dict(UserStats.objects.values_list("user_id", "total_xp"))
+
+        stored = (
+            PlatformStats.objects.order_by("formula_version").values("formula_version")
+            .annotate(rows=Count("id")).values_list("formula_version", "rows")
+        )
+        self.stdout.write("Stored rows by formula version: " + (
+            ", ".join(f"v{v} x{n}" for v, n in stored) or "none"
+        ))
+        self._report_skipped(eligible)
+
+        started = time.monotonic()
+        if options["dry_run"]:
+            after = {**before, **dict(
+                PlatformStats.objects.order_by().values("user_id")
+                .annotate(xp=Sum(Case(
+                    When(eligible, then=expression), default=F("xp"), output_field=IntegerField()
+                )))
+                .values_list("user_id", "xp")
+            )}
+        else:
+            self._apply(expression, eligible, version, options["chunk_size"])
+            after = dict(UserStats.objects.values_list("user_id", "total_xp"))
+            self.stdout.write(f"Leaderboard: {refresh_leaderboard()} entries")
+            rebuild_distribution()
+
+        self._report(version, before, after, options["top"], options["dry_run"],
+                     time.monotonic() - started)
+
+    def _report_skipped(self, eligible):
+        skipped = (
+            PlatformStats.objects.exclude(eligible).order_by("platform__slug")
+            .values("platform__slug").annotate(rows=Count("id"))
+            .values_list("platform__slug", "rows")
+        )
+        if skipped:
+            self.stdout.write(self.style.WARNING(
+                "Skipping rows missing counters the formula reads (stored XP kept "
+                "until a sync fills them): " + ", ".join(f"{slug} x{n}" for slug, n in skipped)
+            ))
+
+    def _apply(self, expression, eligible, version, chunk_size):
+        user_ids = (
+            PlatformStats.objects.order_by("user_id")
+            .values_list("user_id", flat=True).distinct()
+        )
+        last = 0
+        while True:
+            chunk = list(user_ids.filter(user_id__gt=last)[:chunk_size])
+            if not chunk:
+                break
+            first, last = chunk[0], chunk[-1]
+
+            with transaction.atomic():
+                rows = PlatformStats.objects.filter(
+                    eligible, user_id__gte=first, user_id__lte=last
+                ).update(xp=expression, formula_version=version)
+                rebuild_totals(User.objects.filter(pk__gte=first, pk__lte=last))
+
+            self.stdout.write(f"  users #{first}-#{last}: {rows} rows rescored")
+
+    def _report(self, version, before, after, top, dry_run, elapsed):
+        rank_before = _ranks(before)
+        rank_after = _ranks(after)
+
+        changed_xp = [user_id for user_id in after if after[user_id] != before.get(user_id, 0)]
+        moved = sorted(
+            (user_id for user_id in rank_after if rank_after[user_id] != rank_before.get(user_id)),
+            key=lambda user_id: -abs(rank_after[user_id] - rank_before.get(user_id, rank_after[user_id])),
+        )
+        net = sum(after.values()) - sum(before.values())
+
+        verb = "would change" if dry_run else "changed"
+        self.stdout.write(self.style.SUCCESS(
+            f"Formula v{version} in {elapsed:.2f}s: {len(changed_xp)} of {len(after)} users "
+            f"{verb} XP ({net:+d} in total), {len(moved)} {verb} rank"
+        ))
+
+        names = dict(User.objects.filter(pk__in=moved[:top]).values_list("pk", "username"))
+        for user_id in moved[:top]:
+            old_rank = rank_before.get(user_id)
+            shift = "new" if old_rank is None else f"{old_rank - rank_after[user_id]:+d}"
+            self.stdout.write(
+                f"  {names.get(user_id, user_id)}: #{old_rank} -> #{rank_after[user_id]} ({shift}), "
+                f"{before.get(user_id, 0)} -> {after[user_id]} XP"
+            )
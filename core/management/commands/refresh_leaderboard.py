@@ -0,0 +1,16 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.services.leaderboard import refresh_leaderboard
+
+
+class Command(BaseCommand):
+    help = "Re-rank every user and replace the materialized LeaderboardEntry rows"
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        count = refresh_leaderboard()
+        self.stdout.write(self.style.SUCCESS(
+            f"{count} leaderboard entries in {time.monotonic() - started:.2f}s"
+        ))
@@ -0,0 +1,176 @@
+import json
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.benchmarks.reporting import percentile
+from core.models import PlatformAccount
+from core.services.freshness import claim_accounts, is_account_fresh, release_accounts
+from core.services.http_client import format_host_stats, metered
+from core.services.sync import PLATFORM_FETCHERS, bulk_fetchers, fetch_account, save_account
+
+
+def _timed_fetch(account):
+    started = time.monotonic()
+    usage = {}
+    try:
+        fields, error = fetch_account(account, usage), None
+    except Exception as e:
+        fields, error = None, e
+    return [(account, fields, error, time.monotonic() - started, usage)]
+
+
+def _timed_batch(fetcher, accounts):
+    started = time.monotonic()
+    with metered() as usage:
+        try:
+            results = fetcher(accounts)
+        except Exception as e:
+            results = [(account, None, e) for account in accounts]
+
+    # one request serves the whole batch; report it per account
+    elapsed = (time.monotonic() - started) / len(accounts)
+    share = {name: value / len(accounts) for name, value in usage.items()}
+    return [(account, fields, error, elapsed, share) for account, fields, error in results]
+
+
+class Command(BaseCommand):
+    help = "Resync every PlatformAccount with bounded per-host concurrency and resumable checkpoints"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--platform", action="append", choices=sorted(PLATFORM_FETCHERS),
+                            help="Only resync these platforms (repeatable)")
+        parser.add_argument("--chunk-size", type=int, default=100,
+                            help="Accounts read and checkpointed per chunk")
+        parser.add_argument("--per-host", type=int, default=4,
+                            help="Concurrent requests per external platform")
+        parser.add_argument("--stale-only", action="store_true",
+                            help="Skip accounts still inside their SYNC_TTL window")
+        parser.add_argument("--checkpoint", default=str(Path(settings.BASE_DIR) / ".resync_checkpoint.json"),
+                            help="File used to resume an interrupted run")
+        parser.add_argument("--restart", action="store_true",
+                            help="Ignore an existing checkpoint and start from the first account")
+        parser.add_argument("--no-batch", action="store_true",
+                            help="Fetch one account per request even where the platform supports batching")
+
+    def handle(self, *args, **options):
+        checkpoint = Path(options["checkpoint"])
+        last_pk = 0
+        if checkpoint.exists() and not options["restart"]:
+            last_pk = json.loads(checkpoint.read_text()).get("last_pk", 0)
+            self.stdout.write(f"Resuming after account #{last_pk}")
+
+        slugs = options["platform"] or list(PLATFORM_FETCHERS)
+        accounts = (
+            PlatformAccount.objects
+            .filter(pk__gt=last_pk, platform__slug__in=slugs)
+            .select_related("platform", "user")
+            .order_by("pk")
+            .iterator(chunk_size=options["chunk_size"])
+        )
+
+        # one pool per platform = a hard cap on concurrent requests per host
+        executors = {
+            slug: ThreadPoolExecutor(max_workers=options["per_host"], thread_name_prefix=f"resync-{slug}")
+            for slug in slugs
+        }
+
+        # LeetCode (and GitHub, with a token) go through aliased GraphQL batches
+        batched = {} if options["no_batch"] else bulk_fetchers()
+
+        processed = Counter()
+        errors = Counter()
+        latencies = defaultdict(list)
+        traffic = defaultdict(Counter)
+        started = time.monotonic()
+
+        try:
+            while True:
+                chunk = list(islice(accounts, options["chunk_size"]))
+                if not chunk:
+                    break
+
+                futures = []
+                pending_batches = defaultdict(list)
+                candidates = [
+                    account for account in chunk
+                    if not (options["stale_only"] and is_account_fresh(account))
+                ]
+                # accounts a job or view is syncing right now are left to it
+                claimed = claim_accounts(candidates)
+                processed["skipped"] += len(chunk) - len(claimed)
+                for account in claimed:
+                    slug = account.platform.slug
+                    if slug in batched:
+                        pending_batches[slug].append(account)
+                        continue
+                    futures.append(executors[slug].submit(_timed_fetch, account))
+
+                for slug, batch_accounts in pending_batches.items():
+                    fetcher, batch_size = batched[slug]
+                    for start in range(0, len(batch_accounts), batch_size):
+                        futures.append(executors[slug].submit(
+                            _timed_batch, fetcher, batch_accounts[start:start + batch_size]
+                        ))
+
+                # fetch in threads, write from this thread (one DB connection)
+                try:
+                    for future in as_completed(futures):
+                        for account, fields, error, elapsed, usage in future.result():
+                            slug = account.platform.slug
+                            latencies[slug].append(elapsed)
+                            traffic[slug].update(usage)
+
+                            if error is not None:
+                                errors[slug] += 1
+                                self.stderr.write(f"{slug}:{account.username}: {error}")
+                                continue
+
+                            changed = save_account(account, fields)
+                            processed["synced" if changed else "unchanged"] += 1
+                finally:
+                    release_accounts(claimed)
+
+                checkpoint.write_text(json.dumps({"last_pk": chunk[-1].pk}))
+                self.stdout.write(f"Checkpoint: account #{chunk[-1].pk}")
+        finally:
+            for executor in executors.values():
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        checkpoint.unlink(missing_ok=True)
+        self._report(time.monotonic() - started, processed, errors, latencies, traffic)
+
+    def _report(self, elapsed, processed, errors, latencies, traffic):
+        attempted = processed["synced"] + processed["unchanged"] + sum(errors.values())
+        rate = attempted / elapsed if elapsed else 0.0
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{attempted} accounts in {elapsed:.1f}s ({rate:.2f} accounts/sec): "
+            f"{processed['synced']} synced, {processed['unchanged']} unchanged, "
+            f"{processed['skipped']} fresh/skipped, {sum(errors.values())} errors"
+        ))
+
+        for slug in sorted(latencies):
+            values = latencies[slug]
+            self.stdout.write(
+                f"  {slug}: {len(values)} fetched, {errors[slug]} errors, "
+                f"p50 {percentile(values, 50):.2f}s, p95 {percentile(values, 95):.2f}s, "
+                f"{traffic[slug]['requests'] / len(values):.2f} requests and "
+                f"{traffic[slug]['bytes'] / len(values) / 1024:.1f} KB per account"
+            )
+
+        all_values = [v for values in latencies.values() for v in values]
+        if all_values:
+            self.stdout.write(
+                f"  overall: p50 {percentile(all_values, 50):.2f}s, "
+                f"p95 {percentile(all_values, 95):.2f}s"
+            )
+
+        host_stats = format_host_stats()
+        if host_stats:
+            self.stdout.write(host_stats)
@@ -0,0 +1,65 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.services.http_client import format_host_stats
+from core.services.jobs import claim_next_job, requeue_stale_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs (platform syncs, AI generations)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Drain the queue and exit instead of polling forever",
+        )
+        parser.add_argument(
+            "--sleep", type=float, default=2.0,
+            help="Seconds to wait between polls when the queue is empty",
+        )
+        parser.add_argument(
+            "--stale-seconds", type=float, default=None,
+            help="Requeue running jobs without a heartbeat for this long "
+                 "(default: settings.JOB_STALE_AFTER)",
+        )
+
+    def handle(self, *args, **options):
+        stale_after = timedelta(seconds=options["stale_seconds"] or settings.JOB_STALE_AFTER)
+        next_requeue = 0
+
+        self.stdout.write("Job worker started")
+
+        while True:
+            close_old_connections()
+
+            # jobs of a worker that died (this one before a restart included)
+            if time.monotonic() >= next_requeue:
+                requeued = requeue_stale_jobs(stale_after)
+                if requeued:
+                    self.stdout.write(f"Requeued {requeued} stale job(s)")
+                next_requeue = time.monotonic() + stale_after.total_seconds() / 2
+
+            job = claim_next_job()
+
+            if job is None:
+                if options["once"]:
+                    stats = format_host_stats()
+                    if stats:
+                        self.stdout.write(stats)
+                    break
+                time.sleep(options["sleep"])
+                continue
+
+            started = time.monotonic()
+            job = run_job(job)
+            elapsed = time.monotonic() - started
+
+            line = f"{job} in {elapsed:.2f}s"
+            if job.status == "done":
+                self.stdout.write(self.style.SUCCESS(line))
+            else:
+                self.stdout.write(self.style.ERROR(f"{line}: {job.error}"))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 19:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0028_backgroundjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='platformaccount',
+            name='fetch_strategy',
+            field=models.CharField(blank=True, max_length=20),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 19:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0029_platformaccount_fetch_strategy'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='platformaccount',
+            name='http_cache',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
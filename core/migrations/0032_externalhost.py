@@ -0,0 +1,24 @@
+# Generated by Django 5.2.1 on 2026-10-18 19:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0031_backgroundjob_dedupe_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExternalHost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('host', models.CharField(max_length=255, unique=True)),
+                ('tokens', models.FloatField(default=0)),
+                ('refilled_at', models.FloatField(default=0)),
+                ('failures', models.PositiveIntegerField(default=0)),
+                ('opened_until', models.FloatField(default=0)),
+            ],
+        ),
+    ]
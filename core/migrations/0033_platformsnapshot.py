@@ -0,0 +1,38 @@
+# Generated by Django 5.2.1 on 2026-10-18 19:32
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0032_externalhost'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('taken_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('solved', models.PositiveIntegerField(default=0)),
+                ('easy', models.PositiveIntegerField(default=0)),
+                ('medium', models.PositiveIntegerField(default=0)),
+                ('hard', models.PositiveIntegerField(default=0)),
+                ('rating', models.PositiveIntegerField(default=0)),
+                ('contests', models.PositiveIntegerField(default=0)),
+                ('score', models.PositiveIntegerField(default=0)),
+                ('repos', models.PositiveIntegerField(default=0)),
+                ('contributions', models.PositiveIntegerField(default=0)),
+                ('xp', models.PositiveIntegerField(default=0)),
+                ('xp_delta', models.IntegerField(default=0)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='core.platformaccount')),
+            ],
+            options={
+                'ordering': ['-taken_at'],
+                'indexes': [models.Index(fields=['account', 'taken_at'], name='core_platfo_account_0d68df_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 19:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0033_platformsnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyactivity',
+            name='count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.1 on 2026-10-18 19:37
+
+import django.db.models.expressions
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0034_dailyactivity_count'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='userstats',
+            name='level',
+        ),
+        migrations.AddField(
+            model_name='userstats',
+            name='level',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.comparison.Greatest(models.Value(1), django.db.models.expressions.CombinedExpression(models.F('total_xp'), '/', models.Value(100))), output_field=models.PositiveIntegerField()),
+        ),
+    ]
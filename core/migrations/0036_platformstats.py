@@ -0,0 +1,74 @@
+# Generated by Django 5.2.1 on 2026-10-18 19:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# UserStats column prefix -> {PlatformStats extra key: UserStats column}
+EXTRA_COLUMNS = {
+    "github": {"repos": "github_repos", "contributions": "total_commits"},
+    "leetcode": {
+        "easy": "leetcode_easy",
+        "medium": "leetcode_medium",
+        "hard": "leetcode_hard",
+    },
+    "gfg": {},
+    "codechef": {"rating": "codechef_rating", "contests": "codechef_contests"},
+    "codeforces": {},
+    "hackerrank": {},
+}
+
+
+def copy_platform_columns(apps, schema_editor):
+    Platform = apps.get_model("core", "Platform")
+    PlatformStats = apps.get_model("core", "PlatformStats")
+    UserStats = apps.get_model("core", "UserStats")
+
+    platforms = dict(
+        Platform.objects.filter(slug__in=EXTRA_COLUMNS).values_list("slug", "id")
+    )
+    rows = []
+    for stats in UserStats.objects.iterator():
+        for slug, platform_id in platforms.items():
+            solved = getattr(stats, f"{slug}_solved", 0)
+            xp = getattr(stats, f"{slug}_xp")
+            extra = {
+                key: getattr(stats, column)
+                for key, column in EXTRA_COLUMNS[slug].items()
+            }
+            if solved or xp or any(extra.values()):
+                rows.append(PlatformStats(
+                    user_id=stats.user_id,
+                    platform_id=platform_id,
+                    solved=solved,
+                    xp=xp,
+                    extra=extra,
+                ))
+    PlatformStats.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0035_userstats_generated_level'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('solved', models.PositiveIntegerField(default=0)),
+                ('xp', models.PositiveIntegerField(default=0)),
+                ('extra', models.JSONField(blank=True, default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('platform', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_stats', to='core.platform')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='platform_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'platform')},
+            },
+        ),
+        migrations.RunPython(copy_platform_columns, migrations.RunPython.noop),
+    ]
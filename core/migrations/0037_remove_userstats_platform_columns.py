@@ -0,0 +1,127 @@
+# Generated by Django 5.2.1 on 2026-10-18 19:41
+
+from django.db import migrations
+from django.db.models import Sum
+
+
+def fill_totals(apps, schema_editor):
+    PlatformStats = apps.get_model("core", "PlatformStats")
+    UserStats = apps.get_model("core", "UserStats")
+
+    totals = (
+        PlatformStats.objects
+        .order_by()
+        .values("user_id")
+        .annotate(xp=Sum("xp"), solved=Sum("solved"))
+    )
+    for row in totals:
+        UserStats.objects.filter(user_id=row["user_id"]).update(
+            total_xp=row["xp"], total_problems=row["solved"]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0036_platformstats'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='userstats',
+            name='codechef_contests',
+        ),
+        migrations.RemoveField(
+            model_name='userstats',
+            name='codechef_rating',
+        ),
+        migrations.RemoveField(
+            model_name='userstats',
+            name='codechef_solved',
+        ),
+        migrations.RemoveField(
+            model_name='userstats',
+            name='codechef_username',
+        ),
+        migrations.RemoveField(
+            model_name='userstats',
+            name='codechef_xp',
+        ),
+        migrations.RemoveField(
+            model_name='userstats',
+            name='codeforces_solved',
+        ),
+        migrations.RemoveField(
+            model_name='userstats',
+            name='codeforces_username',
+        ),
+        migrations.RemoveField(
+            model_name='userstats',
+            name='codeforces_xp',
+        ),
+        migrations.RemoveField(
+            model_name='userstats',
+            name='gfg_solved',
+        ),
+        migrations.RemoveField(
+            model_name='userstats',
+            name='gfg_username',
+        ),
+        migrations.RemoveField(
+            model_name='userstats',
+            name='gfg_xp',
+        ),
+        migrations.RemoveField(
+            model_name='userstats',
+            name='github_repos',
+        ),
+        migrations.RemoveField(
+            model_name='userstats',
+            name='github_username',
+        ),
+        migrations.RemoveField(
+            model_name='userstats',
+            name='github_xp',
+        ),
+        migrations.RemoveField(
+            model_name='userstats',
+            name='hackerrank_solved',
+        ),
+        migrations.RemoveField(
+            model_name='userstats',
+            name='hackerrank_username',
+        ),
+        migrations.RemoveField(
+            model_name='userstats',
+            name='hackerrank_xp',
+        ),
+        migrations.RemoveField(
+            model_name='userstats',
+            name='leetcode_easy',
+        ),
+        migrations.RemoveField(
+            model_name='userstats',
+            name='leetcode_hard',
+        ),
+        migrations.RemoveField(
+            model_name='userstats',
+            name='leetcode_medium',
+        ),
+        migrations.RemoveField(
+            model_name='userstats',
+            name='leetcode_solved',
+        ),
+        migrations.RemoveField(
+            model_name='userstats',
+            name='leetcode_username',
+        ),
+        migrations.RemoveField(
+            model_name='userstats',
+            name='leetcode_xp',
+        ),
+        migrations.RemoveField(
+            model_name='userstats',
+            name='total_commits',
+        ),
+        migrations.RunPython(fill_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 19:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0037_remove_userstats_platform_columns'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='platformstats',
+            name='formula_version',
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-18 19:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0038_platformstats_formula_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='backgroundjob',
+            name='run_after',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='backgroundjob',
+            name='kind',
+            field=models.CharField(choices=[('sync_github', 'Sync GitHub'), ('sync_leetcode', 'Sync LeetCode'), ('sync_gfg', 'Sync GFG'), ('sync_codechef', 'Sync CodeChef'), ('sync_hackerrank', 'Sync HackerRank'), ('sync_all', 'Sync all platforms'), ('goal_solution', 'AI goal roadmap'), ('task_reply', 'AI task reply'), ('refresh_leaderboard', 'Refresh leaderboard')], max_length=30),
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardentry',
+            index=models.Index(fields=['rank', 'id'], name='core_leader_rank_47b9c6_idx'),
+        ),
+    ]
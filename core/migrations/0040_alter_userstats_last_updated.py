@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 19:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0039_backgroundjob_run_after_alter_backgroundjob_kind_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userstats',
+            name='last_updated',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
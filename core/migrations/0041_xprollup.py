@@ -0,0 +1,63 @@
+# Generated by Django 5.2.1 on 2026-10-18 19:50
+
+from collections import defaultdict
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def period_starts(day):
+    return {"week": day - timedelta(days=day.weekday()), "month": day.replace(day=1)}
+
+
+def fill_rollups(apps, schema_editor):
+    PlatformSnapshot = apps.get_model("core", "PlatformSnapshot")
+    XPRollup = apps.get_model("core", "XPRollup")
+
+    totals = defaultdict(int)
+    snapshots = (
+        PlatformSnapshot.objects.exclude(xp_delta=0)
+        .values_list("account__user_id", "account__platform_id", "taken_at", "xp_delta")
+    )
+    for user_id, platform_id, taken_at, xp in snapshots.iterator(chunk_size=5000):
+        for period, start in period_starts(timezone.localdate(taken_at)).items():
+            totals[user_id, platform_id, period, start] += xp
+
+    XPRollup.objects.bulk_create(
+        [
+            XPRollup(user_id=user_id, platform_id=platform_id, period=period, start=start, xp=xp)
+            for (user_id, platform_id, period, start), xp in totals.items()
+            if xp
+        ],
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0040_alter_userstats_last_updated'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='XPRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('week', 'Week'), ('month', 'Month')], max_length=5)),
+                ('start', models.DateField()),
+                ('xp', models.IntegerField(default=0)),
+                ('platform', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='xp_rollups', to='core.platform')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='xp_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['platform', 'period', 'start', '-xp'], name='core_xproll_platfor_d9899b_idx')],
+                'unique_together': {('user', 'platform', 'period', 'start')},
+            },
+        ),
+        migrations.RunPython(fill_rollups, migrations.RunPython.noop),
+    ]
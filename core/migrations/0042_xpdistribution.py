@@ -0,0 +1,22 @@
+# Generated by Django 5.2.1 on 2026-10-18 19:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0041_xprollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='XPDistribution',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bounds', models.JSONField(default=list)),
+                ('buckets', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
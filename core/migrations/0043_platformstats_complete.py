@@ -0,0 +1,37 @@
+# Generated by Django 5.2.1 on 2026-10-18 20:02
+
+from django.db import migrations, models
+
+# extra keys each platform's fetcher stores; rows copied from UserStats in
+# 0036 only had the ones UserStats kept a column for
+REPORTED = {
+    "github": ["repos", "contributions"],
+    "leetcode": ["easy", "medium", "hard", "rating", "contests"],
+    "gfg": ["score"],
+    "codechef": ["rating", "contests"],
+}
+
+
+def mark_copied_rows(apps, schema_editor):
+    PlatformStats = apps.get_model("core", "PlatformStats")
+
+    for slug, keys in REPORTED.items():
+        PlatformStats.objects.filter(platform__slug=slug).exclude(
+            extra__has_keys=keys
+        ).update(complete=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0042_xpdistribution'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='platformstats',
+            name='complete',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.RunPython(mark_copied_rows, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 20:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0043_platformstats_complete'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='platformaccount',
+            name='sync_claimed_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
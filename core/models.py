@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
 from django.conf import settings
 from django.utils import timezone
 
@@ -279,6 +281,14 @@ class PlatformAccount(models.Model):
     # FIX: added profile_url field that views.py passes in update_or_create defaults
     profile_url = models.URLField(blank=True)
     last_synced = models.DateTimeField(null=True, blank=True)
+    # which fetch strategy served the last sync, tried first next time (e.g.
+    # "api", "page"; never GFG's browser fallback)
+    fetch_strategy = models.CharField(max_length=20, blank=True)
+    # url -> {"etag", "last_modified", "body_hash"} for conditional fetches
+    http_cache = models.JSONField(default=dict, blank=True)
+    # set while one sync fetches this account (core.services.freshness);
+    # an expired claim is free again
+    sync_claimed_until = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         unique_together = ("user", "platform")
@@ -291,12 +301,48 @@ class DailyActivity(models.Model):
     account = models.ForeignKey("PlatformAccount", on_delete=models.CASCADE)
     date = models.DateField()
     xp = models.PositiveIntegerField(default=0)
+    # contributions (GitHub) or newly solved problems on that day
+    count = models.PositiveIntegerField(default=0)
 
     class Meta:
         unique_together = ("account", "date")
         ordering = ["-date"]
 
 
+class PlatformSnapshot(models.Model):
+    """
+    Raw counters of one PlatformAccount as of a sync. Append-only: a row is
+    added only when something differs from the account's previous one, and
+    `xp_delta` is the XP that change earned (0 for the first, baseline row).
+    """
+    account = models.ForeignKey(
+        "PlatformAccount", on_delete=models.CASCADE, related_name="snapshots"
+    )
+    taken_at = models.DateTimeField(default=timezone.now)
+
+    solved = models.PositiveIntegerField(default=0)
+    easy = models.PositiveIntegerField(default=0)
+    medium = models.PositiveIntegerField(default=0)
+    hard = models.PositiveIntegerField(default=0)
+    rating = models.PositiveIntegerField(default=0)
+    contests = models.PositiveIntegerField(default=0)
+    score = models.PositiveIntegerField(default=0)
+    repos = models.PositiveIntegerField(default=0)
+    contributions = models.PositiveIntegerField(default=0)
+
+    xp = models.PositiveIntegerField(default=0)
+    xp_delta = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["-taken_at"]
+        indexes = [
+            models.Index(fields=["account", "taken_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.account} @ {self.taken_at:%Y-%m-%d %H:%M}"
+
+
 class UserHeatmap(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="heatmap")
     date = models.DateField()
@@ -311,78 +357,91 @@ class UserHeatmap(models.Model):
         return f"{self.user} - {self.date}"
 
 
+class ExternalHost(models.Model):
+    """
+    Shared rate-limit and circuit-breaker state for one upstream host.
+
+    Times are epoch seconds so token refills can be computed inside a
+    single portable UPDATE on every database backend.
+    """
+    host = models.CharField(max_length=255, unique=True)
+    tokens = models.FloatField(default=0)
+    refilled_at = models.FloatField(default=0)
+    failures = models.PositiveIntegerField(default=0)
+    opened_until = models.FloatField(default=0)
+
+    def __str__(self):
+        return self.host
+
+
 # ==================================================
 #                USER STATS
 # ==================================================
 
-class UserStats(models.Model):
-    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="stats")
-
-    github_username = models.CharField(max_length=150, blank=True, null=True)
-    leetcode_username = models.CharField(max_length=150, blank=True, null=True)
-    gfg_username = models.CharField(max_length=150, blank=True, null=True)
-    codechef_username = models.CharField(max_length=150, blank=True, null=True)
-    codeforces_username = models.CharField(max_length=150, blank=True, null=True)
-    hackerrank_username = models.CharField(max_length=150, blank=True, null=True)
-
-    github_repos = models.PositiveIntegerField(default=0)
-    total_commits = models.PositiveIntegerField(default=0)
-    github_xp = models.PositiveIntegerField(default=0)
+class PlatformStats(models.Model):
+    """
+    A user's current counters on one platform. `solved` and `xp` are common
+    to every platform; anything platform-specific (LeetCode difficulty
+    split, CodeChef rating, GitHub repos...) goes in `extra`.
+    """
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="platform_stats"
+    )
+    platform = models.ForeignKey(
+        "Platform", on_delete=models.CASCADE, related_name="user_stats"
+    )
+    solved = models.PositiveIntegerField(default=0)
+    xp = models.PositiveIntegerField(default=0)
+    extra = models.JSONField(default=dict, blank=True)
+    # core.services.xp.XP_FORMULAS version `xp` was computed with
+    formula_version = models.PositiveSmallIntegerField(default=1)
+    # False for rows copied from the old UserStats columns, which lacked some
+    # counters (LeetCode rating/contests, GFG score); the next sync fills them
+    complete = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
-    leetcode_solved = models.PositiveIntegerField(default=0)
-    leetcode_easy = models.PositiveIntegerField(default=0)
-    leetcode_medium = models.PositiveIntegerField(default=0)
-    leetcode_hard = models.PositiveIntegerField(default=0)
-    leetcode_xp = models.PositiveIntegerField(default=0)
+    class Meta:
+        unique_together = ("user", "platform")
 
-    gfg_solved = models.PositiveIntegerField(default=0)
-    gfg_xp = models.PositiveIntegerField(default=0)
+    def counter(self, name):
+        """`solved`, `xp` or an `extra` counter; 0 when not reported."""
+        if name in ("solved", "xp"):
+            return getattr(self, name)
+        return self.extra.get(name, 0)
 
-    codechef_solved = models.PositiveIntegerField(default=0)
-    codechef_rating = models.PositiveIntegerField(default=0)
-    codechef_contests = models.PositiveIntegerField(default=0)
-    codechef_xp = models.PositiveIntegerField(default=0)
+    def __str__(self):
+        return f"{self.user} @ {self.platform} - {self.xp} XP"
 
-    codeforces_solved = models.PositiveIntegerField(default=0)
-    codeforces_xp = models.PositiveIntegerField(default=0)
 
-    hackerrank_solved = models.PositiveIntegerField(default=0)
-    hackerrank_xp = models.PositiveIntegerField(default=0)
+class UserStats(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="stats")
 
+    # sums over the user's PlatformStats rows, moved by each sync's change
+    # rather than re-added (see core.services.stats)
     total_xp = models.PositiveIntegerField(default=0)
     total_problems = models.PositiveIntegerField(default=0)
     total_hours = models.DecimalField(max_digits=6, decimal_places=2, default=0)
 
     current_streak = models.PositiveIntegerField(default=0)
     longest_streak = models.PositiveIntegerField(default=0)
-    level = models.PositiveIntegerField(default=1)
-
-    last_updated = models.DateTimeField(auto_now=True)
-
-    def recalculate_totals(self):
-        self.total_xp = (
-            self.github_xp
-            + self.leetcode_xp
-            + self.gfg_xp
-            + self.codechef_xp
-            + self.codeforces_xp
-            + self.hackerrank_xp
-        )
-        self.total_problems = (
-            self.leetcode_solved
-            + self.gfg_solved
-            + self.codechef_solved
-            + self.codeforces_solved
-            + self.hackerrank_solved
-        )
-        self.level = max(1, self.total_xp // 100)
-        self.save(update_fields=["total_xp", "total_problems", "level"])
+    level = models.GeneratedField(
+        expression=Greatest(Value(1), F("total_xp") / Value(100)),
+        output_field=models.PositiveIntegerField(),
+        db_persist=True,
+    )
+
+    # indexed for core.services.rank_index, which polls for changed rows
+    last_updated = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return f"{self.user} - {self.total_xp} XP"
 
 
 class LeaderboardEntry(models.Model):
+    """
+    Materialized leaderboard: one row per user with XP, rebuilt wholesale
+    by core.services.leaderboard.refresh_leaderboard().
+    """
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     xp = models.PositiveIntegerField()
     rank = models.PositiveIntegerField()
@@ -390,6 +449,114 @@ class LeaderboardEntry(models.Model):
 
     class Meta:
         ordering = ["rank"]
+        indexes = [models.Index(fields=["rank", "id"])]
 
     def __str__(self):
         return f"#{self.rank} {self.user}"
+
+
+class XPRollup(models.Model):
+    """
+    XP a user gained on one platform in one ISO week or calendar month (net
+    of snapshot deltas), moved by every sync's change; see
+    core.services.rollups. Per-period leaderboards are range scans of the
+    (platform, period, start, xp) index.
+    """
+    PERIODS = [
+        ("week", "Week"),
+        ("month", "Month"),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="xp_rollups")
+    platform = models.ForeignKey("Platform", on_delete=models.CASCADE, related_name="xp_rollups")
+    period = models.CharField(max_length=5, choices=PERIODS)
+    # Monday of the week, or the 1st of the month
+    start = models.DateField()
+    xp = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("user", "platform", "period", "start")
+        indexes = [models.Index(fields=["platform", "period", "start", "-xp"])]
+
+    def __str__(self):
+        return f"{self.user} @ {self.platform} {self.period} of {self.start}: {self.xp} XP"
+
+
+class XPDistribution(models.Model):
+    """
+    Single row: how many users with XP fall into each XP bucket, for
+    total_xp ("total") and per platform (keyed by platform id), moved by
+    every stats change; see core.services.distribution.
+    """
+    # lower bucket bounds the counts were taken with
+    bounds = models.JSONField(default=list)
+    # {"total" | platform id: [users per bucket]}
+    buckets = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"XP distribution ({len(self.bounds)} buckets)"
+
+
+# ==================================================
+#                BACKGROUND JOBS
+# ==================================================
+
+class BackgroundJob(models.Model):
+    KINDS = [
+        ("sync_github", "Sync GitHub"),
+        ("sync_leetcode", "Sync LeetCode"),
+        ("sync_gfg", "Sync GFG"),
+        ("sync_codechef", "Sync CodeChef"),
+        ("sync_hackerrank", "Sync HackerRank"),
+        ("sync_all", "Sync all platforms"),
+        ("goal_solution", "AI goal roadmap"),
+        ("task_reply", "AI task reply"),
+        ("refresh_leaderboard", "Refresh leaderboard"),
+    ]
+
+    STATUS = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="jobs")
+    kind = models.CharField(max_length=30, choices=KINDS)
+    payload = models.JSONField(default=dict, blank=True)
+    # jobs sharing a key are coalesced while one of them is pending/running
+    dedupe_key = models.CharField(max_length=100, null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS, default="pending")
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    # not claimed before this time (debounced jobs)
+    run_after = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # stamped by the worker while the job runs; see jobs.requeue_stale_jobs
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+            models.Index(fields=["user", "status"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dedupe_key"],
+                condition=models.Q(status__in=["pending", "running"]),
+                name="unique_active_job_per_dedupe_key",
+            ),
+        ]
+
+    @property
+    def is_finished(self):
+        return self.status in ("done", "failed")
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
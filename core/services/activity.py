@@ -0,0 +1,97 @@
+"""
+Per-day activity: DailyActivity rows per account and the per-user
+UserHeatmap built from them.
+
+GitHub accounts get their days from the contribution calendar (a whole
+year per sync, only changed days written); other platforms are credited
+from snapshot deltas (core.services.snapshots).
+"""
+
+from datetime import date as date_type
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+
+from core.models import DailyActivity, UserHeatmap
+
+
+def credit_daily_activity(account, date, xp, count=0):
+    """Add `xp` and `count` to the account's DailyActivity row for `date`."""
+    rows = DailyActivity.objects.filter(account=account, date=date)
+    if not rows.update(xp=F("xp") + xp, count=F("count") + count):
+        try:
+            with transaction.atomic():
+                DailyActivity.objects.create(account=account, date=date, xp=xp, count=count)
+        except IntegrityError:
+            # another sync created the row first
+            rows.update(xp=F("xp") + xp, count=F("count") + count)
+
+    refresh_heatmap(account.user_id, [date])
+
+
+def store_daily_counts(account, counts, xp_for):
+    """
+    Upsert a calendar of per-day counts ({"YYYY-MM-DD": count}) for `account`.
+
+    Stored rows in the calendar's date range are read in one indexed query
+    and only days whose count differs are written, in a single
+    bulk_create(update_conflicts=True). Days with a zero count and no row
+    are not stored. `xp_for(count)` gives a day's XP. Returns the number of
+    days written.
+    """
+    if not counts:
+        return 0
+
+    counts = {date_type.fromisoformat(day): count for day, count in counts.items()}
+    stored = dict(
+        DailyActivity.objects
+        .filter(account=account, date__range=(min(counts), max(counts)))
+        .values_list("date", "count")
+    )
+
+    changed = [
+        DailyActivity(account=account, date=day, count=count, xp=xp_for(count))
+        for day, count in counts.items()
+        if stored.get(day, 0) != count
+    ]
+    if not changed:
+        return 0
+
+    DailyActivity.objects.bulk_create(
+        changed,
+        update_conflicts=True,
+        unique_fields=["account", "date"],
+        update_fields=["count", "xp"],
+    )
+    refresh_heatmap(account.user_id, [row.date for row in changed])
+    return len(changed)
+
+
+def refresh_heatmap(user_id, dates):
+    """Rebuild the user's UserHeatmap rows for `dates` from DailyActivity."""
+    dates = set(dates)
+    totals = {
+        row["date"]: row
+        for row in (
+            DailyActivity.objects
+            .filter(account__user_id=user_id, date__in=dates)
+            .order_by()
+            .values("date")
+            .annotate(xp=Sum("xp"), count=Sum("count"))
+        )
+    }
+
+    UserHeatmap.objects.bulk_create(
+        [
+            UserHeatmap(
+                user_id=user_id,
+                date=day,
+                total_xp=totals.get(day, {}).get("xp") or 0,
+                activity_score=totals.get(day, {}).get("count") or 0,
+            )
+            for day in dates
+        ],
+        update_conflicts=True,
+        unique_fields=["user", "date"],
+        update_fields=["total_xp", "activity_score"],
+    )
@@ -1,6 +1,7 @@
-import requests
 from django.conf import settings
 
+from core.services import http_client
+
 GROQ_URL = "https://api.groq.com/openai/v1/chat/completions"
 
 
@@ -35,7 +36,7 @@ Example format:
     }
 
     try:
-        res = requests.post(GROQ_URL, headers=headers, json=payload, timeout=60)
+        res = http_client.post(GROQ_URL, headers=headers, json=payload, timeout=60)
         res.raise_for_status()
         text = res.json()["choices"][0]["message"]["content"]
 
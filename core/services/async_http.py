@@ -0,0 +1,103 @@
+"""
+Async counterpart of core.services.http_client for the ASGI code paths.
+
+One httpx.AsyncClient per event loop keeps connections alive across
+requests; per-host counters, metered() and the shared rate limiter /
+circuit breaker are the same ones the blocking client uses, so a host's
+budget holds no matter which client spends it.
+"""
+
+import asyncio
+import time
+import weakref
+from urllib.parse import urlsplit
+
+import httpx
+from django.conf import settings
+
+from core.services import throttle
+from core.services.http_client import (
+    DEFAULT_HEADERS,
+    DEFAULT_TIMEOUT,
+    is_upstream_failure,
+    record_request,
+    store_validators,
+    validator_headers,
+)
+
+# a client is bound to the loop it was created on
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_client():
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            timeout=DEFAULT_TIMEOUT,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=settings.ASYNC_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.ASYNC_HTTP_MAX_KEEPALIVE,
+            ),
+            # connect errors only; a slow upstream is not hit again
+            transport=httpx.AsyncHTTPTransport(retries=settings.HTTP_MAX_RETRIES),
+        )
+        _clients[loop] = client
+    return client
+
+
+async def close_clients():
+    for client in list(_clients.values()):
+        await client.aclose()
+    _clients.clear()
+
+
+# =========================================
+# Requests
+# =========================================
+async def request(method, url, **kwargs):
+    host = urlsplit(url).hostname or ""
+
+    await throttle.acheck_circuit(host)
+    await throttle.aacquire_token(host)
+
+    started = time.monotonic()
+    failed = False
+    size = 0
+    try:
+        response = await get_client().request(method, url, **kwargs)
+        size = len(response.content)
+    except httpx.HTTPError:
+        failed = True
+        await throttle.arecord_failure(host)
+        raise
+    finally:
+        record_request(host, time.monotonic() - started, size, failed)
+
+    if is_upstream_failure(response.status_code):
+        await throttle.arecord_failure(host)
+    else:
+        await throttle.arecord_success(host)
+    return response
+
+
+async def get(url, **kwargs):
+    return await request("GET", url, **kwargs)
+
+
+async def post(url, **kwargs):
+    return await request("POST", url, **kwargs)
+
+
+async def conditional_get(url, cache=None, **kwargs):
+    """Same contract as http_client.conditional_get()."""
+    if cache is None:
+        return await get(url, **kwargs)
+
+    entry = cache.get(url) or {}
+    headers = validator_headers(entry, kwargs.pop("headers", None))
+    response = await get(url, headers=headers, **kwargs)
+    store_validators(cache, url, entry, response)
+    return response
@@ -0,0 +1,260 @@
+"""
+Out-of-process headless browser pool.
+
+`python manage.py browser_service` runs a small localhost HTTP server that
+keeps a few warm Chromium instances (one per worker thread), limits how
+many pages render at once and recycles a browser after N pages or when
+the process tree grows past a memory threshold. Web and job workers call
+render_page_text() instead of launching Chromium themselves.
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+
+from core.services import http_client
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserServiceError(Exception):
+    pass
+
+
+# =========================================
+# Client
+# =========================================
+def render_page_text(url, wait_ms=5000, timeout_ms=60_000):
+    """Return the rendered `body` text of `url` from the browser service."""
+    try:
+        response = http_client.post(
+            f"{settings.BROWSER_SERVICE_URL.rstrip('/')}/render",
+            json={"url": url, "wait_ms": wait_ms, "timeout_ms": timeout_ms},
+            timeout=(3, timeout_ms / 1000 + wait_ms / 1000 + 30),
+        )
+    except requests.RequestException as e:
+        raise BrowserServiceError(f"Browser service unavailable: {e}") from e
+
+    data = response.json() if response.content else {}
+    if response.status_code != 200:
+        raise BrowserServiceError(data.get("error") or f"Browser service HTTP {response.status_code}")
+    return data["text"]
+
+
+# =========================================
+# Server side
+# =========================================
+def _tree_rss_mb(root_pid):
+    """RSS of `root_pid` plus all of its descendants (Linux only, else 0)."""
+    if not os.path.isdir("/proc"):
+        return 0
+
+    children = {}
+    rss_pages = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as fh:
+                stat = fh.read()
+            with open(f"/proc/{entry}/statm") as fh:
+                rss_pages[int(entry)] = int(fh.read().split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+
+    total = 0
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        total += rss_pages.get(pid, 0)
+        stack.extend(children.get(pid, []))
+
+    return total * os.sysconf("SC_PAGE_SIZE") // (1024 * 1024)
+
+
+class BrowserWorker(threading.Thread):
+    """Owns one Chromium; renders one page at a time from the shared queue."""
+
+    def __init__(self, pool, index):
+        super().__init__(name=f"browser-{index}", daemon=True)
+        self.pool = pool
+
+    def run(self):
+        # Playwright's sync API is bound to the thread that started it
+        from playwright.sync_api import sync_playwright
+
+        with sync_playwright() as p:
+            browser = None
+            context = None
+            pages = 0
+
+            while True:
+                item = self.pool.jobs.get()
+                if item is None:
+                    break
+
+                url, wait_ms, timeout_ms, future = item
+                if not future.set_running_or_notify_cancel():
+                    continue
+
+                try:
+                    if browser is None:
+                        browser = p.chromium.launch(
+                            headless=True,
+                            args=["--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu"],
+                        )
+                        context = browser.new_context()
+                        pages = 0
+
+                    page = context.new_page()
+                    try:
+                        page.goto(url, timeout=timeout_ms)
+                        page.wait_for_load_state("networkidle")
+                        page.wait_for_timeout(wait_ms)
+                        future.set_result(page.inner_text("body"))
+                    finally:
+                        page.close()
+                    pages += 1
+                    self.pool.count("pages")
+                except Exception as e:
+                    future.set_exception(e)
+                    self.pool.count("errors")
+                    pages = self.pool.max_pages  # a failed browser is not worth keeping
+
+                if browser is not None and (
+                    pages >= self.pool.max_pages
+                    or _tree_rss_mb(os.getpid()) >= self.pool.max_rss_mb
+                ):
+                    try:
+                        browser.close()
+                    except Exception:
+                        logger.warning("Browser close failed during recycle", exc_info=True)
+                    browser = None
+                    context = None
+                    self.pool.count("recycles")
+
+            if browser is not None:
+                browser.close()
+
+
+class BrowserPool:
+    def __init__(self, size, max_pages, max_rss_mb, max_queue):
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.jobs = queue.Queue(maxsize=max_queue)
+        self.counters = {"pages": 0, "errors": 0, "recycles": 0, "rejected": 0}
+        self._lock = threading.Lock()
+        self.workers = [BrowserWorker(self, i) for i in range(size)]
+
+    def start(self):
+        for worker in self.workers:
+            worker.start()
+
+    def stop(self):
+        for _ in self.workers:
+            self.jobs.put(None)
+
+    def count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def submit(self, url, wait_ms, timeout_ms):
+        future = Future()
+        try:
+            self.jobs.put_nowait((url, wait_ms, timeout_ms, future))
+        except queue.Full:
+            self.count("rejected")
+            return None
+        return future
+
+    def status(self):
+        with self._lock:
+            counters = dict(self.counters)
+        return {
+            "workers": len(self.workers),
+            "queued": self.jobs.qsize(),
+            "rss_mb": _tree_rss_mb(os.getpid()),
+            **counters,
+        }
+
+
+def make_handler(pool, allowed_hosts):
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def _reply(self, status, data):
+            body = json.dumps(data).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._reply(200, pool.status())
+            else:
+                self._reply(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/render":
+                self._reply(404, {"error": "not found"})
+                return
+
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                data = json.loads(self.rfile.read(length) or b"{}")
+                url = data["url"]
+            except (ValueError, KeyError):
+                self._reply(400, {"error": "expected JSON body with 'url'"})
+                return
+
+            if urlsplit(url).hostname not in allowed_hosts:
+                self._reply(403, {"error": "host not allowed"})
+                return
+
+            wait_ms = int(data.get("wait_ms", 5000))
+            timeout_ms = int(data.get("timeout_ms", 60_000))
+
+            future = pool.submit(url, wait_ms, timeout_ms)
+            if future is None:
+                self._reply(503, {"error": "browser pool is busy"})
+                return
+
+            try:
+                text = future.result(timeout=(timeout_ms + wait_ms) / 1000 + 30)
+            except Exception as e:
+                # not a 5xx: the HTTP client would retry a render that just failed
+                self._reply(422, {"error": str(e)})
+                return
+
+            self._reply(200, {"text": text})
+
+        def log_message(self, format, *args):
+            logger.info("browser_service %s", format % args)
+
+    return Handler
+
+
+def serve(host, port, size, max_pages, max_rss_mb, max_queue):
+    pool = BrowserPool(size, max_pages, max_rss_mb, max_queue)
+    pool.start()
+
+    server = ThreadingHTTPServer(
+        (host, port), make_handler(pool, set(settings.BROWSER_ALLOWED_HOSTS))
+    )
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        pool.stop()
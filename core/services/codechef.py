@@ -1,13 +1,26 @@
 import re
 
-import requests
-from bs4 import BeautifulSoup
-from django.utils import timezone
+import lxml.html
 
-from core.models import PlatformAccount, UserStats
+from core.services import async_http, http_client
+from core.services.stats import stats_row
+from core.services.xp import platform_xp
 
 
-CODECHEF_PROFILE_URL = "https://www.codechef.com/users/{username}"
+CODECHEF_PROFILE_URL = "/users/{username}"
+
+
+CONTESTS_RE = re.compile(r"Contests\s*\((\d+)\)", re.I)
+SOLVED_RE = re.compile(r"(?:Fully Solved|Total Problems Solved|Problems Solved)\s*:?\s*\(?\s*(\d+)\s*\)?", re.I)
+
+# only the nodes we read: no whole-page get_text()
+RATING_XPATH = "//*[contains(concat(' ', normalize-space(@class), ' '), ' rating-number ')]"
+CONTESTS_XPATH = (
+    "//text()[contains(., 'Contests') or contains(., 'Contest Participated')]/parent::*"
+)
+SOLVED_XPATH = (
+    "//text()[contains(., 'Fully Solved') or contains(., 'Problems Solved')]/parent::*"
+)
 
 
 def _first_int(value, default=0):
@@ -15,89 +28,91 @@ def _first_int(value, default=0):
     return int(match.group(0)) if match else default
 
 
-def get_codechef_stats(username: str):
-    url = CODECHEF_PROFILE_URL.format(username=username)
-    response = requests.get(
-        url,
-        headers={
-            "User-Agent": "Mozilla/5.0 (compatible; StudyStack/1.0)",
-            "Accept": "text/html,application/xhtml+xml",
-        },
-        timeout=20,
-    )
+def _node_text(node):
+    return " ".join(node.text_content().split())
 
-    if response.status_code == 404:
-        raise Exception("CodeChef user not found")
-    response.raise_for_status()
 
-    soup = BeautifulSoup(response.text, "lxml")
-    page_text = soup.get_text("\n", strip=True)
+def parse_codechef_html(html: str):
+    """Rating, contest count and solved count from a CodeChef profile page."""
+    tree = lxml.html.fromstring(html)
 
-    rating_node = soup.select_one(".rating-number")
-    rating = _first_int(rating_node.get_text(" ", strip=True), 0) if rating_node else 0
+    rating_nodes = tree.xpath(RATING_XPATH)
+    rating = _first_int(_node_text(rating_nodes[0]), 0) if rating_nodes else 0
 
-    contests = 0
-    html_contests = re.search(r"Contests\s*\((\d+)\)", response.text, re.I)
-    if html_contests:
-        contests = int(html_contests.group(1))
-    contests_node = soup.find(string=re.compile(r"Contest Participated|Contests", re.I))
-    if not contests and contests_node:
-        parent_text = contests_node.parent.get_text(" ", strip=True) if contests_node.parent else str(contests_node)
-        contests = _first_int(parent_text, 0)
+    # "Contests (12)" is usually in the raw markup; cheaper than any tree walk
+    match = CONTESTS_RE.search(html)
+    contests = int(match.group(1)) if match else 0
     if not contests:
-        match = re.search(r"Contests\s*\(?\s*(\d+)\s*\)?", page_text, re.I)
-        contests = int(match.group(1)) if match else 0
+        for node in tree.xpath(CONTESTS_XPATH):
+            contests = _first_int(_node_text(node), 0)
+            if contests:
+                break
 
     solved = 0
-    solved_heading = soup.find(string=re.compile(r"Fully Solved|Total Problems Solved|Problems Solved", re.I))
-    if solved_heading:
-        section_text = solved_heading.parent.get_text(" ", strip=True) if solved_heading.parent else str(solved_heading)
-        solved = _first_int(section_text, 0)
-
-    if not solved:
-        match = re.search(r"(?:Fully Solved|Total Problems Solved|Problems Solved)\s*:?\s*\(?\s*(\d+)\s*\)?", page_text, re.I)
-        solved = int(match.group(1)) if match else 0
-
-    rating_bonus = max(0, rating - 1200)
-    xp = (solved * 2) + rating_bonus + (contests * 25)
+    for node in tree.xpath(SOLVED_XPATH):
+        text = _node_text(node)
+        match = SOLVED_RE.search(text)
+        solved = int(match.group(1)) if match else _first_int(text, 0)
+        if solved:
+            break
 
     return {
         "solved": solved,
         "rating": rating,
         "contests": contests,
-        "xp": xp,
     }
 
 
-def sync_codechef_by_username(user):
-    account = PlatformAccount.objects.filter(
-        user=user,
-        platform__slug="codechef",
-    ).first()
-
-    if not account:
-        return None
-
-    data = get_codechef_stats(account.username)
-    stats, _ = UserStats.objects.get_or_create(user=user)
-
-    stats.codechef_username = account.username
-    stats.codechef_solved = data["solved"]
-    stats.codechef_rating = data["rating"]
-    stats.codechef_contests = data["contests"]
-    stats.codechef_xp = data["xp"]
-    stats.last_updated = timezone.now()
-    stats.save(update_fields=[
-        "codechef_username",
-        "codechef_solved",
-        "codechef_rating",
-        "codechef_contests",
-        "codechef_xp",
-        "last_updated",
-    ])
-
-    account.last_synced = timezone.now()
-    account.save(update_fields=["last_synced"])
-    stats.recalculate_totals()
-
-    return data
+def get_codechef_stats(username: str, cache=None):
+    url = http_client.platform_url("codechef", CODECHEF_PROFILE_URL.format(username=username))
+    response = http_client.conditional_get(
+        url,
+        cache,
+        headers={"Accept": "text/html,application/xhtml+xml"},
+        timeout=20,
+    )
+    return _read_stats(url, cache, response)
+
+
+async def aget_codechef_stats(username: str, cache=None):
+    """Async get_codechef_stats() for the ASGI views."""
+    url = http_client.platform_url("codechef", CODECHEF_PROFILE_URL.format(username=username))
+    response = await async_http.conditional_get(
+        url,
+        cache,
+        headers={"Accept": "text/html,application/xhtml+xml"},
+        timeout=20,
+    )
+    return _read_stats(url, cache, response)
+
+
+def codechef_row(data):
+    """PlatformStats values for a get_codechef_stats() result."""
+    return stats_row(
+        data["solved"], data["xp"], rating=data["rating"], contests=data["contests"]
+    )
+
+
+def _read_stats(url, cache, response):
+    try:
+        return _stats_from_response(response)
+    except Exception:
+        # don't keep validators for a body we could not read
+        if cache is not None:
+            cache.pop(url, None)
+        raise
+
+
+def _stats_from_response(response):
+    if response.status_code == 404:
+        raise Exception("CodeChef user not found")
+    response.raise_for_status()
+
+    parsed = parse_codechef_html(response.text)
+
+    return {
+        "solved": parsed["solved"],
+        "rating": parsed["rating"],
+        "contests": parsed["contests"],
+        "xp": platform_xp("codechef", parsed),
+    }
@@ -0,0 +1,131 @@
+"""
+XP distribution sketch for "top X%" badges.
+
+One XPDistribution row counts the users with XP per bucket of BOUNDS,
+for total_xp and for each platform's XP. Stats writes move a user from
+the bucket of their old XP to the one of their new XP right after they
+commit (core.services.stats), and deleted rows leave theirs
+(core.signals), so a percentile is a walk over the buckets instead of a
+scan of UserStats or PlatformStats. Within a bucket users are assumed to
+be spread evenly.
+"""
+
+from bisect import bisect_right
+from math import ceil
+
+from django.db import transaction
+
+from core.models import PlatformStats, UserStats, XPDistribution
+
+TOTAL = "total"
+
+# lower bound of each bucket; the last one is open-ended
+BOUNDS = [
+    1, 10, 25, 50, 75, 100, 150, 200, 300, 400, 500, 750,
+    1000, 1500, 2000, 3000, 4000, 5000, 7500, 10000, 15000, 20000,
+    30000, 50000, 75000, 100000, 200000, 500000, 1000000,
+]
+
+
+def bucket_of(xp):
+    """Index of the bucket holding `xp`; None for users without XP."""
+    if xp < BOUNDS[0]:
+        return None
+    return bisect_right(BOUNDS, xp) - 1
+
+
+def _histogram(values):
+    counts = [0] * len(BOUNDS)
+    for xp in values:
+        index = bucket_of(xp)
+        if index is not None:
+            counts[index] += 1
+    return counts
+
+
+def _fill(distribution):
+    """Recount every bucket from UserStats and PlatformStats."""
+    totals = UserStats.objects.filter(total_xp__gt=0).values_list("total_xp", flat=True)
+    buckets = {TOTAL: _histogram(totals.iterator(chunk_size=5000))}
+
+    platform_ids = (
+        PlatformStats.objects.filter(xp__gt=0).order_by()
+        .values_list("platform_id", flat=True).distinct()
+    )
+    for platform_id in platform_ids:
+        xp = PlatformStats.objects.filter(platform_id=platform_id, xp__gt=0).values_list("xp", flat=True)
+        buckets[str(platform_id)] = _histogram(xp.iterator(chunk_size=5000))
+
+    distribution.bounds = BOUNDS
+    distribution.buckets = buckets
+
+
+def _locked():
+    distribution, created = XPDistribution.objects.select_for_update().get_or_create(pk=1)
+    if created or distribution.bounds != BOUNDS:
+        _fill(distribution)
+        distribution.save()
+        return distribution, True
+    return distribution, False
+
+
+def rebuild_distribution():
+    """Recount the whole distribution (after bulk rescoring)."""
+    with transaction.atomic():
+        distribution, rebuilt = _locked()
+        if not rebuilt:
+            _fill(distribution)
+            distribution.save()
+    return distribution
+
+
+def move_users(moves):
+    """
+    Apply committed XP changes: `moves` is [(key, old xp, new xp)], key
+    being TOTAL or a platform id.
+    """
+    moves = [(str(key), old, new) for key, old, new in moves if bucket_of(old) != bucket_of(new)]
+    if not moves:
+        return
+
+    with transaction.atomic():
+        distribution, rebuilt = _locked()
+        if rebuilt:
+            # counted from the rows these changes were already written to
+            return
+
+        for key, old, new in moves:
+            counts = distribution.buckets.setdefault(key, [0] * len(BOUNDS))
+            if bucket_of(old) is not None:
+                counts[bucket_of(old)] = max(0, counts[bucket_of(old)] - 1)
+            if bucket_of(new) is not None:
+                counts[bucket_of(new)] += 1
+        distribution.save(update_fields=["buckets", "updated_at"])
+
+
+def current_distribution():
+    """The stored distribution, built on first use."""
+    distribution = XPDistribution.objects.filter(pk=1).first()
+    if distribution is None or distribution.bounds != BOUNDS:
+        distribution = rebuild_distribution()
+    return distribution
+
+
+def top_percent(distribution, key, xp):
+    """
+    The "top X%" the user with `xp` is in among users with XP under `key`
+    (TOTAL or a platform id), rounded up to a whole percent; None without XP.
+    """
+    index = bucket_of(xp)
+    counts = distribution.buckets.get(str(key))
+    if index is None or not counts or not sum(counts):
+        return None
+
+    above = sum(counts[index + 1:])
+    if index + 1 < len(BOUNDS):
+        low, high = BOUNDS[index], BOUNDS[index + 1]
+        above += counts[index] * (high - 1 - xp) / (high - low)
+    else:
+        above += counts[index] / 2
+
+    return max(1, min(100, ceil(100 * (above + 1) / sum(counts))))
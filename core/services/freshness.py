@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from core.models import BackgroundJob, PlatformAccount
+
+
+# =========================================
+# Freshness window (settings.SYNC_TTL)
+# =========================================
+def sync_ttl(slug):
+    return timedelta(seconds=settings.SYNC_TTL.get(slug, settings.SYNC_DEFAULT_TTL))
+
+
+def is_account_fresh(account, now=None):
+    if account.last_synced is None:
+        return False
+    now = now or timezone.now()
+    return now - account.last_synced < sync_ttl(account.platform.slug)
+
+
+def is_fresh(user, slug):
+    account = PlatformAccount.objects.filter(
+        user=user, platform__slug=slug
+    ).select_related("platform").first()
+    return account is not None and is_account_fresh(account)
+
+
+# =========================================
+# Per-account single flight
+# Jobs are deduped per kind (sync_all vs
+# sync_<slug>), and inline syncs skip the queue,
+# so the account row itself is claimed for the
+# length of a fetch.
+# =========================================
+def claim_accounts(accounts):
+    """
+    Claim each of `accounts` for one fetch; returns the ones claimed. An
+    account another sync holds an unexpired claim on is left out.
+    """
+    now = timezone.now()
+    until = now + timedelta(seconds=settings.SYNC_CLAIM_TIMEOUT)
+    free = Q(sync_claimed_until__isnull=True) | Q(sync_claimed_until__lt=now)
+
+    return [
+        account for account in accounts
+        if PlatformAccount.objects.filter(free, pk=account.pk).update(sync_claimed_until=until)
+    ]
+
+
+def release_accounts(accounts):
+    PlatformAccount.objects.filter(
+        pk__in=[account.pk for account in accounts]
+    ).update(sync_claimed_until=None)
+
+
+# =========================================
+# Coalesced sync requests
+# =========================================
+def request_sync(user, slug, force=False):
+    """
+    Queue a sync for one platform unless it is still fresh.
+
+    Every caller for the same (user, platform) shares one in-flight job;
+    returns that job, or None when the stored stats are fresh enough.
+    """
+    if not force and is_fresh(user, slug):
+        return None
+
+    from core.services.jobs import enqueue
+    return enqueue(
+        user,
+        f"sync_{slug}",
+        dedupe_key=f"sync_{slug}:{user.pk}",
+        force=force,
+    )
+
+
+def request_sync_all(user):
+    from core.services.jobs import enqueue
+    return enqueue(user, "sync_all", dedupe_key=f"sync_all:{user.pk}")
+
+
+def revalidate_stale(user, accounts):
+    """
+    Stale-while-revalidate for the profile page.
+
+    The caller renders the last-known stats immediately; if any connected
+    account is past its TTL, one background sync_all job refreshes them.
+    After a refresh attempt, wait SYNC_REVALIDATE_BACKOFF before trying
+    again so a platform that keeps failing does not requeue on every view.
+    """
+    now = timezone.now()
+    if all(is_account_fresh(account, now) for account in accounts):
+        return None
+
+    recently_tried = BackgroundJob.objects.filter(
+        user=user,
+        kind="sync_all",
+        finished_at__gte=now - timedelta(seconds=settings.SYNC_REVALIDATE_BACKOFF),
+    ).exists()
+    if recently_tried:
+        return None
+
+    return request_sync_all(user)
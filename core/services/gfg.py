@@ -1,33 +1,98 @@
-from playwright.sync_api import sync_playwright
-from django.utils import timezone
-from core.models import PlatformAccount, UserStats
+import json
+import logging
+import re
+
+import requests
+from core.services import http_client
+from core.services.browser import BrowserServiceError, render_page_text
+from core.services.stats import stats_row
+from core.services.throttle import CircuitOpen, RateLimited
+from core.services.xp import platform_xp
+
+logger = logging.getLogger(__name__)
+
+GFG_PROFILE_API = "/api-get/user-profile-info/"
+GFG_PROFILE_URL = "/profile/{username}/?tab=activity"
+
+NEXT_DATA_RE = re.compile(
+    r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.S
+)
+
+
+def _to_int(value):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _find_profile(node):
+    """Depth-first search for the dict carrying the profile counters."""
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            if "total_problems_solved" in item:
+                return item
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+    return None
 
 
 # ---------------------------------------------------
-# Fetch GFG stats using Playwright
+# Strategy 1: public profile JSON endpoint
 # ---------------------------------------------------
-def get_gfg_stats(username: str):
-    url = f"https://www.geeksforgeeks.org/profile/{username}/?tab=activity"
+def _stats_from_api(username):
+    r = http_client.get(http_client.platform_url("gfg_api", GFG_PROFILE_API), params={"handle": username}, timeout=10)
+    if r.status_code != 200:
+        return None
 
-    solved = 0
-    score = 0
+    profile = _find_profile(r.json())
+    if not profile:
+        return None
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(
-            headless=True,
-            args=["--no-sandbox", "--disable-dev-shm-usage"]  # safer on servers
-        )
-        page = browser.new_page()
+    return {
+        "solved": _to_int(profile.get("total_problems_solved")),
+        "score": _to_int(profile.get("score")),
+    }
 
-        try:
-            page.goto(url, timeout=60000)
-            page.wait_for_load_state("networkidle")
-            page.wait_for_timeout(6000)
 
-            content = page.inner_text("body")
+# ---------------------------------------------------
+# Strategy 2: data embedded in the server-rendered page
+# ---------------------------------------------------
+def _stats_from_page(username):
+    r = http_client.get(
+        http_client.platform_url("gfg", GFG_PROFILE_URL.format(username=username)),
+        headers={"Accept": "text/html,application/xhtml+xml"},
+        timeout=10,
+    )
+    if r.status_code != 200:
+        return None
+
+    match = NEXT_DATA_RE.search(r.text)
+    if not match:
+        return None
 
-        finally:
-            browser.close()
+    profile = _find_profile(json.loads(match.group(1)))
+    if not profile:
+        return None
+
+    return {
+        "solved": _to_int(profile.get("total_problems_solved")),
+        "score": _to_int(profile.get("score")),
+    }
+
+
+# ---------------------------------------------------
+# Strategy 3: full render via the browser service
+# ---------------------------------------------------
+def _stats_from_browser(username):
+    url = http_client.platform_url("gfg", GFG_PROFILE_URL.format(username=username))
+
+    found = {}
+
+    content = render_page_text(url, wait_ms=6000, timeout_ms=60000)
 
     lines = [l.strip() for l in content.split("\n") if l.strip()]
 
@@ -35,60 +100,79 @@ def get_gfg_stats(username: str):
         low = line.lower()
 
         if low == "problems solved" and i + 1 < len(lines):
-            solved = int("".join(c for c in lines[i + 1] if c.isdigit()) or 0)
+            found["solved"] = int("".join(c for c in lines[i + 1] if c.isdigit()) or 0)
 
         if low == "coding score" and i + 1 < len(lines):
-            score = int("".join(c for c in lines[i + 1] if c.isdigit()) or 0)
+            found["score"] = int("".join(c for c in lines[i + 1] if c.isdigit()) or 0)
+
+    # labels missing: not a rendered profile, don't report zeros
+    if "solved" not in found:
+        return None
 
     return {
-        "solved": solved,
-        "score": score,
+        "solved": found["solved"],
+        "score": found.get("score", 0),
     }
 
 
-# ---------------------------------------------------
-# Main sync
-# ---------------------------------------------------
-def sync_gfg_by_username(user):
+GFG_STRATEGIES = {
+    "api": _stats_from_api,
+    "page": _stats_from_page,
+    "browser": _stats_from_browser,
+}
 
-    account = PlatformAccount.objects.filter(
-        user=user,
-        platform__slug="gfg"
-    ).first()
+# strategies a sync may remember and try first; the browser is only ever
+# the last resort, so one transient failure doesn't mean Chromium for good
+GFG_PREFERABLE = ("api", "page")
 
-    if not account:
-        return None
 
-    data = get_gfg_stats(account.username)
+# ---------------------------------------------------
+# Fetch GFG stats: cheapest strategy first
+# ---------------------------------------------------
+def get_gfg_stats(username: str, prefer=None):
+    """
+    Try the plain-HTTP strategies before the browser.
+
+    `prefer` (the plain-HTTP strategy that worked last time) is tried
+    first; the browser always comes last. The returned dict carries
+    "source" = the strategy that served it.
+    """
+    order = list(GFG_STRATEGIES)
+    if prefer in GFG_PREFERABLE:
+        order.remove(prefer)
+        order.insert(0, prefer)
+
+    last_error = None
+    for name in order:
+        try:
+            data = GFG_STRATEGIES[name](username)
+        except (CircuitOpen, RateLimited):
+            # the other strategies hit the same host: fail fast
+            raise
+        except (requests.RequestException, ValueError, BrowserServiceError) as e:
+            logger.info("GFG %s strategy failed for user=%s: %s", name, username, e)
+            last_error = e
+            continue
+
+        if data is not None:
+            logger.info("GFG stats for user=%s served by %s", username, name)
+            return {**data, "source": name}
 
-    solved = data["solved"]
-    score = data["score"]
+    raise Exception(f"GFG stats unavailable: {last_error or 'user not found'}")
 
-    # ✅ YOUR REQUIRED FORMULA
-    xp = (score * 10) + (solved * 5)
 
-    stats, _ = UserStats.objects.get_or_create(user=user)
+# ---------------------------------------------------
+# XP (core.services.xp)
+# ---------------------------------------------------
+def gfg_xp(data):
+    return platform_xp("gfg", data)
 
-    stats.gfg_username = account.username
-    stats.gfg_solved = solved
-    stats.gfg_xp = xp
-    stats.last_updated = timezone.now()
-    stats.save(update_fields=[
-        "gfg_username",
-        "gfg_solved",
-        "gfg_xp",
-        "last_updated"
-    ])
 
-    account.last_synced = timezone.now()
-    account.save(update_fields=["last_synced"])
+def preferred_strategy(data, current):
+    """The account's fetch_strategy after a get_gfg_stats() result."""
+    return data["source"] if data["source"] in GFG_PREFERABLE else current
 
-    # ✅ Always recompute global totals safely
-    if hasattr(stats, "recalculate_totals"):
-        stats.recalculate_totals()
 
-    return {
-        "solved": solved,
-        "score": score,
-        "xp": xp
-    }
+def gfg_row(data):
+    """PlatformStats values for a get_gfg_stats() result."""
+    return stats_row(data["solved"], gfg_xp(data), score=data["score"])
@@ -1,175 +1,383 @@
+import asyncio
+import logging
 import os
 import re
-import requests
-from bs4 import BeautifulSoup
+import time
+from datetime import datetime
+import lxml.html
+from django.conf import settings
 from django.utils import timezone
-from core.models import PlatformAccount, UserStats
+from core.services import async_http, http_client
+from core.services.activity import store_daily_counts
+from core.services.http_client import NotModified
+from core.services.stats import stats_row
+from core.services.xp import platform_xp
 
-GITHUB_GRAPHQL = "https://api.github.com/graphql"
-GITHUB_REST = "https://api.github.com"
+GITHUB_GRAPHQL = "/graphql"
 
+logger = logging.getLogger(__name__)
 
-def _first_int(text, default=0):
-    match = re.search(r"\d+", text.replace(",", ""))
-    return int(match.group(0)) if match else default
 
+CONTRIBUTIONS_RE = re.compile(r"([\d,]+)\s+contributions?\s+in\s+the\s+last\s+year", re.I)
 
-def scrape_github_profile(username):
-    headers = {
-        "User-Agent": "Mozilla/5.0 (compatible; StudyStack/1.0)",
-        "Accept": "text/html,application/xhtml+xml",
+# targeted lookup instead of a whole-page get_text()
+CONTRIBUTIONS_XPATH = "//h2[contains(., 'contribution')]"
+
+# calendar cells carry the date; the per-day count is in the matching tool-tip
+CALENDAR_DAY_XPATH = "//td[@data-date]"
+CALENDAR_TOOLTIP_XPATH = "//tool-tip[@for]"
+DAY_COUNT_RE = re.compile(r"^\s*(No|[\d,]+)\s+contributions?", re.I)
+
+
+def _node_text(node):
+    return " ".join(node.text_content().split())
+
+
+def _total_from_tree(tree):
+    for node in tree.xpath(CONTRIBUTIONS_XPATH):
+        match = CONTRIBUTIONS_RE.search(_node_text(node))
+        if match:
+            return int(match.group(1).replace(",", ""))
+    return 0
+
+
+def _days_from_tree(tree):
+    counts = {}
+    for tip in tree.xpath(CALENDAR_TOOLTIP_XPATH):
+        match = DAY_COUNT_RE.match(tip.text_content())
+        if match:
+            value = match.group(1)
+            counts[tip.get("for")] = 0 if value.lower() == "no" else int(value.replace(",", ""))
+
+    return {
+        cell.get("data-date"): counts.get(cell.get("id"), int(cell.get("data-count") or 0))
+        for cell in tree.xpath(CALENDAR_DAY_XPATH)
     }
-    profile = requests.get(f"{GITHUB_REST.replace('api.', '')}/{username}", headers=headers, timeout=20)
-    if profile.status_code == 404:
+
+
+def parse_github_contributions(html):
+    """Last-year contribution total from the contributions fragment (0 if missing)."""
+    return _total_from_tree(lxml.html.fromstring(html))
+
+
+def parse_github_calendar(html):
+    """{"total", "days": {"YYYY-MM-DD": contributions}} from the contributions fragment."""
+    tree = lxml.html.fromstring(html)
+    return {"total": _total_from_tree(tree), "days": _days_from_tree(tree)}
+
+
+# --------------------------------
+# Small per-user fetches (no token)
+# --------------------------------
+def _fetch_value(url, cache, parse, remember=None, **kwargs):
+    """
+    Conditional GET of `url`, parsed by `parse`; returns (value, changed).
+
+    The parsed value, or the part of it `remember(value)` picks, is stored
+    next to the validators in `cache`, so an unchanged document is answered
+    from the cache without re-downloading.
+    """
+    if cache is None:
+        response = http_client.get(url, **kwargs)
+    else:
+        try:
+            response = http_client.conditional_get(url, cache, **kwargs)
+        except NotModified:
+            if "value" in cache.get(url, {}):
+                return cache[url]["value"], False
+            # validators from before values were cached: fetch it once more
+            response = http_client.get(url, **kwargs)
+
+    return _read_value(url, cache, parse, response, remember)
+
+
+async def _afetch_value(url, cache, parse, remember=None, **kwargs):
+    if cache is None:
+        response = await async_http.get(url, **kwargs)
+    else:
+        try:
+            response = await async_http.conditional_get(url, cache, **kwargs)
+        except NotModified:
+            if "value" in cache.get(url, {}):
+                return cache[url]["value"], False
+            response = await async_http.get(url, **kwargs)
+
+    return _read_value(url, cache, parse, response, remember)
+
+
+def _read_value(url, cache, parse, response, remember=None):
+    if response.status_code == 404:
         raise Exception("GitHub user not found")
-    profile.raise_for_status()
+    response.raise_for_status()
 
-    soup = BeautifulSoup(profile.text, "lxml")
-    text = soup.get_text("\n", strip=True)
+    try:
+        value = parse(response)
+    except Exception:
+        # don't keep validators for a body we could not read
+        if cache is not None:
+            cache.pop(url, None)
+        raise
+
+    if cache is not None and url in cache:
+        cache[url]["value"] = remember(value) if remember else value
+    return value, True
+
+
+def _repo_count_request(username):
+    """`public_repos` from the users API: a ~1 KB JSON document."""
+    return dict(
+        url=http_client.platform_url("github_api", f"/users/{username}"),
+        parse=lambda r: int(r.json().get("public_repos") or 0),
+        headers={"Accept": "application/vnd.github+json"},
+        timeout=15,
+    )
 
-    contributions = 0
-    match = re.search(r"([\d,]+)\s+contributions?\s+in\s+the\s+last\s+year", text, re.I)
-    if match:
-        contributions = int(match.group(1).replace(",", ""))
 
-    repos = 0
-    repos_page = requests.get(
-        f"{GITHUB_REST.replace('api.', '')}/{username}?tab=repositories",
-        headers=headers,
+def _contributions_request(username):
+    """
+    Last-year total and per-day counts from the calendar fragment, not the
+    full profile page. Only the total is cached: an unchanged fragment
+    comes back as {"total"} with no "days".
+    """
+    return dict(
+        url=http_client.platform_url("github_web", f"/users/{username}/contributions"),
+        parse=lambda r: parse_github_calendar(r.text),
+        remember=lambda value: {"total": value["total"]},
+        headers={"Accept": "text/html"},
         timeout=20,
     )
-    repos_page.raise_for_status()
-    repos_soup = BeautifulSoup(repos_page.text, "lxml")
-    repo_counter = repos_soup.select_one('a[href$="?tab=repositories"] .Counter')
-    if repo_counter:
-        repos = _first_int(repo_counter.get_text(" ", strip=True))
-    if not repos:
-        repo_match = re.search(r"Repositories\s+([\d,]+)", repos_soup.get_text(" ", strip=True), re.I)
-        repos = int(repo_match.group(1).replace(",", "")) if repo_match else 0
+
+
+def get_public_repo_count(username, cache=None):
+    return _fetch_value(cache=cache, **_repo_count_request(username))
+
+
+def get_contribution_calendar(username, cache=None):
+    return _fetch_value(cache=cache, **_contributions_request(username))
+
+
+def _activity(repos, contributions):
+    # cache entries written before the calendar was read hold the bare total
+    if not isinstance(contributions, dict):
+        contributions = {"total": contributions}
 
     return {
         "repos": repos,
-        "contributions": contributions,
+        "contributions": contributions["total"],
+        "xp": github_xp(repos, contributions["total"]),
+        "calendar": contributions.get("days"),
     }
 
 
 # --------------------------------
-# GraphQL — contributions
+# GraphQL — many users per request
 # --------------------------------
-def get_contributions(username, token):
-    query = """
-    query($login: String!) {
-      user(login: $login) {
-        contributionsCollection {
-          contributionCalendar {
-            totalContributions
+BULK_USER_FIELDS = """
+    repositories(ownerAffiliations: OWNER, privacy: PUBLIC) {
+      totalCount
+    }
+    contributionsCollection {
+      contributionCalendar {
+        totalContributions
+        weeks {
+          contributionDays {
+            date
+            contributionCount
           }
         }
       }
     }
+"""
+
+
+def _bulk_query(count):
+    variables = ", ".join(f"$u{i}: String!" for i in range(count))
+    users = "\n".join(
+        f"u{i}: user(login: $u{i}) {{{BULK_USER_FIELDS}}}" for i in range(count)
+    )
+    return f"""
+    query({variables}) {{
+      rateLimit {{ cost remaining resetAt }}
+      {users}
+    }}
     """
 
-    r = requests.post(
-        GITHUB_GRAPHQL,
-        json={"query": query, "variables": {"login": username}},
+
+def _wait_for_rate_limit(rate_limit, next_cost):
+    """Sleep until resetAt when the next batch would overdraw the budget."""
+    if not rate_limit or rate_limit["remaining"] >= next_cost:
+        return
+
+    reset_at = datetime.fromisoformat(rate_limit["resetAt"].replace("Z", "+00:00"))
+    pause = (reset_at - timezone.now()).total_seconds() + 1
+    if pause > settings.GITHUB_RATE_LIMIT_MAX_SLEEP:
+        raise Exception(f"GitHub GraphQL budget exhausted until {rate_limit['resetAt']}")
+    if pause > 0:
+        logger.info("GitHub GraphQL budget low, sleeping %.0fs", pause)
+        time.sleep(pause)
+
+
+def get_github_stats_bulk(usernames, token, batch_size=None):
+    """
+    Repo count + last-year contributions for many users.
+
+    Packs `batch_size` logins into one aliased GraphQL query (no repo lists
+    are downloaded) and honours the rateLimit cost/remaining fields between
+    batches. Returns {username: {"repos", "contributions", "xp"} or None};
+    None means GitHub has no such user.
+    """
+    batch_size = batch_size or settings.GITHUB_GRAPHQL_BATCH
+    results = {}
+    rate_limit = None
+    last_cost = 1
+
+    for start in range(0, len(usernames), batch_size):
+        batch = usernames[start:start + batch_size]
+        _wait_for_rate_limit(rate_limit, last_cost)
+
+        r = http_client.post(
+            http_client.platform_url("github_api", GITHUB_GRAPHQL),
+            json=_bulk_payload(batch),
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json"
+            },
+            timeout=30
+        )
+        r.raise_for_status()
+        data = _bulk_data(r.json())
+
+        rate_limit = data.get("rateLimit")
+        if rate_limit:
+            last_cost = rate_limit["cost"]
+
+        results.update(_bulk_results(data, batch))
+
+    return results
+
+
+async def aget_github_stats(username, token):
+    """One-user GraphQL fetch for the ASGI views (no batching, no budget sleep)."""
+    r = await async_http.post(
+        http_client.platform_url("github_api", GITHUB_GRAPHQL),
+        json=_bulk_payload([username]),
         headers={
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json"
         },
-        timeout=15
+        timeout=30
     )
     r.raise_for_status()
-    data = r.json()
+    return _bulk_results(_bulk_data(r.json()), [username])[username]
 
-    return (
-        data["data"]["user"]["contributionsCollection"]
-        ["contributionCalendar"]["totalContributions"]
-    )
 
+def _bulk_payload(batch):
+    return {
+        "query": _bulk_query(len(batch)),
+        "variables": {f"u{i}": login for i, login in enumerate(batch)},
+    }
 
-# --------------------------------
-# Repo count (REST)
-# --------------------------------
-def get_repo_count(username, token=None):
-    repos = []
-    page = 1
 
-    headers = {}
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
-
-    while True:
-        r = requests.get(
-            f"https://api.github.com/users/{username}/repos",
-            params={"per_page": 100, "page": page},
-            headers=headers,
-            timeout=15
-        )
-        r.raise_for_status()
-        data = r.json()
+def _bulk_data(payload):
+    data = payload.get("data")
+    if data is None:
+        raise Exception(f"GitHub GraphQL error: {payload.get('errors')}")
+    return data
+
+
+def _bulk_results(data, batch):
+    results = {}
+
+    # unknown logins come back as null with a NOT_FOUND error for that alias
+    for i, login in enumerate(batch):
+        node = data.get(f"u{i}")
+        if node is None:
+            results[login] = None
+            continue
+
+        repos = node["repositories"]["totalCount"]
+        calendar = node["contributionsCollection"]["contributionCalendar"]
+        contributions = calendar["totalContributions"]
+        results[login] = {
+            "repos": repos,
+            "contributions": contributions,
+            "xp": github_xp(repos, contributions),
+            "calendar": {
+                day["date"]: day["contributionCount"]
+                for week in calendar.get("weeks") or []
+                for day in week["contributionDays"]
+            },
+        }
+
+    return results
+
 
-        if not data:
-            break
+# --------------------------------
+# XP (core.services.xp)
+# --------------------------------
+def github_xp(repos, contributions):
+    return platform_xp("github", {"repos": repos, "contributions": contributions})
 
-        repos.extend(data)
-        page += 1
 
-    return len(repos)
+def github_row(data):
+    """PlatformStats values for a fetch_github_activity() result."""
+    return stats_row(
+        0, data["xp"], repos=data["repos"], contributions=data["contributions"]
+    )
 
 
 # --------------------------------
-# Main sync
+# Fetch (no stats writes)
 # --------------------------------
-def sync_github_activity(account):
+def fetch_github_activity(username, cache=None):
+    """
+    Repo count + last-year contributions with the fewest requests.
+
+    With GITHUB_TOKEN: one GraphQL call that returns both numbers.
+    Without: the users API (public_repos) plus the contributions
+    fragment, both conditional; raises NotModified when neither changed.
+    "calendar" maps each day of the last year to its contributions, or is
+    None when the fragment was unchanged.
+    """
+    token = os.getenv("GITHUB_TOKEN")
 
-    username = account.username
-    token = os.getenv("GITHUB_TOKEN")  # ✅ auto-read env token
+    if token:
+        data = get_github_stats_bulk([username], token, batch_size=1)[username]
+        if data is None:
+            raise Exception("GitHub user not found")
+        return data
 
-    repos = 0
-    contributions = 0
+    repos, repos_changed = get_public_repo_count(username, cache)
+    contributions, contributions_changed = get_contribution_calendar(username, cache)
 
-    try:
-        scraped = scrape_github_profile(username)
-        repos = scraped["repos"]
-        contributions = scraped["contributions"]
-    except Exception as e:
-        print("GitHub profile scrape failed:", e)
+    if cache is not None and not (repos_changed or contributions_changed):
+        raise NotModified(username)
 
-    if not repos:
-        try:
-            repos = get_repo_count(username)
-        except Exception as e:
-            print("GitHub repo fetch failed:", e)
+    return _activity(repos, contributions)
 
-    if not contributions and token:
-        try:
-            contributions = get_contributions(username, token)
-        except Exception as e:
-            print("GitHub contributions fetch failed:", e)
 
-    # --------------------------------
-    # YOUR FORMULA
-    # (repos × 15) + (contributions × 5)
-    # --------------------------------
-    xp = (repos * 15) + (contributions * 5)
+async def afetch_github_activity(username, cache=None):
+    """Async fetch_github_activity(); the two no-token requests run concurrently."""
+    token = os.getenv("GITHUB_TOKEN")
 
-    stats, _ = UserStats.objects.get_or_create(user=account.user)
+    if token:
+        data = await aget_github_stats(username, token)
+        if data is None:
+            raise Exception("GitHub user not found")
+        return data
+
+    (repos, repos_changed), (contributions, contributions_changed) = await asyncio.gather(
+        _afetch_value(cache=cache, **_repo_count_request(username)),
+        _afetch_value(cache=cache, **_contributions_request(username)),
+    )
 
-    stats.github_username = username
-    stats.github_repos = repos
-    stats.total_commits = contributions
-    stats.github_xp = xp
-    stats.last_updated = timezone.now()
-    stats.save()
+    if cache is not None and not (repos_changed or contributions_changed):
+        raise NotModified(username)
 
-    # safe global recompute
-    stats.recalculate_totals()
+    return _activity(repos, contributions)
 
-    account.last_synced = timezone.now()
-    account.save(update_fields=["last_synced"])
 
-    return {
-        "repos": repos,
-        "contributions": contributions,
-        "xp": xp
-    }
+def store_contribution_calendar(account, calendar):
+    """Write the days of `calendar` that changed into DailyActivity/UserHeatmap."""
+    if calendar:
+        store_daily_counts(account, calendar, lambda count: github_xp(0, count))
@@ -1,6 +1,10 @@
+import httpx
 import requests
 from django.conf import settings
 
+from core.services import async_http, http_client
+from core.services.throttle import CircuitOpen, RateLimited
+
 # -------------------------------------------------
 # GROQ CONFIG
 # -------------------------------------------------
@@ -13,14 +17,9 @@ MODEL = "llama-3.3-70b-versatile"
 # CORE GROQ CALLER (SAFE)
 # -------------------------------------------------
 
-def call_groq(messages, temperature=0.4):
-    api_key = getattr(settings, "GROQ_API_KEY", None)
-
-    if not api_key:
-        return "❌ GROQ_API_KEY not found in Django settings."
-
+def _request(messages, temperature):
     headers = {
-        "Authorization": f"Bearer {api_key}",
+        "Authorization": f"Bearer {settings.GROQ_API_KEY}",
         "Content-Type": "application/json"
     }
 
@@ -30,24 +29,32 @@ def call_groq(messages, temperature=0.4):
         "temperature": temperature
     }
 
-    try:
-        response = requests.post(
-            GROQ_URL,
-            headers=headers,
-            json=payload,
-            timeout=60
-        )
+    return dict(headers=headers, json=payload, timeout=60)
+
 
-        if response.status_code != 200:
-            print("Groq error:", response.text)
-            return "⚠️ AI service is temporarily unavailable. Please try again."
+def _reply_text(response):
+    if response.status_code != 200:
+        print("Groq error:", response.text)
+        return "⚠️ AI service is temporarily unavailable. Please try again."
 
-        data = response.json()
+    data = response.json()
 
-        if "choices" not in data:
-            return "❌ Groq returned unexpected response."
+    if "choices" not in data:
+        return "❌ Groq returned unexpected response."
 
-        return data["choices"][0]["message"]["content"]
+    return data["choices"][0]["message"]["content"]
+
+
+def call_groq(messages, temperature=0.4):
+    if not getattr(settings, "GROQ_API_KEY", None):
+        return "❌ GROQ_API_KEY not found in Django settings."
+
+    try:
+        response = http_client.post(GROQ_URL, **_request(messages, temperature))
+        return _reply_text(response)
+
+    except (CircuitOpen, RateLimited):
+        return "⚠️ AI service is temporarily unavailable. Please try again."
 
     except requests.exceptions.Timeout:
         return "❌ Groq API timeout. Please try again."
@@ -56,6 +63,25 @@ def call_groq(messages, temperature=0.4):
         return f"❌ Groq API error: {str(e)}"
 
 
+async def acall_groq(messages, temperature=0.4):
+    """call_groq() for the ASGI views: same messages, same fallbacks."""
+    if not getattr(settings, "GROQ_API_KEY", None):
+        return "❌ GROQ_API_KEY not found in Django settings."
+
+    try:
+        response = await async_http.post(GROQ_URL, **_request(messages, temperature))
+        return _reply_text(response)
+
+    except (CircuitOpen, RateLimited):
+        return "⚠️ AI service is temporarily unavailable. Please try again."
+
+    except httpx.TimeoutException:
+        return "❌ Groq API timeout. Please try again."
+
+    except Exception as e:
+        return f"❌ Groq API error: {str(e)}"
+
+
 # -------------------------------------------------
 # AI ROADMAP GENERATOR
 # -------------------------------------------------
@@ -64,8 +90,15 @@ def generate_goal_solution(goal_title: str) -> str:
     """
     Generates a structured AI learning roadmap using Groq.
     """
+    return call_groq(_goal_messages(goal_title))
 
-    messages = [
+
+async def agenerate_goal_solution(goal_title: str) -> str:
+    return await acall_groq(_goal_messages(goal_title))
+
+
+def _goal_messages(goal_title):
+    return [
         {
             "role": "system",
             "content": "You are an expert learning architect who creates clear, practical learning roadmaps."
@@ -89,8 +122,6 @@ Return clearly in this format:
         }
     ]
 
-    return call_groq(messages)
-
 
 # -------------------------------------------------
 # TASK AI ASSISTANT (CHAT MODE)
@@ -101,7 +132,15 @@ def generate_task_ai_reply(task, user_message: str) -> str:
     Task-aware AI assistant.
     Supports explaining, solving, revising, quizzing.
     """
+    return call_groq(_task_messages(task, user_message), temperature=0.5)
 
+
+async def agenerate_task_ai_reply(task, user_message: str) -> str:
+    """Async generate_task_ai_reply(); load `task` with its subject first."""
+    return await acall_groq(_task_messages(task, user_message), temperature=0.5)
+
+
+def _task_messages(task, user_message):
     system_prompt = f"""
 You are a professional study assistant.
 
@@ -119,9 +158,7 @@ Your behavior:
 Always be clear, structured, and encouraging.
 """
 
-    messages = [
+    return [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_message}
     ]
-
-    return call_groq(messages, temperature=0.5)
@@ -1,106 +1,165 @@
-import json
+import logging
 import re
 
+import httpx
+import lxml.html
 import requests
-from bs4 import BeautifulSoup
-from django.utils import timezone
 
-from core.models import PlatformAccount, UserStats
+from core.services import async_http, http_client
+from core.services.stats import stats_row
+from core.services.throttle import CircuitOpen, RateLimited
+from core.services.xp import platform_xp
 
 
-HACKERRANK_PROFILE_URL = "https://www.hackerrank.com/profile/{username}"
-HACKERRANK_PROFILE_API = "https://www.hackerrank.com/rest/hackers/{username}/profile"
+HACKERRANK_PROFILE_URL = "/profile/{username}"
+HACKERRANK_PROFILE_API = "/rest/hackers/{username}/profile"
 
+logger = logging.getLogger(__name__)
 
-def _solved_from_html(html: str):
-    soup = BeautifulSoup(html, "lxml")
+# read straight out of the embedded __NEXT_DATA__ JSON text; no json.loads
+SOLVED_JSON_RE = re.compile(r'"solved_challenges"\s*:\s*(\d+)')
 
-    next_data = soup.select_one("script#__NEXT_DATA__")
-    if next_data and next_data.string:
-        try:
-            payload = json.loads(next_data.string)
-            text = json.dumps(payload)
-            match = re.search(r'"solved_challenges"\s*:\s*(\d+)', text)
+SOLVED_PATTERNS = [
+    re.compile(r"solved challenges?\s*(\d+)", re.I),
+    re.compile(r"challenges solved\s*(\d+)", re.I),
+    re.compile(r"(\d+)\s*challenges solved", re.I),
+]
+
+# the badge/stat blocks that mention solved challenges, not the whole page
+SOLVED_TEXT_XPATH = (
+    "//text()[not(parent::script) and not(parent::style)]"
+    "[contains(translate(., 'SOLVED', 'solved'), 'solved')]/ancestor::*[position() <= 2]"
+)
+
+
+def parse_hackerrank_html(html: str):
+    """Solved challenge count from a HackerRank profile page, or None."""
+    match = SOLVED_JSON_RE.search(html)
+    if match:
+        return int(match.group(1))
+
+    tree = lxml.html.fromstring(html)
+    for node in tree.xpath(SOLVED_TEXT_XPATH):
+        text = " ".join(node.text_content().split())
+        for pattern in SOLVED_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return int(match.group(1))
-        except json.JSONDecodeError:
-            pass
-
-    text = soup.get_text(" ", strip=True)
-    patterns = [
-        r"solved challenges?\s*(\d+)",
-        r"challenges solved\s*(\d+)",
-        r"(\d+)\s*challenges solved",
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text, re.I)
-        if match:
-            return int(match.group(1))
 
     return None
 
 
-def get_hackerrank_stats(username: str):
-    response = requests.get(
-        HACKERRANK_PROFILE_URL.format(username=username),
-        headers={
-            "User-Agent": "Mozilla/5.0 (compatible; StudyStack/1.0)",
-            "Accept": "text/html,application/xhtml+xml",
-        },
-        timeout=20,
-    )
+# Strategy 1: REST profile endpoint (small JSON document)
+def _solved_from_api(response):
+    if response.status_code != 200:
+        return None
 
-    solved = None
-    if response.status_code == 200:
-        solved = _solved_from_html(response.text)
-    elif response.status_code == 404:
+    solved = (response.json().get("model") or {}).get("solved_challenges")
+    return int(solved) if solved is not None else None
+
+
+# Strategy 2: profile page
+def _solved_from_page(response):
+    if response.status_code == 404:
         raise Exception("HackerRank user not found")
-    else:
-        response.raise_for_status()
-
-    if solved is None:
-        api_response = requests.get(
-            HACKERRANK_PROFILE_API.format(username=username),
-            headers={"User-Agent": "Mozilla/5.0 (compatible; StudyStack/1.0)"},
-            timeout=20,
-        )
-        if api_response.status_code == 404:
-            raise Exception("HackerRank user not found")
-        api_response.raise_for_status()
-        solved = int(api_response.json().get("model", {}).get("solved_challenges") or 0)
-
-    xp = solved * 6
+    response.raise_for_status()
+    return parse_hackerrank_html(response.text)
+
+
+# name -> (path, Accept header, parser)
+HACKERRANK_STRATEGIES = {
+    "api": (HACKERRANK_PROFILE_API, "application/json", _solved_from_api),
+    "page": (HACKERRANK_PROFILE_URL, "text/html,application/xhtml+xml", _solved_from_page),
+}
+
+
+def _strategy_order(prefer):
+    order = list(HACKERRANK_STRATEGIES)
+    if prefer in HACKERRANK_STRATEGIES:
+        order.remove(prefer)
+        order.insert(0, prefer)
+    return order
+
+
+def _stats(solved, source):
     return {
         "solved": solved,
-        "xp": xp,
+        "xp": platform_xp("hackerrank", {"solved": solved}),
+        "source": source,
     }
 
 
-def sync_hackerrank_by_username(user):
-    account = PlatformAccount.objects.filter(
-        user=user,
-        platform__slug="hackerrank",
-    ).first()
-
-    if not account:
-        return None
-
-    data = get_hackerrank_stats(account.username)
-    stats, _ = UserStats.objects.get_or_create(user=user)
-
-    stats.hackerrank_username = account.username
-    stats.hackerrank_solved = data["solved"]
-    stats.hackerrank_xp = data["xp"]
-    stats.last_updated = timezone.now()
-    stats.save(update_fields=[
-        "hackerrank_username",
-        "hackerrank_solved",
-        "hackerrank_xp",
-        "last_updated",
-    ])
-
-    account.last_synced = timezone.now()
-    account.save(update_fields=["last_synced"])
-    stats.recalculate_totals()
-
-    return data
+def _read_solved(parse, response, cache, url):
+    """
+    parse(response), dropping the validators conditional_get just stored
+    when the body can't be read: otherwise the next sync would take the
+    same unreadable body for unchanged.
+    """
+    solved = None
+    try:
+        solved = parse(response)
+        return solved
+    finally:
+        if solved is None and cache is not None:
+            cache.pop(url, None)
+
+
+def hackerrank_row(data):
+    """PlatformStats values for a get_hackerrank_stats() result."""
+    return stats_row(data["solved"], data["xp"])
+
+
+def get_hackerrank_stats(username: str, cache=None, prefer=None):
+    """
+    REST endpoint first, profile page second.
+
+    `prefer` (the strategy that worked last time) is tried first. The
+    returned dict carries "source" = the strategy that served it.
+    NotModified from either strategy propagates to the caller.
+    """
+    last_error = None
+    for name in _strategy_order(prefer):
+        path, accept, parse = HACKERRANK_STRATEGIES[name]
+        url = http_client.platform_url("hackerrank", path.format(username=username))
+        try:
+            response = http_client.conditional_get(
+                url, cache, headers={"Accept": accept}, timeout=20
+            )
+            solved = _read_solved(parse, response, cache, url)
+        except (CircuitOpen, RateLimited):
+            # the other strategy hits the same host: fail fast
+            raise
+        except (requests.RequestException, ValueError) as e:
+            logger.info("HackerRank %s strategy failed for user=%s: %s", name, username, e)
+            last_error = e
+            continue
+
+        if solved is not None:
+            return _stats(solved, name)
+
+    raise Exception(f"HackerRank stats unavailable: {last_error or 'no solved count found'}")
+
+
+async def aget_hackerrank_stats(username: str, cache=None, prefer=None):
+    """Async get_hackerrank_stats() for the ASGI views."""
+    last_error = None
+    for name in _strategy_order(prefer):
+        path, accept, parse = HACKERRANK_STRATEGIES[name]
+        url = http_client.platform_url("hackerrank", path.format(username=username))
+        try:
+            response = await async_http.conditional_get(
+                url, cache, headers={"Accept": accept}, timeout=20
+            )
+            solved = _read_solved(parse, response, cache, url)
+        except (CircuitOpen, RateLimited):
+            # the other strategy hits the same host: fail fast
+            raise
+        except (httpx.HTTPError, requests.RequestException, ValueError) as e:
+            logger.info("HackerRank %s strategy failed for user=%s: %s", name, username, e)
+            last_error = e
+            continue
+
+        if solved is not None:
+            return _stats(solved, name)
+
+    raise Exception(f"HackerRank stats unavailable: {last_error or 'no solved count found'}")
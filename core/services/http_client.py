@@ -0,0 +1,258 @@
+"""
+Shared HTTP client for every platform fetcher: one keep-alive session with
+per-host connection pools, bounded retries with backoff, default timeouts,
+per-host request/latency counters and the shared rate limiter / circuit
+breaker from core.services.throttle.
+"""
+
+import hashlib
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from core.services import throttle
+
+DEFAULT_TIMEOUT = 15
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; StudyStack/1.0)",
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+class NotModified(Exception):
+    """The resource is unchanged since the validators in the cache were stored."""
+
+
+_stats = defaultdict(lambda: {"requests": 0, "errors": 0, "seconds": 0.0, "bytes": 0})
+_stats_lock = threading.Lock()
+
+# metered() counters active in this thread / asyncio task
+_meters = ContextVar("http_meters", default=())
+
+
+# =========================================
+# Session
+# =========================================
+def _build_session():
+    retry = Retry(
+        total=settings.HTTP_MAX_RETRIES,
+        connect=settings.HTTP_MAX_RETRIES,
+        read=0,  # a slow upstream should not be hit again with the same request
+        status=settings.HTTP_MAX_RETRIES,
+        backoff_factor=settings.HTTP_BACKOFF_FACTOR,
+        # 429s go straight back to the caller: the shared token bucket and
+        # circuit breaker (core.services.throttle) deal with them
+        status_forcelist=(500, 502, 503, 504),
+        # POSTs (GraphQL, Groq) are only retried when the connection failed
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        # never sleep for whatever Retry-After the server asks; fail fast
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=settings.HTTP_POOL_HOSTS,
+        pool_maxsize=settings.HTTP_POOL_MAXSIZE,
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+# =========================================
+# Requests
+# =========================================
+def request(method, url, **kwargs):
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    host = urlsplit(url).hostname or ""
+
+    # fail fast on an open circuit, then wait for a shared request token
+    throttle.check_circuit(host)
+    throttle.acquire_token(host)
+
+    started = time.monotonic()
+    failed = False
+    size = 0
+    try:
+        response = get_session().request(method, url, **kwargs)
+        size = len(response.content)
+    except requests.RequestException:
+        failed = True
+        throttle.record_failure(host)
+        raise
+    finally:
+        record_request(host, time.monotonic() - started, size, failed)
+
+    if is_upstream_failure(response.status_code):
+        throttle.record_failure(host)
+    else:
+        throttle.record_success(host)
+    return response
+
+
+def is_upstream_failure(status_code):
+    return status_code == 429 or status_code >= 500
+
+
+def record_request(host, elapsed, size, failed=False):
+    """Add one request to the per-host counters and any active metered() blocks."""
+    with _stats_lock:
+        row = _stats[host]
+        row["requests"] += 1
+        row["seconds"] += elapsed
+        row["bytes"] += size
+        if failed:
+            row["errors"] += 1
+    for usage in _meters.get():
+        usage["requests"] += 1
+        usage["bytes"] += size
+
+
+def platform_url(platform, path=""):
+    """`path` on `platform`'s origin from settings.PLATFORM_URLS."""
+    return settings.PLATFORM_URLS[platform] + path
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def conditional_get(url, cache=None, **kwargs):
+    """
+    GET that skips unchanged pages.
+
+    `cache` maps url -> {"etag", "last_modified", "body_hash"} (for example
+    PlatformAccount.http_cache) and is updated in place; other keys callers
+    keep in an entry are preserved. Raises NotModified on a 304 or when the
+    body hashes to the stored value, so callers can skip parsing and DB
+    writes.
+    """
+    if cache is None:
+        return get(url, **kwargs)
+
+    entry = cache.get(url) or {}
+    headers = validator_headers(entry, kwargs.pop("headers", None))
+    response = get(url, headers=headers, **kwargs)
+    store_validators(cache, url, entry, response)
+    return response
+
+
+def validator_headers(entry, headers=None):
+    headers = dict(headers or {})
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def store_validators(cache, url, entry, response):
+    """Save the response's validators in `cache`; raise NotModified if unchanged."""
+    if response.status_code == 304:
+        raise NotModified(url)
+
+    if response.status_code == 200:
+        body_hash = hashlib.sha256(response.content).hexdigest()
+        cache[url] = {
+            **entry,
+            "etag": response.headers.get("ETag", ""),
+            "last_modified": response.headers.get("Last-Modified", ""),
+            "body_hash": body_hash,
+        }
+        if body_hash == entry.get("body_hash"):
+            raise NotModified(url)
+
+
+# =========================================
+# Instrumentation
+# =========================================
+@contextmanager
+def metered():
+    """
+    Count the requests and response bytes made inside the block, by this
+    thread or by asyncio tasks started inside it.
+
+        with metered() as usage:
+            fetch_github_activity(username)
+        usage  # {"requests": 2, "bytes": 31874}
+    """
+    usage = {"requests": 0, "bytes": 0}
+    token = _meters.set((*_meters.get(), usage))
+    try:
+        yield usage
+    finally:
+        _meters.reset(token)
+
+
+def _connections_by_host():
+    opened = defaultdict(int)
+    if _session is None:
+        return opened
+
+    # http:// and https:// share one adapter
+    adapters = {id(adapter): adapter for adapter in _session.adapters.values()}
+    for adapter in adapters.values():
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                opened[pool.host] += pool.num_connections
+    return opened
+
+
+def host_stats():
+    """
+    {host: {"requests", "errors", "seconds", "bytes", "avg_ms", "connections"}}
+
+    `connections` is the number of TCP connections actually opened; with
+    keep-alive it stays far below `requests` on bulk syncs.
+    """
+    opened = _connections_by_host()
+    with _stats_lock:
+        snapshot = {host: dict(row) for host, row in _stats.items()}
+
+    for host, row in snapshot.items():
+        row["avg_ms"] = round(1000 * row["seconds"] / row["requests"], 1) if row["requests"] else 0.0
+        row["connections"] = opened.get(host, 0)
+    return snapshot
+
+
+def format_host_stats():
+    lines = []
+    for host, row in sorted(host_stats().items()):
+        lines.append(
+            f"{host}: {row['requests']} requests, {row['connections']} connections, "
+            f"{row['errors']} errors, avg {row['avg_ms']} ms, {row['bytes'] / 1024:.0f} KB"
+        )
+    return "\n".join(lines)
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
@@ -0,0 +1,224 @@
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.models import BackgroundJob, LearningGoal, Task, TaskMessage
+
+logger = logging.getLogger(__name__)
+
+
+# =========================================
+# Enqueue / status
+# =========================================
+def enqueue(user, kind, dedupe_key=None, run_after=None, **payload):
+    """
+    Queue a job for the `run_jobs` worker and return it immediately.
+
+    With a `dedupe_key`, a pending/running job with the same key is returned
+    instead of creating a second one. The partial unique constraint on
+    BackgroundJob makes this hold across every web process. A job with
+    `run_after` is not picked up before that time.
+    """
+    fields = dict(
+        user=user, kind=kind, payload=payload, dedupe_key=dedupe_key, run_after=run_after
+    )
+    try:
+        with transaction.atomic():
+            return BackgroundJob.objects.create(**fields)
+    except IntegrityError:
+        existing = BackgroundJob.objects.filter(
+            dedupe_key=dedupe_key, status__in=["pending", "running"]
+        ).first()
+        if existing is None:
+            # finished between our INSERT and this SELECT; try once more
+            return BackgroundJob.objects.create(**fields)
+        return existing
+
+
+def active_jobs(user, **filters):
+    return BackgroundJob.objects.filter(
+        user=user, status__in=["pending", "running"], **filters
+    )
+
+
+def job_status(job):
+    return {
+        "id": job.pk,
+        "kind": job.kind,
+        "status": job.status,
+        "finished": job.is_finished,
+        "result": job.result,
+        "error": job.error,
+        "created_at": job.created_at.isoformat(),
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+# =========================================
+# Handlers
+# =========================================
+def _sync_handler(slug):
+    def handler(job):
+        from core.services.freshness import is_fresh
+        from core.services.sync import sync_platform
+
+        from core.services.throttle import CircuitOpen
+
+        # a sync that finished while this job was queued already did the work
+        if not job.payload.get("force") and is_fresh(job.user, slug):
+            return {"skipped": "fresh"}
+        try:
+            return sync_platform(job.user, slug)
+        except CircuitOpen as e:
+            # keep serving the stored stats; the circuit will be probed later
+            return {"skipped": str(e)}
+    return handler
+
+
+def _sync_all(job):
+    from core.services.sync import sync_all_platforms
+    return sync_all_platforms(job.user, stale_only=True)
+
+
+def _goal_solution(job):
+    from core.services.groq import generate_goal_solution
+
+    goal = LearningGoal.objects.get(pk=job.payload["goal_id"], user=job.user)
+    if not goal.ai_solution:
+        goal.ai_solution = generate_goal_solution(goal.title)
+        goal.save(update_fields=["ai_solution"])
+    return {"goal_id": goal.pk}
+
+
+def _refresh_leaderboard(job):
+    from core.services.leaderboard import refresh_leaderboard
+    return {"entries": refresh_leaderboard()}
+
+
+def _task_reply(job):
+    from core.services.groq import generate_task_ai_reply
+
+    task = Task.objects.get(pk=job.payload["task_id"], user=job.user)
+    ai_reply = generate_task_ai_reply(task, job.payload["message"])
+    store_task_reply(task, ai_reply)
+    return {"task_id": task.pk}
+
+
+def store_task_reply(task, ai_reply):
+    TaskMessage.objects.create(task=task, sender="ai", content=ai_reply)
+    task.ai_solution = ai_reply
+    task.needs_help = False
+    task.save(update_fields=["ai_solution", "needs_help"])
+
+
+JOB_HANDLERS = {
+    "sync_github": _sync_handler("github"),
+    "sync_leetcode": _sync_handler("leetcode"),
+    "sync_gfg": _sync_handler("gfg"),
+    "sync_codechef": _sync_handler("codechef"),
+    "sync_hackerrank": _sync_handler("hackerrank"),
+    "sync_all": _sync_all,
+    "goal_solution": _goal_solution,
+    "task_reply": _task_reply,
+    "refresh_leaderboard": _refresh_leaderboard,
+}
+
+
+# =========================================
+# Worker side
+# =========================================
+def claim_next_job():
+    """
+    Atomically move the oldest due pending job to "running".
+
+    SKIP LOCKED keeps several workers off the same row on PostgreSQL;
+    the conditional UPDATE makes the claim safe on SQLite too.
+    """
+    with transaction.atomic():
+        now = timezone.now()
+        job = (
+            BackgroundJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(status="pending")
+            .filter(Q(run_after__isnull=True) | Q(run_after__lte=now))
+            .order_by("created_at")
+            .first()
+        )
+        if not job:
+            return None
+
+        claimed = BackgroundJob.objects.filter(pk=job.pk, status="pending").update(
+            status="running", started_at=now, heartbeat_at=now, attempts=job.attempts + 1
+        )
+        if not claimed:
+            return None
+
+    job.refresh_from_db()
+    return job
+
+
+@contextmanager
+def _heartbeat(job):
+    """Stamp the running job every JOB_HEARTBEAT_INTERVAL seconds from a side thread."""
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(settings.JOB_HEARTBEAT_INTERVAL):
+                try:
+                    BackgroundJob.objects.filter(pk=job.pk, status="running").update(
+                        heartbeat_at=timezone.now()
+                    )
+                except DatabaseError as e:
+                    logger.warning("Heartbeat for job %s failed: %s", job.pk, e)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=beat, name=f"job-{job.pk}-heartbeat", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_job(job):
+    handler = JOB_HANDLERS.get(job.kind)
+
+    try:
+        if handler is None:
+            raise ValueError(f"No handler for job kind {job.kind!r}")
+        with _heartbeat(job):
+            result = handler(job)
+        job.status = "done"
+        job.result = result if isinstance(result, (dict, list)) else None
+        job.error = ""
+    except Exception as e:
+        logger.exception("Job %s failed", job)
+        job.status = "failed"
+        job.error = str(e)
+
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "result", "error", "finished_at"])
+    return job
+
+
+def requeue_stale_jobs(older_than=None):
+    """
+    Put back running jobs whose worker died mid-run: no heartbeat for
+    `older_than` (default settings.JOB_STALE_AFTER seconds). Until then
+    enqueue() keeps returning such a job for its dedupe_key.
+    """
+    older_than = older_than or timedelta(seconds=settings.JOB_STALE_AFTER)
+    cutoff = timezone.now() - older_than
+    return BackgroundJob.objects.filter(
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff),
+        status="running",
+    ).update(status="pending", started_at=None, heartbeat_at=None)
@@ -0,0 +1,68 @@
+"""
+Materialized leaderboard.
+
+Ranks are computed for every user in one RANK() OVER (ORDER BY total_xp
+DESC) query and LeaderboardEntry is replaced in bulk, so leaderboard pages
+only ever read precomputed rows. Stats writes ask for a refresh through a
+debounced background job instead of re-ranking on the spot.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import Rank
+from django.utils import timezone
+
+from core.models import LeaderboardEntry, UserStats
+from core.services.jobs import enqueue
+
+INSERT_BATCH = 2000
+
+
+def ranked_users():
+    """(user_id, total_xp, rank) for every user with XP, best first."""
+    return (
+        UserStats.objects
+        .filter(total_xp__gt=0)
+        .annotate(rank=Window(Rank(), order_by=F("total_xp").desc()))
+        .order_by("-total_xp", "user_id")
+        .values_list("user_id", "total_xp", "rank")
+    )
+
+
+def refresh_leaderboard():
+    """Replace all LeaderboardEntry rows with fresh ranks; returns the count."""
+    rows = ranked_users().iterator(chunk_size=INSERT_BATCH)
+    count = 0
+
+    with transaction.atomic():
+        LeaderboardEntry.objects.all().delete()
+        while batch := list(islice(rows, INSERT_BATCH)):
+            LeaderboardEntry.objects.bulk_create([
+                LeaderboardEntry(user_id=user_id, xp=xp, rank=rank)
+                for user_id, xp, rank in batch
+            ])
+            count += len(batch)
+
+    return count
+
+
+def request_leaderboard_refresh(user):
+    """
+    Schedule a refresh at the end of the current LEADERBOARD_REFRESH_DELAY
+    window. Every request in the same window shares one job (its dedupe
+    key), so a burst of syncs costs a single re-rank.
+    """
+    delay = settings.LEADERBOARD_REFRESH_DELAY
+    window = int(timezone.now().timestamp() // delay)
+    run_after = datetime.fromtimestamp((window + 1) * delay, tz=dt_timezone.utc)
+
+    return enqueue(
+        user,
+        "refresh_leaderboard",
+        dedupe_key=f"leaderboard:{window}",
+        run_after=run_after,
+    )
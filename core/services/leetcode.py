@@ -1,9 +1,32 @@
-import requests
-from django.utils import timezone
+from django.conf import settings
 
-from core.models import PlatformAccount, UserStats
+from core.services import async_http, http_client
+from core.services.stats import stats_row
+from core.services.xp import platform_xp
 
-LEETCODE_GRAPHQL = "https://leetcode.com/graphql"
+LEETCODE_GRAPHQL = "/graphql"
+
+PROFILE_QUERY = """
+query getUserProfile($username: String!) {
+  matchedUser(username: $username) {
+    submitStatsGlobal {
+      acSubmissionNum {
+        difficulty
+        count
+      }
+    }
+  }
+  userContestRanking(username: $username) {
+    rating
+    attendedContestsCount
+  }
+}
+"""
+
+HEADERS = {
+    "Content-Type": "application/json",
+    "Referer": "https://leetcode.com"
+}
 
 
 # =========================================
@@ -11,40 +34,109 @@ LEETCODE_GRAPHQL = "https://leetcode.com/graphql"
 # =========================================
 def get_leetcode_stats(username: str):
 
-    query = """
-    query getUserProfile($username: String!) {
-      matchedUser(username: $username) {
-        submitStatsGlobal {
-          acSubmissionNum {
-            difficulty
-            count
-          }
-        }
-      }
-      userContestRanking(username: $username) {
-        rating
-        attendedContestsCount
-      }
-    }
-    """
+    r = http_client.post(
+        http_client.platform_url("leetcode", LEETCODE_GRAPHQL),
+        json={"query": PROFILE_QUERY, "variables": {"username": username}},
+        headers=HEADERS,
+        timeout=15
+    )
+
+    r.raise_for_status()
+    return _stats_from_response(r.json())
+
 
-    r = requests.post(
-        LEETCODE_GRAPHQL,
-        json={"query": query, "variables": {"username": username}},
-        headers={
-            "Content-Type": "application/json",
-            "Referer": "https://leetcode.com"
-        },
+async def aget_leetcode_stats(username: str):
+    """Async get_leetcode_stats() for the ASGI views."""
+    r = await async_http.post(
+        http_client.platform_url("leetcode", LEETCODE_GRAPHQL),
+        json={"query": PROFILE_QUERY, "variables": {"username": username}},
+        headers=HEADERS,
         timeout=15
     )
 
     r.raise_for_status()
-    data = r.json()
+    return _stats_from_response(r.json())
 
-    user = data.get("data", {}).get("matchedUser")
+
+def _stats_from_response(payload):
+    data = payload.get("data") or {}
+
+    user = data.get("matchedUser")
     if not user:
         raise Exception("LeetCode user not found")
 
+    return _parse_stats(user, data.get("userContestRanking"))
+
+
+# =========================================
+# GraphQL Fetch — many users per request
+# =========================================
+BULK_USER_FIELDS = """
+    submitStatsGlobal {
+      acSubmissionNum {
+        difficulty
+        count
+      }
+    }
+"""
+
+BULK_CONTEST_FIELDS = """
+    rating
+    attendedContestsCount
+"""
+
+
+def _bulk_query(count):
+    variables = ", ".join(f"$u{i}: String!" for i in range(count))
+    fields = "\n".join(
+        f"m{i}: matchedUser(username: $u{i}) {{{BULK_USER_FIELDS}}}\n"
+        f"c{i}: userContestRanking(username: $u{i}) {{{BULK_CONTEST_FIELDS}}}"
+        for i in range(count)
+    )
+    return f"query({variables}) {{\n{fields}\n}}"
+
+
+def get_leetcode_stats_bulk(usernames, batch_size=None):
+    """
+    get_leetcode_stats() for many users, `batch_size` per aliased query.
+
+    Unknown users come back as a null alias plus an error entry, which only
+    affects that user. Returns {username: stats or None}.
+    """
+    batch_size = batch_size or settings.LEETCODE_GRAPHQL_BATCH
+    results = {}
+
+    for start in range(0, len(usernames), batch_size):
+        batch = usernames[start:start + batch_size]
+
+        r = http_client.post(
+            http_client.platform_url("leetcode", LEETCODE_GRAPHQL),
+            json={
+                "query": _bulk_query(len(batch)),
+                "variables": {f"u{i}": username for i, username in enumerate(batch)},
+            },
+            headers=HEADERS,
+            timeout=30
+        )
+        r.raise_for_status()
+        payload = r.json()
+        data = payload.get("data")
+        if data is None:
+            raise Exception(f"LeetCode GraphQL error: {payload.get('errors')}")
+
+        for i, username in enumerate(batch):
+            user = data.get(f"m{i}")
+            results[username] = (
+                _parse_stats(user, data.get(f"c{i}")) if user else None
+            )
+
+    return results
+
+
+# =========================================
+# Response parsing (single + bulk)
+# =========================================
+def _parse_stats(user, contest):
     # -------------------------
     # Difficulty buckets
     # -------------------------
@@ -71,7 +163,7 @@ def get_leetcode_stats(username: str):
     # -------------------------
     # Contest data
     # -------------------------
-    contest = data.get("data", {}).get("userContestRanking") or {}
+    contest = contest or {}
 
     rating = contest.get("rating")
     contests = contest.get("attendedContestsCount")
@@ -91,69 +183,20 @@ def get_leetcode_stats(username: str):
 
 
 # =========================================
-# Sync Function
+# XP (core.services.xp)
 # =========================================
-def sync_leetcode_by_username(user):
-
-    account = PlatformAccount.objects.filter(
-        user=user,
-        platform__slug="leetcode"
-    ).first()
-
-    if not account:
-        return None
-
-    data = get_leetcode_stats(account.username)
-
-    easy = data["easy"]
-    medium = data["medium"]
-    hard = data["hard"]
-    solved = data["solved"]
-    rating = data["rating"]
-    contests = data["contests"]
-
-    # ---------------------------------
-    # XP FORMULA (difficulty + rating)
-    # ---------------------------------
-    rating_delta = max(0, rating - 1300)
-
-    xp = (
-        (easy * 5) +
-        (medium * 10) +
-        (hard * 20) +
-        int((rating_delta ** 2) / 10) +
-        (contests * 50)
+def leetcode_xp(data):
+    return platform_xp("leetcode", data)
+
+
+def leetcode_row(data):
+    """PlatformStats values for a get_leetcode_stats() result."""
+    return stats_row(
+        data["solved"],
+        leetcode_xp(data),
+        easy=data["easy"],
+        medium=data["medium"],
+        hard=data["hard"],
+        rating=data["rating"],
+        contests=data["contests"],
     )
-
-    stats, _ = UserStats.objects.get_or_create(user=user)
-
-    # usernames
-    stats.leetcode_username = account.username
-
-    # counts
-    stats.leetcode_easy = easy
-    stats.leetcode_medium = medium
-    stats.leetcode_hard = hard
-    stats.leetcode_solved = solved
-
-    # xp
-    stats.leetcode_xp = xp
-
-    stats.last_updated = timezone.now()
-    stats.save()
-
-    account.last_synced = timezone.now()
-    account.save(update_fields=["last_synced"])
-
-    # global recompute
-    stats.recalculate_totals()
-
-    return {
-        "easy": easy,
-        "medium": medium,
-        "hard": hard,
-        "solved": solved,
-        "rating": rating,
-        "contests": contests,
-        "xp": xp
-    }
@@ -0,0 +1,136 @@
+"""
+In-memory global rank index.
+
+Every process keeps the users with XP as a sorted list of (-total_xp,
+user_id) keys, so a user's rank is one bisect (the number of users with
+more XP, plus one: ties share a rank, as in LeaderboardEntry) and their
+neighbours are a slice around it. The profile page reads it instead of
+counting UserStats rows on every view.
+
+The index is built from UserStats on first use in each process. Stats
+writes made in this process are applied right after they commit; writes
+made by other processes (job workers, other web workers, recompute_xp)
+are picked up every RANK_INDEX_SYNC_INTERVAL seconds from UserStats rows
+whose last_updated moved, and the whole index is rebuilt every
+RANK_INDEX_REBUILD_INTERVAL seconds, which also drops deleted users.
+LeaderboardEntry stays the persisted ranking (core.services.leaderboard).
+"""
+
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.models import UserStats
+
+# rows committed a little after they were stamped must not fall between
+# two catch-up queries
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+class RankIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys = []
+        self._xp = {}
+        self._built_at = None
+        self._synced_at = None
+        self._since = None
+
+    # =========================================
+    # Reads
+    # =========================================
+    def rank(self, user_id):
+        """The user's global rank, or None without XP."""
+        self._fresh()
+        with self._lock:
+            xp = self._xp.get(user_id)
+            if xp is None:
+                return None
+            return bisect_left(self._keys, (-xp,)) + 1
+
+    def neighbours(self, user_id, count=2):
+        """
+        [(rank, user_id, xp)] for up to `count` users either side of the
+        user, the user included; empty without XP.
+        """
+        self._fresh()
+        with self._lock:
+            xp = self._xp.get(user_id)
+            if xp is None:
+                return []
+            position = bisect_left(self._keys, (-xp, user_id))
+            window = self._keys[max(0, position - count):position + count + 1]
+            return [
+                (bisect_left(self._keys, (neg_xp,)) + 1, other, -neg_xp)
+                for neg_xp, other in window
+            ]
+
+    def size(self):
+        """Number of ranked users."""
+        self._fresh()
+        with self._lock:
+            return len(self._keys)
+
+    # =========================================
+    # Writes
+    # =========================================
+    def set(self, user_id, xp):
+        """Move the user to `xp`; users without XP leave the index."""
+        with self._lock:
+            self._set(user_id, xp)
+
+    def refresh(self, user_ids):
+        """Re-read the totals of `user_ids` (after a commit in this process)."""
+        if self._built_at is None:
+            return
+        xp = dict(UserStats.objects.filter(user_id__in=user_ids).values_list("user_id", "total_xp"))
+        with self._lock:
+            for user_id in user_ids:
+                self._set(user_id, xp.get(user_id, 0))
+
+    def rebuild(self):
+        """Load every user with XP from UserStats."""
+        started = timezone.now()
+        rows = UserStats.objects.filter(total_xp__gt=0).values_list("user_id", "total_xp")
+        xp = dict(rows.iterator(chunk_size=5000))
+        keys = sorted((-total, user_id) for user_id, total in xp.items())
+
+        with self._lock:
+            self._keys, self._xp = keys, xp
+            self._built_at = self._synced_at = time.monotonic()
+            self._since = started - SYNC_OVERLAP
+
+    def catch_up(self):
+        """Apply UserStats changes made since the last build or catch-up."""
+        started = timezone.now()
+        changed = (
+            UserStats.objects.filter(last_updated__gte=self._since)
+            .values_list("user_id", "total_xp")
+        )
+        with self._lock:
+            for user_id, xp in changed:
+                self._set(user_id, xp)
+            self._synced_at = time.monotonic()
+            self._since = started - SYNC_OVERLAP
+
+    def _fresh(self):
+        now = time.monotonic()
+        if self._built_at is None or now - self._built_at > settings.RANK_INDEX_REBUILD_INTERVAL:
+            self.rebuild()
+        elif now - self._synced_at > settings.RANK_INDEX_SYNC_INTERVAL:
+            self.catch_up()
+
+    def _set(self, user_id, xp):
+        old = self._xp.pop(user_id, None)
+        if old is not None:
+            del self._keys[bisect_left(self._keys, (-old, user_id))]
+        if xp > 0:
+            self._xp[user_id] = xp
+            insort(self._keys, (-xp, user_id))
+
+
+rank_index = RankIndex()
@@ -0,0 +1,77 @@
+"""
+Weekly and monthly XP gained per user and platform.
+
+Every snapshot's xp_delta (core.services.snapshots) is added to the user's
+XPRollup row for the ISO week and the calendar month it was taken in, so
+"who gained the most LeetCode XP this week" is a range scan of one index
+instead of a sum over DailyActivity or PlatformSnapshot at request time.
+"""
+
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Window
+from django.db.models.functions import Rank
+from django.utils import timezone
+
+from core.models import XPRollup
+
+PERIODS = [period for period, _ in XPRollup.PERIODS]
+
+
+def period_start(period, day):
+    """Monday of `day`'s ISO week, or the 1st of its month."""
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def credit_rollups(user_id, platform_id, day, xp):
+    """Add `xp` to the user's week and month rollups containing `day`."""
+    if not xp:
+        return
+
+    for period in PERIODS:
+        key = {
+            "user_id": user_id,
+            "platform_id": platform_id,
+            "period": period,
+            "start": period_start(period, day),
+        }
+        rows = XPRollup.objects.filter(**key)
+        if rows.update(xp=F("xp") + xp):
+            continue
+        try:
+            with transaction.atomic():
+                XPRollup.objects.create(xp=xp, **key)
+        except IntegrityError:
+            # another sync created the row first
+            rows.update(xp=F("xp") + xp)
+
+
+def period_leaderboard(platform, period, start=None):
+    """
+    XPRollup rows of `platform` for the `period` starting at `start`
+    (default: the current one) with XP gained, best first, each annotated
+    with its rank; ties share a rank.
+    """
+    start = start or period_start(period, timezone.localdate())
+    return (
+        XPRollup.objects
+        .filter(platform=platform, period=period, start=start, xp__gt=0)
+        .select_related("user")
+        .annotate(rank=Window(Rank(), order_by=F("xp").desc()))
+        .order_by("-xp", "user_id")
+    )
+
+
+def period_rank(rollup):
+    """The rank of one XPRollup row within its board, or None without XP."""
+    if rollup is None or rollup.xp <= 0:
+        return None
+    return XPRollup.objects.filter(
+        platform_id=rollup.platform_id,
+        period=rollup.period,
+        start=rollup.start,
+        xp__gt=rollup.xp,
+    ).count() + 1
@@ -0,0 +1,163 @@
+"""
+Append-only history of the raw counters behind each PlatformAccount.
+
+A snapshot is written only when a counter or the XP differs from the
+account's previous one. Its `xp_delta` is what DailyActivity, the weekly
+and monthly XPRollup rows and the "XP gained since ..." queries are built
+from, so none of them needs a re-scrape or a full recompute.
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from core.models import PlatformAccount, PlatformSnapshot
+from core.services.activity import credit_daily_activity
+from core.services.rollups import credit_rollups
+from core.services.stats import update_platform_stats
+from core.services.xp import platform_xp
+
+# raw counters a platform stats dict may carry (the keys the fetchers use)
+COUNTERS = (
+    "solved", "easy", "medium", "hard",
+    "rating", "contests", "score",
+    "repos", "contributions",
+)
+
+
+def snapshot_counters(data):
+    """The COUNTERS found in a platform stats dict; missing ones are 0."""
+    return {name: int(data.get(name) or 0) for name in COUNTERS}
+
+
+def latest_snapshot(account):
+    return (
+        PlatformSnapshot.objects
+        .filter(account=account)
+        .order_by("-taken_at", "-pk")
+        .first()
+    )
+
+
+def _rescored(account, snapshot):
+    counters = {name: getattr(snapshot, name) for name in COUNTERS}
+    return platform_xp(account.platform.slug, counters)
+
+
+def _unchanged(snapshot, counters, xp):
+    return snapshot.xp == xp and all(
+        getattr(snapshot, name) == value for name, value in counters.items()
+    )
+
+
+# =========================================
+# Write side
+# =========================================
+def record_snapshot(account, data, xp, credit_activity=True):
+    """
+    Append a snapshot of `data`'s counters and `xp` unless nothing changed.
+
+    Returns the new snapshot, or None when the account's latest snapshot
+    already holds these values (callers then skip their stats write).
+    The first snapshot of an account, and the first one after it was
+    (re)connected (last_synced is None), is a baseline: its xp_delta is 0,
+    so a new account's lifetime XP never shows up as activity. Call this
+    before updating account.last_synced.
+
+    The delta is taken against the previous counters rescored with the
+    active XP formula (core.services.xp), so switching formula versions
+    never shows up as activity. Every delta is added to the week and month
+    XPRollup rows; positive ones are also credited to DailyActivity unless
+    `credit_activity` is False (GitHub, whose contribution calendar is
+    stored as is instead).
+
+    The account row is locked first, so concurrent syncs of one account
+    compare against each other's snapshots instead of both appending one.
+    Call it inside the transaction that writes the stats (record_sync), so
+    the lock is held until they are stored too.
+    """
+    counters = snapshot_counters(data)
+
+    with transaction.atomic():
+        locked = (
+            PlatformAccount.objects.select_for_update()
+            .filter(pk=account.pk).values_list("pk", "last_synced").first()
+        )
+        if locked is None:
+            # disconnected while fetching
+            return None
+        _, last_synced = locked
+
+        previous = latest_snapshot(account)
+        if previous is not None and _unchanged(previous, counters, xp):
+            return None
+
+        baseline = previous is None or last_synced is None
+        snapshot = PlatformSnapshot.objects.create(
+            account=account,
+            xp=xp,
+            xp_delta=0 if baseline else xp - _rescored(account, previous),
+            **counters,
+        )
+
+        day = timezone.localdate(snapshot.taken_at)
+        credit_rollups(account.user_id, account.platform_id, day, snapshot.xp_delta)
+
+        if credit_activity and snapshot.xp_delta > 0:
+            credit_daily_activity(
+                account,
+                day,
+                snapshot.xp_delta,
+                count=max(0, snapshot.solved - previous.solved),
+            )
+
+    return snapshot
+
+
+def record_sync(account, data, row, credit_activity=True):
+    """
+    Snapshot `data` and store `row` as the account's PlatformStats in one
+    transaction: if the stats write fails the snapshot is rolled back too,
+    so the next sync does not take the payload for unchanged. Returns
+    whether anything changed.
+    """
+    with transaction.atomic():
+        if record_snapshot(account, data, row["xp"], credit_activity) is None:
+            return False
+        update_platform_stats(account.user, {account.platform_id: row})
+    return True
+
+
+# =========================================
+# Read side
+# =========================================
+def xp_gained(user, since, until=None):
+    """
+    {platform slug: net XP gained in [since, until)} for `user`.
+
+    Sums snapshot deltas over an index range scan on (account, taken_at);
+    platforms with no change in the window are left out.
+    """
+    snapshots = PlatformSnapshot.objects.filter(account__user=user, taken_at__gte=since)
+    if until is not None:
+        snapshots = snapshots.filter(taken_at__lt=until)
+
+    return {
+        row["account__platform__slug"]: row["xp"]
+        for row in (
+            snapshots
+            .order_by()
+            .values("account__platform__slug")
+            .annotate(xp=Sum("xp_delta"))
+        )
+        if row["xp"]
+    }
+
+
+def week_start(now=None):
+    """Midnight on Monday of the current week, in the active timezone."""
+    today = timezone.localdate(now)
+    monday = today - timedelta(days=today.weekday())
+    return timezone.make_aware(datetime.combine(monday, time.min))
@@ -0,0 +1,159 @@
+"""
+Per-platform stats and the UserStats totals built from them.
+
+Each sync writes only its own (user, platform) PlatformStats row, so syncs
+of different platforms never wait on each other. UserStats.total_xp and
+total_problems are moved by the change a write made, in one UPDATE
+(total_xp = total_xp + delta ... RETURNING total_xp), instead of being
+summed again; level is a generated column on total_xp.
+"""
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.models import PlatformStats, UserStats
+from core.services.distribution import TOTAL, move_users
+from core.services.leaderboard import request_leaderboard_refresh
+from core.services.rank_index import rank_index
+
+
+def stats_row(solved, xp, **extra):
+    """The PlatformStats values a fetcher returns: solved, xp and extras."""
+    return {"solved": solved, "xp": xp, "extra": extra}
+
+
+def update_platform_stats(user, rows):
+    """
+    Store `rows` ({platform id: stats_row(...)}) as the user's current stats.
+
+    Each platform's row is locked on its own; the totals then get the
+    summed change of all of them in a single UPDATE.
+    """
+    xp = solved = 0
+    moves = []
+
+    with transaction.atomic():
+        # a fixed lock order, so two multi-platform syncs can't deadlock
+        for platform_id, row in sorted(rows.items()):
+            stats, _ = (
+                PlatformStats.objects
+                .select_for_update()
+                .get_or_create(user=user, platform_id=platform_id)
+            )
+            xp += row["xp"] - stats.xp
+            solved += row["solved"] - stats.solved
+            moves.append((platform_id, stats.xp, row["xp"]))
+
+            stats.solved = row["solved"]
+            stats.xp = row["xp"]
+            stats.extra = row["extra"]
+            stats.formula_version = settings.XP_FORMULA_VERSION
+            stats.complete = True
+            stats.save()
+
+        _add_to_totals(user, xp, solved, moves)
+
+
+def clear_platform_stats(user, slug):
+    """Delete the user's stats for platform `slug` and take them off the totals."""
+    with transaction.atomic():
+        stats = (
+            PlatformStats.objects
+            .select_for_update(of=("self",))
+            .filter(user=user, platform__slug=slug)
+            .first()
+        )
+        if stats is None:
+            return
+
+        # the row's bucket is freed by core.signals, as for CASCADE deletes
+        stats.delete()
+        _add_to_totals(user, -stats.xp, -stats.solved, [])
+
+
+def _add_to_totals(user, xp, solved, moves):
+    """
+    Move the user's totals by `xp` and `solved`. `moves` are the
+    [(platform id, old xp, new xp)] behind it, for the XP distribution.
+    """
+    if xp:
+        total = _apply_totals(user, xp, solved)
+        moves = [*moves, (TOTAL, total - xp, total)]
+        transaction.on_commit(lambda: request_leaderboard_refresh(user))
+        transaction.on_commit(lambda: rank_index.refresh([user.pk]))
+    elif solved:
+        _apply_totals(user, xp, solved)
+
+    if moves:
+        transaction.on_commit(lambda: move_users(moves))
+
+
+def _apply_totals(user, xp, solved):
+    """The totals UPDATE; returns the new total_xp."""
+    total = _update_totals(user, xp, solved)
+    if total is not None:
+        return total
+
+    # no UserStats yet: start it from the stored rows (this one included)
+    totals = PlatformStats.objects.filter(user=user).aggregate(
+        xp=Sum("xp"), solved=Sum("solved")
+    )
+    try:
+        with transaction.atomic():
+            UserStats.objects.create(
+                user=user,
+                total_xp=totals["xp"] or 0,
+                total_problems=totals["solved"] or 0,
+            )
+        return totals["xp"] or 0
+    except IntegrityError:
+        # another sync created the row first; it did not see this change
+        return _update_totals(user, xp, solved)
+
+
+def _update_totals(user, xp, solved):
+    """
+    total_xp += xp and total_problems += solved, returning the new total_xp
+    from the same statement (None without a UserStats row). The ORM's
+    update() can't return columns, hence the SQL; RETURNING is supported
+    by both Postgres and SQLite 3.35+.
+    """
+    now = UserStats._meta.get_field("last_updated").get_db_prep_value(timezone.now(), connection)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {connection.ops.quote_name(UserStats._meta.db_table)}"
+            " SET total_xp = total_xp + %s, total_problems = total_problems + %s, last_updated = %s"
+            " WHERE user_id = %s RETURNING total_xp",
+            [xp, solved, now, user.pk],
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def rebuild_totals(users):
+    """
+    Set the UserStats totals of `users` (a User queryset or ids) to the sums
+    of their PlatformStats rows, in one UPDATE. For bulk rescoring
+    (manage.py recompute_xp); syncs move the totals incrementally instead.
+    """
+    def summed(field):
+        return Coalesce(
+            Subquery(
+                PlatformStats.objects
+                .filter(user_id=OuterRef("user_id"))
+                .order_by()
+                .values("user_id")
+                .annotate(total=Sum(field))
+                .values("total")
+            ),
+            Value(0),
+        )
+
+    return UserStats.objects.filter(user__in=users).update(
+        total_xp=summed("xp"),
+        total_problems=summed("solved"),
+        last_updated=timezone.now(),
+    )
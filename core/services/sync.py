@@ -0,0 +1,464 @@
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import PlatformAccount
+from core.services.codechef import aget_codechef_stats, codechef_row, get_codechef_stats
+from core.services.gfg import get_gfg_stats, gfg_row, preferred_strategy
+from core.services.freshness import claim_accounts, is_account_fresh, release_accounts
+from core.services.github import (
+    afetch_github_activity,
+    fetch_github_activity,
+    get_github_stats_bulk,
+    github_row,
+    store_contribution_calendar,
+)
+from core.services.hackerrank import (
+    aget_hackerrank_stats,
+    get_hackerrank_stats,
+    hackerrank_row,
+)
+from core.services.http_client import NotModified, metered
+from core.services.leetcode import (
+    aget_leetcode_stats,
+    get_leetcode_stats,
+    get_leetcode_stats_bulk,
+    leetcode_row,
+)
+from core.services.snapshots import record_snapshot, record_sync
+from core.services.stats import update_platform_stats
+from core.services.throttle import CircuitOpen
+
+logger = logging.getLogger(__name__)
+
+
+# =========================================
+# Per-platform fetchers
+# Each one only talks to the network and returns
+# the account's PlatformStats values, so they are safe
+# to run in worker threads. Account bookkeeping
+# (e.g. fetch_strategy) is set on the in-memory
+# account and saved by the caller; the raw stats
+# dict is kept as account.fetched for the
+# snapshot (core.services.snapshots).
+# =========================================
+def _fetch_github(account):
+    data = fetch_github_activity(account.username, cache=account.http_cache)
+    account.fetched = data
+    return github_row(data)
+
+
+def _fetch_leetcode(account):
+    data = get_leetcode_stats(account.username)
+    account.fetched = data
+    return leetcode_row(data)
+
+
+def _fetch_gfg(account):
+    data = get_gfg_stats(account.username, prefer=account.fetch_strategy)
+    account.fetch_strategy = preferred_strategy(data, account.fetch_strategy)
+    account.fetched = data
+    return gfg_row(data)
+
+
+def _fetch_codechef(account):
+    data = get_codechef_stats(account.username, cache=account.http_cache)
+    account.fetched = data
+    return codechef_row(data)
+
+
+def _fetch_hackerrank(account):
+    data = get_hackerrank_stats(
+        account.username, cache=account.http_cache, prefer=account.fetch_strategy
+    )
+    account.fetch_strategy = data["source"]
+    account.fetched = data
+    return hackerrank_row(data)
+
+
+PLATFORM_FETCHERS = {
+    "github": _fetch_github,
+    "leetcode": _fetch_leetcode,
+    "gfg": _fetch_gfg,
+    "codechef": _fetch_codechef,
+    "hackerrank": _fetch_hackerrank,
+}
+
+
+def run_fetcher(account, usage=None):
+    """
+    PLATFORM_FETCHERS[slug](account), logging the requests and bytes it cost.
+
+    Pass a dict as `usage` to also get those counts back.
+    """
+    slug = account.platform.slug
+    with metered() as counted:
+        try:
+            return PLATFORM_FETCHERS[slug](account)
+        finally:
+            logger.info(
+                "%s fetch for %s: %d requests, %d bytes",
+                slug, account.username, counted["requests"], counted["bytes"],
+            )
+            if usage is not None:
+                usage.update(counted)
+
+
+# =========================================
+# Single platform sync
+# =========================================
+def sync_platform(user, slug):
+    """
+    Fetch and store `user`'s stats for platform `slug`, through the same
+    fetch_account() / save_account() pair as the bulk resync.
+
+    Returns the stored stats_row, or it with "unchanged" when nothing
+    changed; None without an account, {"skipped": ...} while another sync
+    is fetching the account.
+    """
+    if slug not in PLATFORM_FETCHERS:
+        raise ValueError(f"Unknown platform: {slug}")
+
+    account = PlatformAccount.objects.filter(
+        user=user, platform__slug=slug
+    ).select_related("platform").first()
+    if not account:
+        return None
+    if not claim_accounts([account]):
+        return {"skipped": "already syncing"}
+
+    try:
+        row = fetch_account(account)
+        changed = save_account(account, row)
+    finally:
+        release_accounts([account])
+    return row if changed else {**(row or {}), "unchanged": True}
+
+
+# =========================================
+# Sync all platforms
+# =========================================
+def sync_all_platforms(user, stale_only=False):
+    """
+    Refresh every connected platform for `user` in parallel.
+
+    Fetches run on a bounded thread pool, each with its own timeout
+    (settings.SYNC_TIMEOUTS). Successful results are stored in one
+    transaction with a single UserStats totals UPDATE, so a full refresh
+    costs as much as the slowest platform instead of the sum of all of them.
+
+    Platforms whose profile page is unchanged since the last sync, or
+    whose counters match their last snapshot, end up in "unchanged" and
+    cost no stats write. With `stale_only`, platforms
+    still inside their freshness window (settings.SYNC_TTL) are skipped.
+
+    Accounts another sync is fetching right now (claim_accounts) are
+    left to it and listed in "busy". A fetch that outlives its timeout
+    can't be stopped: its result is dropped and its account stays claimed
+    until it returns, so no other sync overlaps it.
+
+    Returns {"synced": {slug: stats_row}, "unchanged": [slug],
+    "failed": {slug: error}, "busy": [slug]}.
+    """
+    accounts, busy = _claim(_load_accounts(user, stale_only))
+    return {**_sync_accounts(user, accounts), "busy": busy}
+
+
+def _claim(accounts):
+    """Split {slug: account} into (claimed {slug: account}, busy [slug])."""
+    claimed = claim_accounts(accounts.values())
+    return (
+        {slug: account for slug, account in accounts.items() if account in claimed},
+        [slug for slug, account in accounts.items() if account not in claimed],
+    )
+
+
+def _sync_accounts(user, accounts):
+    """
+    Fetch and store the claimed `accounts` ({slug: account}); each claim is
+    released once its fetch is over.
+    """
+    synced = {}
+    unchanged = []
+    failed = {}
+    # timed-out fetches still running: {slug: future}
+    running = {}
+
+    try:
+        if accounts:
+            _fetch_all(user, accounts, synced, unchanged, failed, running)
+            _store_results(user, accounts, synced, unchanged)
+    finally:
+        release_accounts([account for slug, account in accounts.items() if slug not in running])
+        for slug, future in running.items():
+            # runs in the fetch's worker thread once it returns (or right
+            # here if it already has)
+            future.add_done_callback(
+                lambda _, account=accounts[slug]: release_accounts([account])
+            )
+
+    return {"synced": synced, "unchanged": unchanged, "failed": failed}
+
+
+def _fetch_all(user, accounts, synced, unchanged, failed, running):
+    executor = ThreadPoolExecutor(
+        max_workers=min(settings.SYNC_ALL_MAX_WORKERS, len(accounts)),
+        thread_name_prefix="sync-all",
+    )
+    started = time.monotonic()
+
+    try:
+        futures = {
+            slug: executor.submit(run_fetcher, account)
+            for slug, account in accounts.items()
+        }
+
+        for slug, future in futures.items():
+            timeout = settings.SYNC_TIMEOUTS.get(slug, settings.SYNC_DEFAULT_TIMEOUT)
+            remaining = max(0, started + timeout - time.monotonic())
+            try:
+                synced[slug] = future.result(timeout=remaining)
+            except NotModified:
+                unchanged.append(slug)
+            except CircuitOpen:
+                failed[slug] = "temporarily unavailable, showing last synced stats"
+            except TimeoutError:
+                # dropped: a fetch that never started is cancelled, one
+                # already running keeps its account claimed until it returns
+                future.cancel()
+                running[slug] = future
+                failed[slug] = f"timed out after {timeout}s"
+            except Exception as e:
+                logger.warning("%s sync failed for user=%s: %s", slug, user.pk, e)
+                failed[slug] = str(e)
+    finally:
+        # never wait on a timed-out fetch
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _load_accounts(user, stale_only=False, slugs=None):
+    accounts = {
+        account.platform.slug: account
+        for account in PlatformAccount.objects.filter(
+            user=user,
+            platform__slug__in=slugs or PLATFORM_FETCHERS.keys(),
+        ).select_related("platform")
+    }
+
+    if stale_only:
+        accounts = {
+            slug: account for slug, account in accounts.items()
+            if not is_account_fresh(account)
+        }
+    return accounts
+
+
+def _store_calendar(account):
+    """
+    Store the GitHub contribution calendar a fetcher left in
+    account.fetched. Returns whether snapshot deltas should credit
+    DailyActivity: GitHub's daily activity comes from its calendar instead.
+    """
+    store_contribution_calendar(account, account.fetched.get("calendar"))
+    return account.platform.slug != "github"
+
+
+def _store_results(user, accounts, synced, unchanged):
+    # snapshots and the stats write commit together, with the accounts
+    # locked (in a fixed order) by record_snapshot
+    with transaction.atomic():
+        for slug in sorted(synced, key=lambda slug: accounts[slug].pk):
+            account = accounts[slug]
+            credit_activity = _store_calendar(account)
+            if record_snapshot(account, account.fetched, synced[slug]["xp"], credit_activity) is None:
+                # fetched, but the counters match the last snapshot: nothing to write
+                del synced[slug]
+                unchanged.append(slug)
+
+        if synced:
+            update_platform_stats(
+                user, {accounts[slug].platform_id: row for slug, row in synced.items()}
+            )
+
+    refreshed = [accounts[slug] for slug in [*synced, *unchanged]]
+    if refreshed:
+        now = timezone.now()
+        for account in refreshed:
+            account.last_synced = now
+        PlatformAccount.objects.bulk_update(
+            refreshed, ["last_synced", "fetch_strategy", "http_cache"]
+        )
+
+
+# =========================================
+# Async sync (ASGI views, settings.SYNC_INLINE)
+# Same stats and bookkeeping as above, but the
+# fetches are awaited on the event loop, so a
+# single ASGI worker can hold many in flight.
+# GFG goes through its browser fallback and has
+# no async variant; it runs in a thread.
+# =========================================
+async def _afetch_github(account):
+    data = await afetch_github_activity(account.username, cache=account.http_cache)
+    account.fetched = data
+    return github_row(data)
+
+
+async def _afetch_leetcode(account):
+    data = await aget_leetcode_stats(account.username)
+    account.fetched = data
+    return leetcode_row(data)
+
+
+async def _afetch_codechef(account):
+    data = await aget_codechef_stats(account.username, cache=account.http_cache)
+    account.fetched = data
+    return codechef_row(data)
+
+
+async def _afetch_hackerrank(account):
+    data = await aget_hackerrank_stats(
+        account.username, cache=account.http_cache, prefer=account.fetch_strategy
+    )
+    account.fetch_strategy = data["source"]
+    account.fetched = data
+    return hackerrank_row(data)
+
+
+ASYNC_PLATFORM_FETCHERS = {
+    "github": _afetch_github,
+    "leetcode": _afetch_leetcode,
+    "gfg": sync_to_async(_fetch_gfg, thread_sensitive=False),
+    "codechef": _afetch_codechef,
+    "hackerrank": _afetch_hackerrank,
+}
+
+
+async def async_sync_all_platforms(user, stale_only=False, slugs=None):
+    """
+    sync_all_platforms() on the event loop; same return value.
+
+    `slugs` limits the refresh to those platforms (one for a single
+    platform sync view). Accounts are claimed like in the threaded path,
+    so two tabs (or a queued job) never fetch the same account at once.
+    """
+    accounts = await sync_to_async(_load_accounts)(user, stale_only, slugs)
+    accounts, busy = await sync_to_async(_claim)(accounts)
+    try:
+        return {**await _async_sync_accounts(user, accounts), "busy": busy}
+    finally:
+        await sync_to_async(release_accounts)(accounts.values())
+
+
+async def _async_sync_accounts(user, accounts):
+    synced = {}
+    unchanged = []
+    failed = {}
+
+    async def run(slug, account):
+        timeout = settings.SYNC_TIMEOUTS.get(slug, settings.SYNC_DEFAULT_TIMEOUT)
+        try:
+            with metered() as usage:
+                synced[slug] = await asyncio.wait_for(
+                    ASYNC_PLATFORM_FETCHERS[slug](account), timeout
+                )
+            logger.info("%s fetch for %s: %s", slug, account.username, usage)
+        except NotModified:
+            unchanged.append(slug)
+        except CircuitOpen:
+            failed[slug] = "temporarily unavailable, showing last synced stats"
+        except asyncio.TimeoutError:
+            # coroutine fetchers are cancelled here; GFG's runs in a thread
+            # that can't be: it may finish after its claim is released, but
+            # its result is dropped and it writes nothing
+            failed[slug] = f"timed out after {timeout}s"
+        except Exception as e:
+            logger.warning("%s sync failed for user=%s: %s", slug, user.pk, e)
+            failed[slug] = str(e)
+
+    await asyncio.gather(*(run(slug, account) for slug, account in accounts.items()))
+
+    await sync_to_async(_store_results)(user, accounts, synced, unchanged)
+    return {"synced": synced, "unchanged": unchanged, "failed": failed}
+
+
+# =========================================
+# Single account (bulk resync)
+# =========================================
+def fetch_account(account, usage=None):
+    """
+    Network half of a one-account sync; safe to run in a worker thread.
+
+    Returns the account's PlatformStats values (a stats_row), or None when
+    the remote profile is unchanged since the last sync. `usage` is filled
+    as in run_fetcher().
+    """
+    try:
+        return run_fetcher(account, usage)
+    except NotModified:
+        return None
+
+
+def save_account(account, row):
+    """
+    DB half of a one-account sync: a snapshot and stats write when the
+    counters changed, plus the account row. Returns whether stats changed.
+    """
+    changed = row is not None and record_sync(
+        account, account.fetched, row, credit_activity=_store_calendar(account)
+    )
+
+    account.last_synced = timezone.now()
+    account.save(update_fields=["last_synced", "fetch_strategy", "http_cache"])
+    return changed
+
+
+# =========================================
+# Many accounts per request (bulk resync)
+# =========================================
+def _bulk_results(accounts, stats, to_row, label):
+    results = []
+    for account in accounts:
+        data = stats.get(account.username)
+        if data is None:
+            results.append((account, None, Exception(f"{label} user {account.username!r} not found")))
+        else:
+            account.fetched = data
+            results.append((account, to_row(data), None))
+    return results
+
+
+def fetch_github_accounts_bulk(accounts):
+    """Repo + contribution totals via aliased GraphQL batches (needs GITHUB_TOKEN)."""
+    usernames = [account.username for account in accounts]
+    stats = get_github_stats_bulk(usernames, os.getenv("GITHUB_TOKEN"))
+    return _bulk_results(accounts, stats, github_row, "GitHub")
+
+
+def fetch_leetcode_accounts_bulk(accounts):
+    usernames = [account.username for account in accounts]
+    stats = get_leetcode_stats_bulk(usernames)
+    return _bulk_results(accounts, stats, leetcode_row, "LeetCode")
+
+
+def bulk_fetchers():
+    """
+    Platforms that can fetch a batch of accounts in one request.
+
+    Maps slug -> (fetcher, batch size). Each fetcher takes a list of
+    accounts and returns [(account, stats_row, error)] in the same order.
+    """
+    fetchers = {
+        "leetcode": (fetch_leetcode_accounts_bulk, settings.LEETCODE_GRAPHQL_BATCH),
+    }
+    if os.getenv("GITHUB_TOKEN"):
+        fetchers["github"] = (fetch_github_accounts_bulk, settings.GITHUB_GRAPHQL_BATCH)
+    return fetchers
+
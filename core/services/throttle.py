@@ -0,0 +1,158 @@
+"""
+Per-host token bucket and circuit breaker shared by every process.
+
+State lives in one ExternalHost row per upstream host and is only changed
+with conditional UPDATEs, so all gunicorn and job workers see the same
+budget and the same open/closed circuit.
+"""
+
+import asyncio
+import time
+
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import F, Value
+from django.db.models.functions import Least
+from django.db.models.lookups import GreaterThanOrEqual
+
+from core.models import ExternalHost
+
+
+class CircuitOpen(requests.RequestException):
+    """The upstream has been failing; calls fail fast until the cooldown ends."""
+
+
+class RateLimited(requests.RequestException):
+    """No request budget left for this host within the allowed wait."""
+
+
+def host_limits(host):
+    """Limits for `host`, or None when the host is not guarded."""
+    return settings.HOST_LIMITS.get(host)
+
+
+def _row(host, limits):
+    row, _ = ExternalHost.objects.get_or_create(
+        host=host,
+        defaults={"tokens": limits["burst"], "refilled_at": time.time()},
+    )
+    return row
+
+
+# =========================================
+# Circuit breaker
+# =========================================
+def check_circuit(host):
+    """
+    Raise CircuitOpen while the circuit is open.
+
+    Once the cooldown has passed exactly one caller wins the half-open
+    probe (by pushing opened_until forward); everyone else keeps failing
+    fast until that probe reports success or failure.
+    """
+    limits = host_limits(host)
+    if not limits:
+        return
+
+    row = _row(host, limits)
+    now = time.time()
+
+    if row.failures < settings.CIRCUIT_FAILURE_THRESHOLD:
+        return
+
+    if row.opened_until > now:
+        raise CircuitOpen(f"{host} is unavailable, retrying after {int(row.opened_until - now)}s")
+
+    probe = ExternalHost.objects.filter(
+        host=host, opened_until__lte=now
+    ).update(opened_until=now + settings.CIRCUIT_COOLDOWN)
+    if not probe:
+        raise CircuitOpen(f"{host} is unavailable")
+
+
+def record_success(host):
+    if host_limits(host):
+        ExternalHost.objects.filter(host=host, failures__gt=0).update(failures=0, opened_until=0)
+
+
+def record_failure(host):
+    if not host_limits(host):
+        return
+
+    now = time.time()
+    ExternalHost.objects.filter(host=host).update(failures=F("failures") + 1)
+    ExternalHost.objects.filter(
+        host=host,
+        failures__gte=settings.CIRCUIT_FAILURE_THRESHOLD,
+        opened_until__lt=now + settings.CIRCUIT_COOLDOWN,
+    ).update(opened_until=now + settings.CIRCUIT_COOLDOWN)
+
+
+# =========================================
+# Token bucket
+# =========================================
+def _take_token(host, limits):
+    now = time.time()
+    available = Least(
+        Value(float(limits["burst"])),
+        F("tokens") + (Value(now) - F("refilled_at")) * Value(float(limits["rate"])),
+    )
+    return ExternalHost.objects.filter(
+        GreaterThanOrEqual(available, 1), host=host
+    ).update(tokens=available - 1, refilled_at=now)
+
+
+def _next_pause(host, limits, deadline):
+    # roughly one refill interval, bounded by what is left of max_wait
+    pause = min(1 / limits["rate"], deadline - time.monotonic())
+    if pause <= 0:
+        raise RateLimited(f"Rate limit reached for {host}")
+    return pause
+
+
+def acquire_token(host, max_wait=None):
+    """Take one request token for `host`, sleeping up to `max_wait` seconds."""
+    limits = host_limits(host)
+    if not limits:
+        return
+
+    _row(host, limits)
+    max_wait = settings.HOST_LIMIT_MAX_WAIT if max_wait is None else max_wait
+    deadline = time.monotonic() + max_wait
+
+    while not _take_token(host, limits):
+        time.sleep(_next_pause(host, limits, deadline))
+
+
+# =========================================
+# Async variants (core.services.async_http)
+# The DB work runs through sync_to_async; waiting
+# for a token awaits instead of blocking a thread.
+# =========================================
+async def acheck_circuit(host):
+    if host_limits(host):
+        await sync_to_async(check_circuit)(host)
+
+
+async def arecord_success(host):
+    if host_limits(host):
+        await sync_to_async(record_success)(host)
+
+
+async def arecord_failure(host):
+    if host_limits(host):
+        await sync_to_async(record_failure)(host)
+
+
+async def aacquire_token(host, max_wait=None):
+    limits = host_limits(host)
+    if not limits:
+        return
+
+    await sync_to_async(_row)(host, limits)
+    max_wait = settings.HOST_LIMIT_MAX_WAIT if max_wait is None else max_wait
+    deadline = time.monotonic() + max_wait
+
+    while not await sync_to_async(_take_token)(host, limits):
+        await asyncio.sleep(_next_pause(host, limits, deadline))
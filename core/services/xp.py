@@ -0,0 +1,168 @@
+"""
+Versioned XP formulas.
+
+A formula version maps each platform to integer weights per raw counter
+plus an optional rating term, max(0, rating - base) ** power // divisor.
+The counters are the keys the fetchers return and PlatformStats stores
+(`solved` and the `extra` keys), so the same formula is applied at sync
+time (platform_xp) and to stored rows in SQL (xp_expression, used by
+`manage.py recompute_xp`).
+
+Versions are never edited once released: add a new one, point
+settings.XP_FORMULA_VERSION at it and run recompute_xp.
+"""
+
+from django.conf import settings
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.db.models.fields.json import KT
+from django.db.models.functions import Cast, Coalesce, Greatest
+
+XP_FORMULAS = {
+    # what the sync services computed before formulas were versioned
+    1: {
+        "github": {"weights": {"repos": 15, "contributions": 5}},
+        "leetcode": {
+            "weights": {"easy": 5, "medium": 10, "hard": 20, "contests": 50},
+            "rating": {"base": 1300, "power": 2, "divisor": 10},
+        },
+        "gfg": {"weights": {"score": 10, "solved": 5}},
+        "codechef": {
+            "weights": {"solved": 2, "contests": 25},
+            "rating": {"base": 1200, "power": 1, "divisor": 1},
+        },
+        "hackerrank": {"weights": {"solved": 6}},
+    },
+    # XP_ENGINE.md
+    2: {
+        "github": {"weights": {"repos": 15, "contributions": 5}},
+        "leetcode": {
+            "weights": {"solved": 10, "contests": 50},
+            "rating": {"base": 1300, "power": 2, "divisor": 10},
+        },
+        "gfg": {"weights": {"score": 10, "solved": 5}},
+        "codechef": {
+            "weights": {"solved": 2, "contests": 50},
+            "rating": {"base": 1200, "power": 2, "divisor": 10},
+        },
+        "hackerrank": {"weights": {"solved": 6}},
+    },
+}
+
+
+# how describe() names each counter
+COUNTER_LABELS = {
+    "solved": "problems solved",
+    "easy": "Easy",
+    "medium": "Medium",
+    "hard": "Hard",
+    "contests": "contests",
+    "score": "coding score",
+    "repos": "public repos",
+    "contributions": "contributions",
+}
+
+SUPERSCRIPTS = {2: "²", 3: "³"}
+
+
+def formula(slug, version=None):
+    """The formula for platform `slug` in `version` (default: the active one)."""
+    version = version or settings.XP_FORMULA_VERSION
+    return XP_FORMULAS[version].get(slug, {"weights": {}})
+
+
+def counters_read(slug, version=None):
+    """The raw counters the formula for `slug` reads."""
+    rule = formula(slug, version)
+    return set(rule["weights"]) | ({"rating"} if "rating" in rule else set())
+
+
+def describe(slug, version=None):
+    """The formula for `slug` as text, e.g. "problems solved × 10 + contests × 50"."""
+    rule = formula(slug, version)
+
+    parts = [
+        f"{COUNTER_LABELS.get(name, name)} × {weight}"
+        for name, weight in rule["weights"].items()
+    ]
+    if "rating" in rule:
+        term = rule["rating"]
+        text = f"(rating − {term['base']})"
+        if term["power"] > 1:
+            text += SUPERSCRIPTS.get(term["power"], f"^{term['power']}")
+        if term["divisor"] > 1:
+            text += f" ÷ {term['divisor']}"
+        parts.append(text)
+    return " + ".join(parts) or "0"
+
+
+# =========================================
+# Python side (sync time)
+# =========================================
+def platform_xp(slug, counters, version=None):
+    """XP for a dict of raw counters; missing counters count as 0."""
+    rule = formula(slug, version)
+
+    xp = sum(
+        weight * int(counters.get(name) or 0)
+        for name, weight in rule["weights"].items()
+    )
+    if "rating" in rule:
+        term = rule["rating"]
+        above = max(0, int(counters.get("rating") or 0) - term["base"])
+        xp += above ** term["power"] // term["divisor"]
+    return xp
+
+
+# =========================================
+# SQL side (bulk recompute over PlatformStats)
+# =========================================
+def _counter(name):
+    if name == "solved":
+        return F("solved")
+    return Coalesce(Cast(KT(f"extra__{name}"), IntegerField()), Value(0))
+
+
+def _platform_expression(rule):
+    xp = Value(0)
+    for name, weight in rule["weights"].items():
+        xp = xp + _counter(name) * Value(weight)
+
+    if "rating" in rule:
+        term = rule["rating"]
+        above = Greatest(Value(0), _counter("rating") - Value(term["base"]))
+        raised = above
+        for _ in range(term["power"] - 1):
+            raised = raised * above
+        xp = xp + raised / Value(term["divisor"])
+    return xp
+
+
+def xp_expression(platforms, version=None):
+    """
+    A PlatformStats expression giving each row's XP under `version`.
+
+    `platforms` maps platform id -> slug; rows of other platforms keep
+    their stored XP. Integer arithmetic throughout, so the result matches
+    platform_xp() exactly.
+    """
+    return Case(
+        *(
+            When(platform_id=platform_id, then=_platform_expression(formula(slug, version)))
+            for platform_id, slug in platforms.items()
+        ),
+        default=F("xp"),
+        output_field=IntegerField(),
+    )
+
+
+def rescorable(platforms, version=None):
+    """
+    A PlatformStats filter for the rows that store every counter `version`
+    reads. Rows copied from the old UserStats columns (complete=False) may
+    lack some; rescoring those would count the missing ones as 0.
+    """
+    stored = Q(complete=True)
+    for platform_id, slug in platforms.items():
+        extra = sorted(counters_read(slug, version) - {"solved"})
+        stored |= Q(platform_id=platform_id, extra__has_keys=extra) if extra else Q(platform_id=platform_id)
+    return stored
@@ -0,0 +1,23 @@
+"""
+Bookkeeping for rows removed by deletes the stats services don't see
+(a user or account deleted, with its stats going by CASCADE).
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from core.models import PlatformStats, UserStats
+from core.services.distribution import TOTAL, move_users
+from core.services.rank_index import rank_index
+
+
+@receiver(post_delete, sender=PlatformStats)
+def platform_stats_deleted(sender, instance, **kwargs):
+    transaction.on_commit(lambda: move_users([(instance.platform_id, instance.xp, 0)]))
+
+
+@receiver(post_delete, sender=UserStats)
+def user_stats_deleted(sender, instance, **kwargs):
+    transaction.on_commit(lambda: move_users([(TOTAL, instance.total_xp, 0)]))
+    transaction.on_commit(lambda: rank_index.set(instance.user_id, 0))
@@ -0,0 +1,19 @@
+"""Small model builders shared by the test modules."""
+
+from django.contrib.auth.models import User
+
+from core.models import Platform, PlatformAccount
+
+
+def make_platform(slug):
+    platform, _ = Platform.objects.get_or_create(
+        slug=slug, defaults={"name": slug.title(), "base_url": f"https://{slug}.example"}
+    )
+    return platform
+
+
+def make_account(slug, username="bench1", user=None, **fields):
+    user = user or User.objects.create_user(f"{slug}_{username}")
+    return PlatformAccount.objects.create(
+        user=user, platform=make_platform(slug), username=username, **fields
+    )
@@ -0,0 +1,56 @@
+from datetime import date
+
+from django.test import TestCase
+
+from core.models import DailyActivity, UserHeatmap
+from core.services.activity import credit_daily_activity, store_daily_counts
+from core.tests.factories import make_account
+
+
+def xp_for(count):
+    return count * 2
+
+
+class CalendarUpsertTests(TestCase):
+    def setUp(self):
+        self.account = make_account("github")
+        self.calendar = {"2026-10-01": 3, "2026-10-02": 0, "2026-10-03": 5}
+
+    def heatmap(self):
+        return dict(UserHeatmap.objects.filter(user=self.account.user).values_list("date", "total_xp"))
+
+    def test_stores_active_days(self):
+        self.assertEqual(store_daily_counts(self.account, self.calendar, xp_for), 2)
+
+        self.assertEqual(
+            dict(DailyActivity.objects.values_list("date", "count")),
+            {date(2026, 10, 1): 3, date(2026, 10, 3): 5},
+        )
+        self.assertEqual(self.heatmap(), {date(2026, 10, 1): 6, date(2026, 10, 3): 10})
+
+    def test_unchanged_calendar_is_one_read(self):
+        store_daily_counts(self.account, self.calendar, xp_for)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(store_daily_counts(self.account, self.calendar, xp_for), 0)
+
+    def test_only_changed_days_are_rewritten(self):
+        store_daily_counts(self.account, self.calendar, xp_for)
+
+        written = store_daily_counts(self.account, {**self.calendar, "2026-10-01": 0, "2026-10-02": 4}, xp_for)
+
+        self.assertEqual(written, 2)
+        self.assertEqual(DailyActivity.objects.get(date=date(2026, 10, 1)).count, 0)
+        self.assertEqual(
+            self.heatmap(), {date(2026, 10, 1): 0, date(2026, 10, 2): 8, date(2026, 10, 3): 10}
+        )
+
+    def test_heatmap_sums_the_users_accounts(self):
+        other = make_account("leetcode", user=self.account.user)
+        credit_daily_activity(other, date(2026, 10, 3), xp=15, count=1)
+
+        store_daily_counts(self.account, self.calendar, xp_for)
+
+        self.assertEqual(self.heatmap()[date(2026, 10, 3)], 25)
+        heatmap = UserHeatmap.objects.get(user=self.account.user, date=date(2026, 10, 3))
+        self.assertEqual(heatmap.activity_score, 6)
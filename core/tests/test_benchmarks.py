@@ -0,0 +1,51 @@
+import requests
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, override_settings
+
+from core.benchmarks.reporting import percentile
+from core.benchmarks.standin import PlatformStandin
+
+
+class StandinTests(SimpleTestCase):
+    def get(self, standin, path, **kwargs):
+        return requests.get(f"{standin.url}{path}", timeout=5, **kwargs)
+
+    def test_recorded_profiles_and_unknown_users(self):
+        with PlatformStandin() as standin:
+            found = self.get(standin, "/hackerrank/rest/hackers/ann/profile")
+            missing = self.get(standin, "/codechef/users/missing-bob")
+
+        self.assertEqual(found.status_code, 200)
+        self.assertIn("solved_challenges", found.text)
+        self.assertEqual(missing.status_code, 404)
+        self.assertEqual(standin.requests, {("hackerrank", 200): 1, ("codechef", 404): 1})
+
+    def test_etag_revalidation(self):
+        with PlatformStandin() as standin:
+            first = self.get(standin, "/codechef/users/ann")
+            again = self.get(standin, "/codechef/users/ann", headers={"If-None-Match": first.headers["ETag"]})
+
+        self.assertEqual((again.status_code, again.content), (304, b""))
+
+    def test_injected_errors_and_rate_limit(self):
+        with PlatformStandin(error_rate=1.0) as standin:
+            self.assertEqual(self.get(standin, "/codechef/users/ann").status_code, 503)
+
+        with PlatformStandin(rate=2) as standin:
+            statuses = [self.get(standin, "/codechef/users/ann").status_code for _ in range(3)]
+        self.assertEqual(statuses, [200, 200, 429])
+
+
+class PercentileTests(SimpleTestCase):
+    def test_nearest_rank(self):
+        values = list(range(10, 0, -1))
+        self.assertEqual((percentile(values, 50), percentile(values, 95), percentile(values, 100)), (5, 10, 10))
+        self.assertEqual(percentile([3.5], 50), 3.5)
+        self.assertEqual(percentile([], 95), 0.0)
+
+
+class BenchServersGuardTests(SimpleTestCase):
+    @override_settings(DEBUG=False)
+    def test_refuses_to_write_outside_debug(self):
+        with self.assertRaisesMessage(CommandError, "--allow-writes"):
+            call_command("bench_servers")
@@ -0,0 +1,67 @@
+import threading
+from concurrent.futures import Future
+from http.server import ThreadingHTTPServer
+
+from django.test import SimpleTestCase, override_settings
+
+from core.services.browser import BrowserPool, BrowserServiceError, make_handler, render_page_text
+
+
+class FakePool:
+    """Renders from a dict instead of Chromium; None plays a full queue."""
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    def submit(self, url, wait_ms, timeout_ms):
+        if self.pages is None:
+            return None
+        future = Future()
+        page = self.pages.get(url, RuntimeError("navigation timed out"))
+        if isinstance(page, Exception):
+            future.set_exception(page)
+        else:
+            future.set_result(page)
+        return future
+
+
+class RenderServiceTests(SimpleTestCase):
+    PAGE = "https://www.geeksforgeeks.org/profile/ann"
+
+    def serve(self, pages):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(FakePool(pages), {"www.geeksforgeeks.org"}))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        host, port = server.server_address
+        return override_settings(BROWSER_SERVICE_URL=f"http://{host}:{port}")
+
+    def test_rendered_text(self):
+        with self.serve({self.PAGE: "Problems Solved\n12"}):
+            self.assertEqual(render_page_text(self.PAGE, wait_ms=0), "Problems Solved\n12")
+
+    def test_errors_surface_as_browser_service_errors(self):
+        cases = [
+            ({}, self.PAGE, "navigation timed out"),
+            ({}, "https://evil.example/", "host not allowed"),
+            (None, self.PAGE, "busy"),
+        ]
+        for pages, url, message in cases:
+            with self.subTest(message=message), self.serve(pages):
+                with self.assertRaisesMessage(BrowserServiceError, message):
+                    render_page_text(url, wait_ms=0)
+
+    @override_settings(BROWSER_SERVICE_URL="http://127.0.0.1:9")
+    def test_service_down(self):
+        with self.assertRaisesMessage(BrowserServiceError, "unavailable"):
+            render_page_text(self.PAGE)
+
+
+class BrowserPoolTests(SimpleTestCase):
+    def test_full_queue_rejects(self):
+        # workers not started: nothing drains the queue
+        pool = BrowserPool(size=1, max_pages=10, max_rss_mb=500, max_queue=1)
+
+        self.assertIsNotNone(pool.submit("https://a.example", 0, 1000))
+        self.assertIsNone(pool.submit("https://b.example", 0, 1000))
+        self.assertEqual((pool.status()["queued"], pool.status()["rejected"]), (1, 1))
@@ -0,0 +1,70 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from core.models import XPDistribution
+from core.services.distribution import (
+    BOUNDS, TOTAL, bucket_of, current_distribution, rebuild_distribution, top_percent,
+)
+from core.services.stats import clear_platform_stats, stats_row, update_platform_stats
+from core.tests.factories import make_platform
+
+
+class DistributionTests(TestCase):
+    def setUp(self):
+        self.platform = make_platform("leetcode")
+
+    def _user(self, name, xp):
+        user = User.objects.create_user(name)
+        with self.captureOnCommitCallbacks(execute=True):
+            update_platform_stats(user, {self.platform.pk: stats_row(1, xp)})
+        return user
+
+    def test_bucket_of(self):
+        self.assertIsNone(bucket_of(0))
+        self.assertEqual(bucket_of(1), 0)
+        self.assertEqual(bucket_of(9), 0)
+        self.assertEqual(bucket_of(10), 1)
+        self.assertEqual(bucket_of(BOUNDS[-1] * 10), len(BOUNDS) - 1)
+
+    def test_top_percent(self):
+        # each at the top of its bucket, so nobody in it counts as above them
+        for i, xp in enumerate([9, 99, 749, 7499]):
+            self._user(f"user{i}", xp)
+        distribution = current_distribution()
+
+        self.assertEqual(distribution.buckets[TOTAL][bucket_of(749)], 1)
+        self.assertEqual(top_percent(distribution, TOTAL, 7499), 25)
+        self.assertEqual(top_percent(distribution, TOTAL, 749), 50)
+        self.assertEqual(top_percent(distribution, self.platform.pk, 99), 75)
+        self.assertEqual(top_percent(distribution, TOTAL, 9), 100)
+        # at the bottom of its bucket: the others in it are spread above
+        self.assertEqual(top_percent(distribution, TOTAL, 5000), 50)
+        self.assertIsNone(top_percent(distribution, TOTAL, 0))
+        self.assertIsNone(top_percent(distribution, "999", 100))
+
+    def test_incremental_counts_match_rebuild(self):
+        users = [self._user(f"user{i}", xp) for i, xp in enumerate([5, 50, 500, 5000, 20])]
+        current_distribution()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            update_platform_stats(users[0], {self.platform.pk: stats_row(2, 800)})
+        with self.captureOnCommitCallbacks(execute=True):
+            clear_platform_stats(users[1], "leetcode")
+        with self.captureOnCommitCallbacks(execute=True):
+            users[2].delete()
+
+        incremental = XPDistribution.objects.get(pk=1).buckets
+        self.assertEqual(incremental, rebuild_distribution().buckets)
+        self.assertEqual(sum(incremental[TOTAL]), 3)
+
+    def test_profile_badges(self):
+        for i, xp in enumerate([9, 99, 7499]):
+            self._user(f"user{i}", xp)
+        me = self._user("me", 749)
+        self.client.force_login(me)
+
+        response = self.client.get(reverse("profile"))
+
+        self.assertEqual((response.context["total_top"], response.context["leetcode_top"]), (50, 50))
+        self.assertContains(response, "Top 50%")
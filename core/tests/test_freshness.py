@@ -0,0 +1,81 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.models import BackgroundJob, PlatformAccount
+from core.services.freshness import (
+    claim_accounts,
+    is_account_fresh,
+    release_accounts,
+    request_sync,
+    revalidate_stale,
+)
+from core.tests.factories import make_account
+
+
+@override_settings(SYNC_TTL={"leetcode": 600}, SYNC_DEFAULT_TTL=3600)
+class FreshnessWindowTests(TestCase):
+    def test_ttl_per_platform(self):
+        now = timezone.now()
+        leetcode = make_account("leetcode", last_synced=now - timedelta(minutes=15))
+        gfg = make_account("gfg", user=leetcode.user, last_synced=now - timedelta(minutes=15))
+
+        self.assertFalse(is_account_fresh(leetcode, now))
+        self.assertTrue(is_account_fresh(gfg, now))
+        self.assertFalse(is_account_fresh(make_account("codechef", user=leetcode.user), now))
+
+    def test_fresh_platform_is_not_queued_unless_forced(self):
+        account = make_account("leetcode", last_synced=timezone.now())
+
+        self.assertIsNone(request_sync(account.user, "leetcode"))
+        job = request_sync(account.user, "leetcode", force=True)
+        self.assertEqual((job.kind, job.payload), ("sync_leetcode", {"force": True}))
+
+    def test_stale_platform_requests_share_one_job(self):
+        account = make_account("leetcode")
+
+        first = request_sync(account.user, "leetcode")
+        self.assertEqual(request_sync(account.user, "leetcode").pk, first.pk)
+
+    @override_settings(SYNC_REVALIDATE_BACKOFF=300)
+    def test_revalidate_backs_off_after_a_recent_attempt(self):
+        account = make_account("leetcode")
+        accounts = [account]
+
+        job = revalidate_stale(account.user, accounts)
+        self.assertEqual(job.kind, "sync_all")
+        BackgroundJob.objects.filter(pk=job.pk).update(status="failed", finished_at=timezone.now())
+
+        self.assertIsNone(revalidate_stale(account.user, accounts))
+        account.last_synced = timezone.now()
+        self.assertIsNone(revalidate_stale(account.user, accounts))
+
+
+@override_settings(SYNC_CLAIM_TIMEOUT=60)
+class AccountClaimTests(TestCase):
+    def test_second_claim_gets_nothing_until_release(self):
+        account = make_account("leetcode")
+
+        self.assertEqual(claim_accounts([account]), [account])
+        self.assertEqual(claim_accounts([account]), [])
+
+        release_accounts([account])
+        self.assertEqual(claim_accounts([account]), [account])
+
+    def test_only_free_accounts_are_claimed(self):
+        held = make_account("leetcode")
+        free = make_account("gfg", user=held.user)
+        claim_accounts([held])
+
+        self.assertEqual(claim_accounts([held, free]), [free])
+
+    def test_expired_claim_can_be_taken(self):
+        account = make_account("leetcode")
+        claim_accounts([account])
+        # the claiming process died mid-fetch
+        PlatformAccount.objects.filter(pk=account.pk).update(
+            sync_claimed_until=timezone.now() - timedelta(seconds=1)
+        )
+
+        self.assertEqual(claim_accounts([account]), [account])
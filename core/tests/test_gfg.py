@@ -0,0 +1,66 @@
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase, TestCase
+
+from core.models import PlatformAccount
+from core.services import gfg
+from core.services.gfg import get_gfg_stats, preferred_strategy
+from core.services.sync import fetch_account, save_account
+from core.tests.factories import make_account
+
+
+def strategies(api=None, page=None, browser=None):
+    """GFG_STRATEGIES stand-ins returning the given results (or raising them)."""
+    def strategy(result):
+        if isinstance(result, Exception):
+            return mock.Mock(side_effect=result)
+        return mock.Mock(return_value=result)
+
+    return {"api": strategy(api), "page": strategy(page), "browser": strategy(browser)}
+
+
+class StrategyOrderTests(SimpleTestCase):
+    def test_plain_http_before_browser(self):
+        served = strategies(api=requests.ConnectionError("down"), page={"solved": 7, "score": 20})
+
+        with mock.patch.dict(gfg.GFG_STRATEGIES, served):
+            data = get_gfg_stats("ann")
+
+        self.assertEqual((data["solved"], data["source"]), (7, "page"))
+        served["browser"].assert_not_called()
+
+    def test_preferred_strategy_first(self):
+        served = strategies(api={"solved": 1, "score": 0}, page={"solved": 7, "score": 20})
+
+        with mock.patch.dict(gfg.GFG_STRATEGIES, served):
+            self.assertEqual(get_gfg_stats("ann", prefer="page")["source"], "page")
+        served["api"].assert_not_called()
+
+    def test_browser_is_never_preferred(self):
+        served = strategies(browser={"solved": 7, "score": 20})
+
+        with mock.patch.dict(gfg.GFG_STRATEGIES, served):
+            data = get_gfg_stats("ann", prefer="browser")
+
+        self.assertEqual(data["source"], "browser")
+        served["api"].assert_called_once()
+        served["page"].assert_called_once()
+        # one browser-served sync doesn't make the browser the first try
+        self.assertEqual(preferred_strategy(data, "page"), "page")
+
+    def test_all_strategies_failing(self):
+        with mock.patch.dict(gfg.GFG_STRATEGIES, strategies()):
+            with self.assertRaisesMessage(Exception, "user not found"):
+                get_gfg_stats("ann")
+
+
+class StrategyMemoryTests(TestCase):
+    def test_sync_remembers_working_strategy(self):
+        account = make_account("gfg")
+        served = strategies(page={"solved": 7, "score": 20})
+
+        with mock.patch.dict(gfg.GFG_STRATEGIES, served), self.captureOnCommitCallbacks(execute=True):
+            save_account(account, fetch_account(account))
+
+        self.assertEqual(PlatformAccount.objects.get(pk=account.pk).fetch_strategy, "page")
@@ -0,0 +1,99 @@
+from datetime import timedelta
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from core.benchmarks.standin import PlatformStandin
+from core.services import github
+from core.services.github import afetch_github_activity, fetch_github_activity, get_github_stats_bulk
+from core.services.http_client import NotModified
+from core.services.sync import fetch_github_accounts_bulk
+from core.tests.factories import make_account
+
+
+class BulkGraphQLTests(SimpleTestCase):
+    def test_aliased_batches_with_unknown_logins(self):
+        logins = ["ann", "missing-bob", "cat"]
+
+        with PlatformStandin() as standin, override_settings(PLATFORM_URLS=standin.platform_urls()):
+            stats = get_github_stats_bulk(logins, token="t", batch_size=2)
+
+        self.assertEqual(standin.requests[("github_api", 200)], 2)
+        self.assertEqual(set(stats), set(logins))
+        self.assertIsNone(stats["missing-bob"])
+        self.assertEqual(stats["ann"], stats["cat"])
+        self.assertGreater(stats["ann"]["xp"], 0)
+        self.assertTrue(stats["ann"]["calendar"])
+
+
+class RateLimitBudgetTests(SimpleTestCase):
+    def _budget(self, remaining, reset_in):
+        reset_at = (timezone.now() + reset_in).strftime("%Y-%m-%dT%H:%M:%SZ")
+        return {"remaining": remaining, "resetAt": reset_at}
+
+    @override_settings(GITHUB_RATE_LIMIT_MAX_SLEEP=60)
+    def test_waits_for_a_short_reset(self):
+        with mock.patch.object(github.time, "sleep") as sleep:
+            github._wait_for_rate_limit(self._budget(5, timedelta(seconds=10)), next_cost=1)
+            sleep.assert_not_called()
+
+            github._wait_for_rate_limit(self._budget(0, timedelta(seconds=10)), next_cost=1)
+            sleep.assert_called_once()
+
+    @override_settings(GITHUB_RATE_LIMIT_MAX_SLEEP=60)
+    def test_gives_up_on_a_long_reset(self):
+        with self.assertRaisesMessage(Exception, "budget exhausted"):
+            github._wait_for_rate_limit(self._budget(0, timedelta(hours=1)), next_cost=1)
+
+
+class BulkAccountsTests(TestCase):
+    def test_unknown_login_fails_only_its_account(self):
+        ann = make_account("github", username="ann")
+        missing = make_account("github", username="missing-bob")
+
+        with PlatformStandin() as standin, override_settings(PLATFORM_URLS=standin.platform_urls()), \
+                mock.patch.dict("os.environ", {"GITHUB_TOKEN": "t"}):
+            results = fetch_github_accounts_bulk([ann, missing])
+
+        (first, row, error), (second, missing_row, missing_error) = results
+        self.assertEqual((first, second), (ann, missing))
+        self.assertIsNone(error)
+        self.assertEqual(row["extra"]["repos"], ann.fetched["repos"])
+        self.assertIsNone(missing_row)
+        self.assertIn("not found", str(missing_error))
+
+
+class ActivityFetchTests(SimpleTestCase):
+    """fetch_github_activity() spends one request with a token, two without."""
+
+    def setUp(self):
+        self.standin = self.enterContext(PlatformStandin())
+        self.enterContext(override_settings(PLATFORM_URLS=self.standin.platform_urls()))
+
+    def requests_made(self):
+        return sum(self.standin.requests.values())
+
+    def test_one_graphql_request_with_token(self):
+        with mock.patch.dict("os.environ", {"GITHUB_TOKEN": "t"}):
+            data = fetch_github_activity("ann")
+            with self.assertRaisesMessage(Exception, "not found"):
+                fetch_github_activity("missing-bob")
+
+        self.assertEqual(self.standin.requests[("github_api", 200)], 2)
+        self.assertEqual(self.requests_made(), 2)
+        self.assertGreater(data["contributions"], 0)
+
+    def test_unchanged_profile_without_token(self):
+        cache = {}
+        with mock.patch.dict("os.environ", clear=True):
+            data = fetch_github_activity("ann", cache=cache)
+            self.assertEqual(self.requests_made(), 2)
+
+            with self.assertRaises(NotModified):
+                fetch_github_activity("ann", cache=cache)
+            self.assertEqual(async_to_sync(afetch_github_activity)("ann"), data)
+
+        self.assertEqual(self.requests_made(), 6)
+        self.assertTrue(data["calendar"])
@@ -0,0 +1,46 @@
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core.benchmarks.standin import PlatformStandin
+from core.models import PlatformAccount
+from core.services.hackerrank import aget_hackerrank_stats, get_hackerrank_stats
+from core.services.sync import fetch_account, save_account
+from core.tests.factories import make_account
+
+
+class StrategyOrderTests(SimpleTestCase):
+    def setUp(self):
+        self.standin = self.enterContext(PlatformStandin())
+        self.enterContext(override_settings(PLATFORM_URLS=self.standin.platform_urls()))
+
+    def requests_made(self):
+        return sum(self.standin.requests.values())
+
+    def test_rest_endpoint_first(self):
+        data = get_hackerrank_stats("ann")
+
+        self.assertEqual(data["source"], "api")
+        self.assertEqual(self.requests_made(), 1)
+
+    def test_remembered_strategy_first(self):
+        for fetch in [get_hackerrank_stats, async_to_sync(aget_hackerrank_stats)]:
+            with self.subTest(fetch=fetch):
+                self.standin.requests.clear()
+                self.assertEqual(fetch("ann", prefer="page")["source"], "page")
+                self.assertEqual(self.requests_made(), 1)
+
+    def test_unknown_user(self):
+        with self.assertRaisesMessage(Exception, "not found"):
+            get_hackerrank_stats("missing-bob")
+
+
+class StrategyMemoryTests(TestCase):
+    def _sync(self, account):
+        with PlatformStandin() as standin, override_settings(PLATFORM_URLS=standin.platform_urls()), \
+                self.captureOnCommitCallbacks(execute=True):
+            save_account(account, fetch_account(account))
+        return PlatformAccount.objects.get(pk=account.pk).fetch_strategy
+
+    def test_sync_stores_the_serving_strategy(self):
+        self.assertEqual(self._sync(make_account("hackerrank")), "api")
+        self.assertEqual(self._sync(make_account("hackerrank", username="cat", fetch_strategy="page")), "page")
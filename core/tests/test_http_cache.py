@@ -0,0 +1,112 @@
+import json
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase, override_settings
+
+from core.services import http_client
+from core.services.codechef import get_codechef_stats
+from core.services.hackerrank import get_hackerrank_stats
+from core.services.http_client import NotModified
+
+ORIGIN = "https://upstream.example"
+
+
+def response(status=200, body=b"", headers=None):
+    built = requests.Response()
+    built.status_code = status
+    built._content = body if isinstance(body, bytes) else body.encode()
+    built.headers.update(headers or {})
+    return built
+
+
+class UpstreamTestCase(SimpleTestCase):
+    """Serves queued responses through http_client's session."""
+
+    def setUp(self):
+        self.session = mock.Mock()
+        patcher = mock.patch.object(http_client, "get_session", return_value=self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def serve(self, *responses):
+        self.session.request.side_effect = list(responses)
+
+    def sent_headers(self, call=-1):
+        return self.session.request.call_args_list[call].kwargs["headers"]
+
+
+@override_settings(PLATFORM_URLS={"hackerrank": ORIGIN, "codechef": ORIGIN})
+class UnreadableBodyTests(UpstreamTestCase):
+    """Validators are only kept for a body that parsed."""
+
+    API = f"{ORIGIN}/rest/hackers/ann/profile"
+    PAGE = f"{ORIGIN}/profile/ann"
+
+    def test_hackerrank_api_without_count(self):
+        unreadable = response(body=json.dumps({"model": {}}), headers={"ETag": '"a"'})
+        page = response(body='{"solved_challenges": 42}')
+        cache = {}
+
+        self.serve(unreadable, page)
+        self.assertEqual(get_hackerrank_stats("ann", cache=cache)["solved"], 42)
+        self.assertNotIn(self.API, cache)
+        self.assertIn(self.PAGE, cache)
+
+        # the same unreadable body is not taken for "unchanged"
+        self.serve(unreadable, response(body='{"solved_challenges": 43}'))
+        data = get_hackerrank_stats("ann", cache=cache, prefer="api")
+        self.assertEqual((data["solved"], data["source"]), (43, "page"))
+        self.assertNotIn("If-None-Match", self.sent_headers(0))
+
+    def test_codechef_unparsable_page(self):
+        cache = {}
+        for _ in range(2):
+            self.serve(response(body=b""))
+            with self.assertRaises(Exception) as raised:
+                get_codechef_stats("ann", cache=cache)
+            self.assertNotIsInstance(raised.exception, NotModified)
+            self.assertEqual(cache, {})
+
+
+class ConditionalGetTests(UpstreamTestCase):
+    URL = f"{ORIGIN}/profile/ann"
+
+    def test_validators_sent_and_304_is_not_modified(self):
+        cache = {}
+        validators = {"ETag": '"v1"', "Last-Modified": "Sat, 17 Oct 2026 10:00:00 GMT"}
+
+        self.serve(response(body="<html>1</html>", headers=validators), response(status=304))
+        http_client.conditional_get(self.URL, cache)
+        self.assertNotIn("If-None-Match", self.sent_headers(0))
+
+        stored = dict(cache[self.URL])
+        with self.assertRaises(NotModified):
+            http_client.conditional_get(self.URL, cache, headers={"Accept": "text/html"})
+
+        self.assertEqual(self.sent_headers(1), {
+            "Accept": "text/html",
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Sat, 17 Oct 2026 10:00:00 GMT",
+        })
+        self.assertEqual(cache[self.URL], stored)
+
+    def test_same_body_without_validators_is_not_modified(self):
+        cache = {self.URL: {"strategy": "page"}}
+
+        self.serve(response(body="<html>1</html>"), response(body="<html>1</html>"), response(body="<html>2</html>"))
+        http_client.conditional_get(self.URL, cache)
+        with self.assertRaises(NotModified):
+            http_client.conditional_get(self.URL, cache)
+        changed = http_client.conditional_get(self.URL, cache)
+
+        self.assertEqual(changed.text, "<html>2</html>")
+        # callers' own keys survive the validator updates
+        self.assertEqual(cache[self.URL]["strategy"], "page")
+
+    def test_errors_leave_the_cache_alone(self):
+        cache = {}
+        self.serve(response(status=404))
+
+        self.assertEqual(http_client.conditional_get(self.URL, cache).status_code, 404)
+        self.assertEqual(cache, {})
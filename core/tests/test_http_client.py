@@ -0,0 +1,40 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from core.benchmarks.standin import PlatformStandin
+from core.services import http_client
+
+
+@override_settings(HTTP_MAX_RETRIES=2, HTTP_BACKOFF_FACTOR=0)
+class SharedSessionTests(SimpleTestCase):
+    def setUp(self):
+        # a session of our own, built with the settings above
+        self.enterContext(mock.patch.object(http_client, "_session", None))
+        http_client.reset_stats()
+
+    def test_requests_share_one_connection(self):
+        with PlatformStandin() as standin:
+            with http_client.metered() as usage:
+                for _ in range(5):
+                    http_client.get(f"{standin.url}/codechef/users/ann")
+
+        self.assertEqual(usage["requests"], 5)
+        self.assertGreater(usage["bytes"], 0)
+        stats = http_client.host_stats()["127.0.0.1"]
+        self.assertEqual((stats["requests"], stats["connections"]), (5, 1))
+
+    def test_gets_retry_server_errors_posts_do_not(self):
+        with PlatformStandin(error_rate=1.0) as standin:
+            self.assertEqual(http_client.get(f"{standin.url}/codechef/users/ann").status_code, 503)
+            self.assertEqual(standin.requests[("codechef", 503)], 3)
+
+            self.assertEqual(http_client.post(f"{standin.url}/leetcode/graphql", json={}).status_code, 503)
+            self.assertEqual(standin.requests[("leetcode", 503)], 1)
+
+    def test_rate_limited_responses_are_not_retried(self):
+        with PlatformStandin(rate=1) as standin:
+            http_client.get(f"{standin.url}/codechef/users/ann")
+            self.assertEqual(http_client.get(f"{standin.url}/codechef/users/ann").status_code, 429)
+
+        self.assertEqual(standin.requests[("codechef", 429)], 1)
@@ -0,0 +1,116 @@
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from core.models import BackgroundJob
+from core.services import jobs
+from core.services.jobs import claim_next_job, enqueue, requeue_stale_jobs, run_job
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("alice")
+
+    def test_claims_oldest_due_job_once(self):
+        first = enqueue(self.user, "sync_all")
+        enqueue(self.user, "sync_all")
+        enqueue(self.user, "sync_all", run_after=timezone.now() + timedelta(hours=1))
+
+        claimed = claim_next_job()
+        self.assertEqual(claimed.pk, first.pk)
+        self.assertEqual((claimed.status, claimed.attempts), ("running", 1))
+        self.assertIsNotNone(claimed.heartbeat_at)
+
+        claim_next_job()
+        self.assertIsNone(claim_next_job())
+
+    def test_run_job_records_result_and_failure(self):
+        handlers = {"sync_all": lambda job: {"ok": True}, "task_reply": mock.Mock(side_effect=ValueError("boom"))}
+        enqueue(self.user, "sync_all")
+        enqueue(self.user, "task_reply")
+
+        with mock.patch.dict(jobs.JOB_HANDLERS, handlers), self.assertLogs("core.services.jobs", "ERROR"):
+            done = run_job(claim_next_job())
+            failed = run_job(claim_next_job())
+
+        self.assertEqual((done.status, done.result), ("done", {"ok": True}))
+        self.assertEqual((failed.status, failed.error), ("failed", "boom"))
+        self.assertIsNotNone(failed.finished_at)
+
+    def test_requeues_jobs_without_heartbeat(self):
+        enqueue(self.user, "sync_all")
+        enqueue(self.user, "sync_all")
+        dead, alive = claim_next_job(), claim_next_job()
+        # a worker that crashed a few minutes ago, however recently it started
+        BackgroundJob.objects.filter(pk=dead.pk).update(heartbeat_at=timezone.now() - timedelta(minutes=3))
+
+        self.assertEqual(requeue_stale_jobs(timedelta(minutes=2)), 1)
+        self.assertEqual(BackgroundJob.objects.get(pk=dead.pk).status, "pending")
+        self.assertEqual(BackgroundJob.objects.get(pk=alive.pk).status, "running")
+        self.assertEqual(claim_next_job().pk, dead.pk)
+
+    def test_requeues_jobs_claimed_before_heartbeats(self):
+        enqueue(self.user, "sync_all")
+        job = claim_next_job()
+        BackgroundJob.objects.filter(pk=job.pk).update(
+            heartbeat_at=None, started_at=timezone.now() - timedelta(minutes=3)
+        )
+
+        self.assertEqual(requeue_stale_jobs(timedelta(minutes=2)), 1)
+
+
+class EnqueueDedupeTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("carol")
+
+    def test_same_key_shares_the_active_job(self):
+        first = enqueue(self.user, "sync_all", dedupe_key="sync_all:1")
+        self.assertEqual(enqueue(self.user, "sync_all", dedupe_key="sync_all:1").pk, first.pk)
+        self.assertNotEqual(enqueue(self.user, "sync_all", dedupe_key="sync_all:2").pk, first.pk)
+
+        # still shared while it runs
+        claim_next_job()
+        self.assertEqual(enqueue(self.user, "sync_all", dedupe_key="sync_all:1").pk, first.pk)
+
+    def test_finished_job_frees_its_key(self):
+        first = enqueue(self.user, "sync_all", dedupe_key="sync_all:1")
+        with mock.patch.dict(jobs.JOB_HANDLERS, {"sync_all": lambda job: {}}):
+            run_job(claim_next_job())
+
+        second = enqueue(self.user, "sync_all", dedupe_key="sync_all:1")
+        self.assertNotEqual(second.pk, first.pk)
+        self.assertEqual(second.status, "pending")
+
+    def test_jobs_without_key_are_not_deduped(self):
+        enqueue(self.user, "task_reply", task_id=1)
+        enqueue(self.user, "task_reply", task_id=1)
+        self.assertEqual(BackgroundJob.objects.count(), 2)
+
+
+class HeartbeatTests(TransactionTestCase):
+    """The heartbeat thread writes through its own connection."""
+
+    def setUp(self):
+        self.user = User.objects.create_user("bob")
+
+    @override_settings(JOB_HEARTBEAT_INTERVAL=0.01)
+    def test_heartbeat_while_running(self):
+        enqueue(self.user, "sync_all")
+        job = claim_next_job()
+        BackgroundJob.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+
+        def handler(job):
+            # long enough for a few beats
+            time.sleep(0.1)
+            return {}
+
+        with mock.patch.dict(jobs.JOB_HANDLERS, {"sync_all": handler}):
+            job = run_job(job)
+
+        self.assertGreater(
+            BackgroundJob.objects.get(pk=job.pk).heartbeat_at, timezone.now() - timedelta(minutes=1)
+        )
@@ -0,0 +1,63 @@
+from datetime import datetime, timezone as dt_timezone
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.models import BackgroundJob, LeaderboardEntry, UserStats
+from core.services import leaderboard
+from core.services.leaderboard import refresh_leaderboard, request_leaderboard_refresh
+
+
+class RefreshLeaderboardTests(TestCase):
+    def setUp(self):
+        for name, xp in [("ann", 300), ("bob", 200), ("cat", 200), ("dan", 50), ("eve", 0)]:
+            UserStats.objects.create(user=User.objects.create_user(name), total_xp=xp)
+
+    def ranks(self):
+        return list(LeaderboardEntry.objects.order_by("rank", "user_id").values_list("user__username", "rank"))
+
+    def test_ties_share_a_rank(self):
+        with mock.patch.object(leaderboard, "INSERT_BATCH", 2):
+            self.assertEqual(refresh_leaderboard(), 4)
+
+        self.assertEqual(self.ranks(), [("ann", 1), ("bob", 2), ("cat", 2), ("dan", 4)])
+
+    def test_refresh_replaces_every_row(self):
+        refresh_leaderboard()
+        UserStats.objects.filter(user__username="dan").update(total_xp=900)
+        UserStats.objects.filter(user__username="ann").update(total_xp=0)
+
+        refresh_leaderboard()
+
+        self.assertEqual(self.ranks(), [("dan", 1), ("bob", 2), ("cat", 2)])
+
+    def test_page_reads_the_entries(self):
+        refresh_leaderboard()
+        self.client.force_login(User.objects.get(username="cat"))
+
+        response = self.client.get(reverse("leaderboard"))
+
+        self.assertEqual([entry.rank for entry in response.context["page"]], [1, 2, 2, 4])
+        self.assertEqual(response.context["mine"].rank, 2)
+
+
+@override_settings(LEADERBOARD_REFRESH_DELAY=30)
+class RefreshRequestTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("ann")
+
+    def _request_at(self, seconds):
+        now = datetime.fromtimestamp(seconds, tz=dt_timezone.utc)
+        with mock.patch.object(leaderboard.timezone, "now", return_value=now):
+            return request_leaderboard_refresh(self.user)
+
+    def test_one_job_per_window(self):
+        first = self._request_at(3000)
+        self.assertEqual(self._request_at(3029).pk, first.pk)
+        self.assertEqual(first.run_after, datetime.fromtimestamp(3030, tz=dt_timezone.utc))
+
+        later = self._request_at(3030)
+        self.assertNotEqual(later.pk, first.pk)
+        self.assertEqual(BackgroundJob.objects.filter(kind="refresh_leaderboard").count(), 2)
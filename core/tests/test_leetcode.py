@@ -0,0 +1,30 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from core.benchmarks.standin import PlatformStandin
+from core.services import leetcode
+from core.services.leetcode import get_leetcode_stats, get_leetcode_stats_bulk
+
+
+class BulkGraphQLTests(SimpleTestCase):
+    def test_aliases_parse_like_single_queries(self):
+        usernames = ["ann", "missing-bob", "cat"]
+
+        with PlatformStandin() as standin, override_settings(PLATFORM_URLS=standin.platform_urls()):
+            bulk = get_leetcode_stats_bulk(usernames, batch_size=2)
+            single = get_leetcode_stats("ann")
+
+        self.assertEqual(standin.requests[("leetcode", 200)], 3)
+        self.assertEqual(set(bulk), set(usernames))
+        # a null alias only affects its own user
+        self.assertIsNone(bulk["missing-bob"])
+        self.assertEqual(bulk["ann"], single)
+        self.assertEqual(bulk["cat"], single)
+
+    def test_batch_without_data_raises(self):
+        failed = mock.Mock(**{"json.return_value": {"data": None, "errors": [{"message": "rate limited"}]}})
+
+        with mock.patch.object(leetcode.http_client, "post", return_value=failed):
+            with self.assertRaisesMessage(Exception, "rate limited"):
+                get_leetcode_stats_bulk(["ann"])
@@ -0,0 +1,45 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from core.benchmarks.standin import Recordings
+from core.services.codechef import parse_codechef_html
+from core.services.github import parse_github_calendar, parse_github_contributions
+from core.services.hackerrank import parse_hackerrank_html
+
+
+class ProfileParserTests(SimpleTestCase):
+    """The XPath parsers read the counters off the saved profile pages."""
+
+    recordings = Recordings()
+
+    def test_codechef(self):
+        html = self.recordings.text("codechef_profile.html")
+        self.assertEqual(parse_codechef_html(html), {"solved": 412, "rating": 1789, "contests": 48})
+
+    def test_github_contributions_and_calendar(self):
+        html = self.recordings.text("github_contributions.html")
+        calendar = parse_github_calendar(html)
+
+        self.assertEqual(parse_github_contributions(html), 2294)
+        self.assertEqual(calendar["total"], 2294)
+        self.assertEqual(len(calendar["days"]), 371)
+        self.assertEqual(calendar["days"]["2024-11-05"], 12)
+
+    def test_hackerrank(self):
+        self.assertEqual(parse_hackerrank_html(self.recordings.text("hackerrank_profile.html")), 187)
+
+    def test_pages_without_the_counters(self):
+        html = "<html><body><p>Maintenance</p></body></html>"
+        self.assertIsNone(parse_hackerrank_html(html))
+        self.assertEqual(parse_github_contributions(html), 0)
+
+
+class BenchParsersTests(SimpleTestCase):
+    def test_reports_every_parser(self):
+        out = StringIO()
+        call_command("bench_parsers", iterations=1, stdout=out)
+
+        for name in ["codechef", "github contributions", "github calendar", "hackerrank"]:
+            self.assertIn(name, out.getvalue())
@@ -0,0 +1,59 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.models import UserStats
+from core.services.rank_index import RankIndex
+
+
+class RankIndexTests(TestCase):
+    def setUp(self):
+        # user id -> total_xp; 3 and 4 tie
+        self.xp = {1: 500, 2: 300, 3: 200, 4: 200, 5: 50}
+        for user_id, xp in self.xp.items():
+            user = User.objects.create(pk=user_id, username=f"ranked{user_id}")
+            UserStats.objects.create(user=user, total_xp=xp)
+        User.objects.create(pk=6, username="unranked")
+        UserStats.objects.create(user_id=6, total_xp=0)
+        self.index = RankIndex()
+
+    def test_rank_counts_users_above(self):
+        ranks = {user_id: self.index.rank(user_id) for user_id in self.xp}
+        self.assertEqual(ranks, {1: 1, 2: 2, 3: 3, 4: 3, 5: 5})
+        self.assertIsNone(self.index.rank(6))
+        self.assertEqual(self.index.size(), 5)
+
+    def test_neighbours(self):
+        self.assertEqual(
+            self.index.neighbours(3, count=1),
+            [(2, 2, 300), (3, 3, 200), (3, 4, 200)],
+        )
+        self.assertEqual(self.index.neighbours(1, count=1), [(1, 1, 500), (2, 2, 300)])
+        self.assertEqual(self.index.neighbours(6), [])
+
+    def test_set_moves_and_drops_users(self):
+        self.index.rank(1)
+        self.index.set(5, 1000)
+        self.index.set(2, 0)
+
+        self.assertEqual(self.index.rank(5), 1)
+        self.assertEqual(self.index.rank(1), 2)
+        self.assertIsNone(self.index.rank(2))
+        self.assertEqual(self.index.size(), 4)
+
+    def test_refresh_rereads_totals(self):
+        self.index.rank(1)
+        UserStats.objects.filter(user_id=3).update(total_xp=900)
+        self.index.refresh([3])
+
+        self.assertEqual(self.index.rank(3), 1)
+        self.assertEqual(self.index.rank(4), 4)
+
+    @override_settings(RANK_INDEX_SYNC_INTERVAL=0)
+    def test_catches_up_with_other_processes(self):
+        self.index.rank(1)
+        # a job worker's write: this process's index wasn't told
+        UserStats.objects.filter(user_id=5).update(total_xp=700, last_updated=timezone.now())
+
+        self.assertEqual(self.index.rank(5), 1)
+        self.assertEqual(self.index.rank(1), 2)
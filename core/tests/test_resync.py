@@ -0,0 +1,64 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from core.benchmarks.standin import PlatformStandin
+from core.models import PlatformStats
+from core.services.freshness import claim_accounts
+from core.tests.factories import make_account
+
+
+class ResyncAllTests(TestCase):
+    def setUp(self):
+        self.accounts = [
+            make_account("leetcode", username="ann"),
+            make_account("leetcode", username="missing-bob"),
+            make_account("codechef", username="cat"),
+            make_account("hackerrank", username="dan"),
+        ]
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        self.checkpoint = Path(workdir.name) / "checkpoint.json"
+
+    def _resync(self, **options):
+        out, err = StringIO(), StringIO()
+        with PlatformStandin() as standin, override_settings(PLATFORM_URLS=standin.platform_urls()):
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command(
+                    "resync_all", checkpoint=str(self.checkpoint), chunk_size=2,
+                    stdout=out, stderr=err, **options,
+                )
+        return out.getvalue(), err.getvalue()
+
+    def synced(self):
+        return set(PlatformStats.objects.values_list("user__platform_accounts__username", flat=True))
+
+    def test_resyncs_everything_but_claimed_and_missing_accounts(self):
+        held = self.accounts[3]
+        claim_accounts([held])
+
+        out, err = self._resync()
+
+        self.assertEqual(self.synced(), {"ann", "cat"})
+        self.assertIn("leetcode:missing-bob", err)
+        self.assertIn("1 fresh/skipped, 1 errors", out)
+        self.assertFalse(self.checkpoint.exists())
+
+    def test_resumes_after_the_checkpoint(self):
+        self.checkpoint.write_text(json.dumps({"last_pk": self.accounts[1].pk}))
+
+        out, _ = self._resync()
+
+        self.assertIn(f"Resuming after account #{self.accounts[1].pk}", out)
+        self.assertEqual(self.synced(), {"cat", "dan"})
+
+    def test_restart_ignores_the_checkpoint(self):
+        self.checkpoint.write_text(json.dumps({"last_pk": self.accounts[-1].pk}))
+
+        self._resync(restart=True, platform=["leetcode"])
+
+        self.assertEqual(self.synced(), {"ann"})
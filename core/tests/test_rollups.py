@@ -0,0 +1,78 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models import XPRollup
+from core.services.rollups import credit_rollups, period_leaderboard, period_rank, period_start
+from core.services.snapshots import record_sync
+from core.services.stats import stats_row
+from core.tests.factories import make_account, make_platform
+
+
+class PeriodTests(TestCase):
+    def test_period_start(self):
+        sunday = date(2026, 10, 18)
+        self.assertEqual(period_start("week", sunday), date(2026, 10, 12))
+        self.assertEqual(period_start("month", sunday), date(2026, 10, 1))
+
+    def test_week_spanning_two_months(self):
+        user = User.objects.create_user("ann")
+        leetcode = make_platform("leetcode")
+        credit_rollups(user.pk, leetcode.pk, date(2026, 9, 30), 10)
+        credit_rollups(user.pk, leetcode.pk, date(2026, 10, 1), 5)
+        credit_rollups(user.pk, leetcode.pk, date(2026, 10, 2), 0)
+
+        self.assertEqual(
+            sorted(XPRollup.objects.values_list("period", "start", "xp")),
+            [
+                ("month", date(2026, 9, 1), 10),
+                ("month", date(2026, 10, 1), 5),
+                ("week", date(2026, 9, 28), 15),
+            ],
+        )
+
+
+class PeriodLeaderboardTests(TestCase):
+    def setUp(self):
+        self.leetcode = make_platform("leetcode")
+        self.gfg = make_platform("gfg")
+        self.day = date(2026, 10, 14)
+        self.week = period_start("week", self.day)
+        for name, xp in [("ann", 40), ("bob", 90), ("cat", 40), ("dan", 0)]:
+            user = User.objects.create_user(name)
+            credit_rollups(user.pk, self.leetcode.pk, self.day, xp)
+        # other boards: another platform, and the week before
+        credit_rollups(User.objects.get(username="dan").pk, self.gfg.pk, self.day, 500)
+        credit_rollups(User.objects.get(username="ann").pk, self.leetcode.pk, date(2026, 10, 1), 500)
+
+    def test_board_ranks_with_ties(self):
+        board = period_leaderboard(self.leetcode, "week", self.week)
+
+        self.assertEqual(
+            [(row.user.username, row.xp, row.rank) for row in board],
+            [("bob", 90, 1), ("ann", 40, 2), ("cat", 40, 2)],
+        )
+
+    def test_period_rank_matches_the_board(self):
+        for row in period_leaderboard(self.leetcode, "week", self.week):
+            self.assertEqual(period_rank(row), row.rank)
+        self.assertIsNone(period_rank(None))
+
+
+class SnapshotRollupTests(TestCase):
+    def test_sync_deltas_are_credited(self):
+        account = make_account("hackerrank", last_synced=timezone.now())
+
+        def sync(solved):
+            with self.captureOnCommitCallbacks(execute=True):
+                record_sync(account, {"solved": solved}, stats_row(solved, solved * 6))
+
+        sync(10)
+        # the first snapshot is a baseline, not activity
+        self.assertFalse(XPRollup.objects.exists())
+
+        sync(12)
+        sync(15)
+        self.assertEqual(dict(XPRollup.objects.values_list("period", "xp")), {"week": 30, "month": 30})
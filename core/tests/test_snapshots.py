@@ -0,0 +1,78 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from core.benchmarks.standin import PlatformStandin
+from core.models import PlatformSnapshot, PlatformStats, UserStats
+from core.services import snapshots
+from core.services.snapshots import record_sync
+from core.services.stats import stats_row
+from core.services.sync import fetch_account, save_account, sync_platform
+from core.tests.factories import make_account
+
+
+class RecordSyncTests(TestCase):
+    def setUp(self):
+        self.account = make_account("hackerrank")
+
+    def _sync(self, solved):
+        data = {"solved": solved}
+        with self.captureOnCommitCallbacks(execute=True):
+            return record_sync(self.account, data, stats_row(solved, solved * 6))
+
+    def test_snapshot_only_on_change(self):
+        self.assertTrue(self._sync(10))
+        self.assertFalse(self._sync(10))
+        self.assertTrue(self._sync(12))
+
+        self.assertEqual(
+            list(PlatformSnapshot.objects.order_by("pk").values_list("solved", flat=True)), [10, 12]
+        )
+        self.assertEqual(UserStats.objects.get(user=self.account.user).total_xp, 72)
+
+    def test_failed_stats_write_rolls_back_the_snapshot(self):
+        with mock.patch.object(snapshots, "update_platform_stats", side_effect=RuntimeError("db")):
+            with self.assertRaises(RuntimeError):
+                self._sync(10)
+
+        self.assertFalse(PlatformSnapshot.objects.exists())
+        self.assertTrue(self._sync(10))
+
+
+class StandinSyncTests(TestCase):
+    """Syncs against the offline stand-in store stats once per change."""
+
+    def test_resync_without_changes_keeps_totals(self):
+        account = make_account("hackerrank")
+        user = account.user
+
+        with PlatformStandin() as standin, override_settings(PLATFORM_URLS=standin.platform_urls()):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertTrue(save_account(account, fetch_account(account)))
+            first = UserStats.objects.get(user=user).total_xp
+
+            account.refresh_from_db()
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertFalse(save_account(account, fetch_account(account)))
+
+        self.assertGreater(first, 0)
+        self.assertEqual(UserStats.objects.get(user=user).total_xp, first)
+        self.assertEqual(PlatformStats.objects.get(user=user).xp, first)
+
+    def test_sync_platform_goes_through_save_account(self):
+        account = make_account("codechef")
+
+        with PlatformStandin() as standin, override_settings(PLATFORM_URLS=standin.platform_urls()):
+            with self.captureOnCommitCallbacks(execute=True):
+                first = sync_platform(account.user, "codechef")
+            second = sync_platform(account.user, "codechef")
+
+        self.assertNotIn("unchanged", first)
+        self.assertEqual(PlatformStats.objects.get(user=account.user).xp, first["xp"])
+        # the stored validators answered the second fetch
+        self.assertEqual(second, {"unchanged": True})
+
+        account.refresh_from_db()
+        self.assertIsNotNone(account.last_synced)
+        self.assertTrue(account.http_cache)
+        self.assertIsNone(account.sync_claimed_until)
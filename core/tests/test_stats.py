@@ -0,0 +1,119 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.db.models import Sum
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from core.models import PlatformStats, UserStats
+from core.services.stats import clear_platform_stats, stats_row, update_platform_stats
+from core.tests.factories import make_platform
+
+
+class StatsTotalsTests(TestCase):
+    """UserStats totals move by each write's change and match the rows."""
+
+    def setUp(self):
+        self.user = User.objects.create_user("alice")
+        self.leetcode = make_platform("leetcode")
+        self.gfg = make_platform("gfg")
+
+    def _write(self, rows):
+        with self.captureOnCommitCallbacks(execute=True):
+            update_platform_stats(self.user, rows)
+
+    def _clear(self, slug):
+        with self.captureOnCommitCallbacks(execute=True):
+            clear_platform_stats(self.user, slug)
+
+    def assertTotalsMatchRows(self):
+        stats = UserStats.objects.get(user=self.user)
+        rows = PlatformStats.objects.filter(user=self.user).aggregate(xp=Sum("xp"), solved=Sum("solved"))
+        self.assertEqual(stats.total_xp, rows["xp"] or 0)
+        self.assertEqual(stats.total_problems, rows["solved"] or 0)
+        return stats
+
+    def test_first_write_creates_totals(self):
+        self._write({self.leetcode.pk: stats_row(10, 100, easy=10)})
+
+        stats = self.assertTotalsMatchRows()
+        self.assertEqual((stats.total_xp, stats.total_problems), (100, 10))
+
+    def test_repeated_syncs_apply_only_the_change(self):
+        self._write({self.leetcode.pk: stats_row(10, 100)})
+        self._write({self.leetcode.pk: stats_row(10, 100)})
+        self._write({self.leetcode.pk: stats_row(12, 130), self.gfg.pk: stats_row(5, 25)})
+        self._write({self.leetcode.pk: stats_row(11, 120)})
+
+        stats = self.assertTotalsMatchRows()
+        self.assertEqual((stats.total_xp, stats.total_problems), (145, 16))
+
+    def test_cleared_platform_leaves_totals(self):
+        self._write({self.leetcode.pk: stats_row(10, 100), self.gfg.pk: stats_row(5, 25)})
+        self._clear("leetcode")
+        self._clear("leetcode")
+
+        stats = self.assertTotalsMatchRows()
+        self.assertEqual((stats.total_xp, stats.total_problems), (25, 5))
+
+        self._write({self.leetcode.pk: stats_row(3, 30)})
+        stats = self.assertTotalsMatchRows()
+        self.assertEqual(stats.total_xp, 55)
+
+    def test_totals_written_in_one_statement(self):
+        self._write({self.leetcode.pk: stats_row(10, 100)})
+
+        # the write itself, not the rank/leaderboard callbacks run on commit
+        with self.captureOnCommitCallbacks(execute=True), CaptureQueriesContext(connection) as queries:
+            update_platform_stats(self.user, {self.leetcode.pk: stats_row(40, 450)})
+
+        userstats = [q["sql"] for q in queries if UserStats._meta.db_table in q["sql"]]
+        self.assertEqual(len(userstats), 1, userstats)
+        stats = self.assertTotalsMatchRows()
+        self.assertEqual(stats.level, 4)
+
+    @override_settings(XP_FORMULA_VERSION=2)
+    def test_write_stamps_formula_version(self):
+        self._write({self.leetcode.pk: stats_row(1, 10)})
+
+        row = PlatformStats.objects.get(user=self.user, platform=self.leetcode)
+        self.assertEqual(row.formula_version, 2)
+        self.assertTrue(row.complete)
+
+
+class CopyPlatformColumnsMigrationTests(TransactionTestCase):
+    """0036 copies the UserStats columns into PlatformStats rows."""
+
+    before = [("core", "0035_userstats_generated_level")]
+    after = [("core", "0036_platformstats")]
+
+    def _migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self._migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_copies_platform_columns(self):
+        apps = self._migrate(self.before)
+        user = apps.get_model("auth", "User").objects.create(username="erin")
+        for slug in ["leetcode", "github", "hackerrank"]:
+            apps.get_model("core", "Platform").objects.create(slug=slug, name=slug.title())
+        apps.get_model("core", "UserStats").objects.create(
+            user=user,
+            leetcode_solved=30, leetcode_xp=300, leetcode_easy=10, leetcode_medium=15, leetcode_hard=5,
+            github_xp=95, github_repos=3, total_commits=10,
+        )
+
+        apps = self._migrate(self.after)
+        rows = {
+            row.platform.slug: row
+            for row in apps.get_model("core", "PlatformStats").objects.select_related("platform")
+        }
+        self.assertEqual(set(rows), {"leetcode", "github"})
+        self.assertEqual((rows["leetcode"].solved, rows["leetcode"].xp), (30, 300))
+        self.assertEqual(rows["leetcode"].extra, {"easy": 10, "medium": 15, "hard": 5})
+        self.assertEqual(rows["github"].extra, {"repos": 3, "contributions": 10})
+
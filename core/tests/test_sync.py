@@ -0,0 +1,63 @@
+import threading
+import time
+from unittest import mock
+
+from django.db.models import Sum
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from core.benchmarks.standin import PlatformStandin
+from core.models import PlatformAccount, PlatformStats, UserStats
+from core.services import sync
+from core.services.sync import sync_all_platforms
+from core.tests.factories import make_account
+
+
+class SyncAllPlatformsTests(TestCase):
+    def test_fetches_every_platform_and_writes_totals_once(self):
+        account = make_account("leetcode")
+        for slug in ["codechef", "hackerrank"]:
+            make_account(slug, user=account.user)
+
+        with PlatformStandin() as standin, override_settings(PLATFORM_URLS=standin.platform_urls()):
+            with self.captureOnCommitCallbacks(execute=True):
+                result = sync_all_platforms(account.user)
+
+        self.assertEqual(set(result["synced"]), {"leetcode", "codechef", "hackerrank"})
+        self.assertEqual((result["failed"], result["busy"]), ({}, []))
+        totals = PlatformStats.objects.filter(user=account.user).aggregate(xp=Sum("xp"))
+        self.assertEqual(UserStats.objects.get(user=account.user).total_xp, totals["xp"])
+        self.assertFalse(
+            PlatformAccount.objects.filter(user=account.user, sync_claimed_until__isnull=False).exists()
+        )
+
+
+class TimedOutFetchTests(TransactionTestCase):
+    """A fetch past its timeout keeps its account claimed until it returns."""
+
+    def test_claim_held_until_fetch_returns(self):
+        account = make_account("leetcode")
+        proceed, returned = threading.Event(), threading.Event()
+
+        def slow(account):
+            proceed.wait(5)
+            returned.set()
+            return None
+
+        def claimed():
+            return PlatformAccount.objects.get(pk=account.pk).sync_claimed_until is not None
+
+        with mock.patch.dict(sync.PLATFORM_FETCHERS, {"leetcode": slow}), \
+                override_settings(SYNC_TIMEOUTS={"leetcode": 0.05}):
+            result = sync_all_platforms(account.user)
+            self.assertIn("leetcode", result["failed"])
+            self.assertTrue(claimed())
+            self.assertEqual(sync_all_platforms(account.user)["busy"], ["leetcode"])
+
+            proceed.set()
+            returned.wait(5)
+            for _ in range(50):
+                if not claimed():
+                    break
+                time.sleep(0.02)
+            self.assertFalse(claimed())
+            self.assertFalse(PlatformStats.objects.filter(user=account.user).exists())
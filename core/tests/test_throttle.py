@@ -0,0 +1,111 @@
+import time
+
+from django.test import TestCase, override_settings
+
+from core.benchmarks.standin import PlatformStandin
+from core.models import ExternalHost
+from core.services import throttle
+from core.services.gfg import get_gfg_stats
+from core.services.hackerrank import get_hackerrank_stats
+from core.services.throttle import CircuitOpen, RateLimited
+
+HOST = "upstream.example"
+
+
+@override_settings(
+    HOST_LIMITS={HOST: {"rate": 0.001, "burst": 2}},
+    CIRCUIT_FAILURE_THRESHOLD=3,
+    CIRCUIT_COOLDOWN=60,
+)
+class CircuitBreakerTests(TestCase):
+    def _fail(self, times):
+        # as http_client.request does: the circuit check creates the row
+        throttle.check_circuit(HOST)
+        for _ in range(times):
+            throttle.record_failure(HOST)
+
+    def test_opens_after_threshold_failures(self):
+        self._fail(2)
+        throttle.check_circuit(HOST)
+
+        throttle.record_failure(HOST)
+        with self.assertRaises(CircuitOpen):
+            throttle.check_circuit(HOST)
+
+    def test_single_probe_after_cooldown_then_closes(self):
+        self._fail(3)
+        ExternalHost.objects.filter(host=HOST).update(opened_until=time.time() - 1)
+
+        throttle.check_circuit(HOST)
+        with self.assertRaises(CircuitOpen):
+            # the probe is in flight: everyone else still fails fast
+            throttle.check_circuit(HOST)
+
+        throttle.record_success(HOST)
+        throttle.check_circuit(HOST)
+        self.assertEqual(ExternalHost.objects.get(host=HOST).failures, 0)
+
+    def test_failed_probe_reopens(self):
+        self._fail(3)
+        ExternalHost.objects.filter(host=HOST).update(opened_until=time.time() - 1)
+
+        throttle.check_circuit(HOST)
+        throttle.record_failure(HOST)
+        self.assertGreater(ExternalHost.objects.get(host=HOST).opened_until, time.time() + 30)
+
+    def test_unguarded_hosts_are_left_alone(self):
+        for _ in range(10):
+            throttle.record_failure("elsewhere.example")
+        throttle.check_circuit("elsewhere.example")
+        self.assertFalse(ExternalHost.objects.filter(host="elsewhere.example").exists())
+
+
+@override_settings(HOST_LIMITS={HOST: {"rate": 0.001, "burst": 2}})
+class TokenBucketTests(TestCase):
+    def test_burst_then_rate_limited(self):
+        throttle.acquire_token(HOST, max_wait=0)
+        throttle.acquire_token(HOST, max_wait=0)
+        with self.assertRaises(RateLimited):
+            throttle.acquire_token(HOST, max_wait=0)
+
+    def test_refills_with_time(self):
+        throttle.acquire_token(HOST, max_wait=0)
+        throttle.acquire_token(HOST, max_wait=0)
+        # 1000s at 0.001 tokens/s is one token; the burst caps the rest
+        ExternalHost.objects.filter(host=HOST).update(refilled_at=time.time() - 1000)
+
+        throttle.acquire_token(HOST, max_wait=0)
+        with self.assertRaises(RateLimited):
+            throttle.acquire_token(HOST, max_wait=0)
+
+
+class OpenCircuitFailsFastTests(TestCase):
+    """Strategy loops don't fall through to the next strategy on an open circuit."""
+
+    def _open(self, host):
+        ExternalHost.objects.create(
+            host=host, failures=5, opened_until=time.time() + 60, tokens=5, refilled_at=time.time()
+        )
+
+    def test_hackerrank(self):
+        with PlatformStandin() as standin, override_settings(
+            PLATFORM_URLS=standin.platform_urls(),
+            HOST_LIMITS={"127.0.0.1": {"rate": 100, "burst": 100}},
+            CIRCUIT_FAILURE_THRESHOLD=5,
+        ):
+            self._open("127.0.0.1")
+            with self.assertRaises(CircuitOpen):
+                get_hackerrank_stats("bench1", cache={})
+        self.assertEqual(sum(standin.requests.values()), 0)
+
+    def test_gfg_skips_the_browser(self):
+        with PlatformStandin() as standin, override_settings(
+            PLATFORM_URLS=standin.platform_urls(),
+            HOST_LIMITS={"127.0.0.1": {"rate": 100, "burst": 100}},
+            CIRCUIT_FAILURE_THRESHOLD=5,
+            BROWSER_SERVICE_URL="",
+        ):
+            self._open("127.0.0.1")
+            with self.assertRaises(CircuitOpen):
+                get_gfg_stats("bench1")
+        self.assertEqual(sum(standin.requests.values()), 0)
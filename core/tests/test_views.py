@@ -0,0 +1,59 @@
+from asgiref.sync import iscoroutinefunction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core import views
+from core.models import BackgroundJob, Task
+from core.tests.factories import make_account
+
+
+class QueuedViewsTests(TestCase):
+    """Without SYNC_INLINE (WSGI) the sync and AI views stay synchronous."""
+
+    def setUp(self):
+        self.account = make_account("leetcode")
+        self.client.force_login(self.account.user)
+
+    def test_views_are_sync(self):
+        for view in [views.task_detail, views.task_need_help, views.start_learning,
+                     views.sync_all, views.sync_github, views.leetcode_sync, views.gfg_sync,
+                     views.codechef_sync, views.hackerrank_sync]:
+            self.assertFalse(iscoroutinefunction(view), view)
+
+    def test_platform_sync_queues_one_job(self):
+        for _ in range(2):
+            response = self.client.get(reverse("leetcode_sync"))
+            self.assertRedirects(response, reverse("profile"), fetch_redirect_response=False)
+
+        job = BackgroundJob.objects.get()
+        self.assertEqual((job.kind, job.status), ("sync_leetcode", "pending"))
+
+    def test_fresh_platform_is_not_queued(self):
+        self.account.last_synced = timezone.now()
+        self.account.save(update_fields=["last_synced"])
+
+        self.client.get(reverse("leetcode_sync"))
+        self.assertFalse(BackgroundJob.objects.exists())
+
+    def test_task_message_queues_reply(self):
+        task = Task.objects.create(user=self.account.user, title="Graphs")
+
+        self.client.post(reverse("task_detail", args=[task.id]), {"message": "hint?"})
+
+        job = BackgroundJob.objects.get()
+        self.assertEqual((job.kind, job.payload["message"]), ("task_reply", "hint?"))
+        self.assertEqual(task.messages.get().content, "hint?")
+
+
+class InlineTwinTests(TestCase):
+    def test_picks_async_view_only_with_sync_inline(self):
+        async def inline(request):
+            pass
+
+        def queued(request):
+            pass
+
+        self.assertIs(views._inline_twin(inline)(queued), queued)
+        with override_settings(SYNC_INLINE=True):
+            self.assertIs(views._inline_twin(inline)(queued), inline)
@@ -0,0 +1,150 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from core.models import PlatformStats, UserStats
+from core.services.stats import stats_row, update_platform_stats
+from core.services.xp import (
+    XP_FORMULAS, counters_read, describe, platform_xp, rescorable, xp_expression,
+)
+from core.tests.factories import make_platform
+
+
+class XPFormulaTests(TestCase):
+    def test_platform_xp_matches_sql_expression(self):
+        user = User.objects.create_user("carol")
+        platforms = {}
+        counters = {
+            "github": {"repos": 3, "contributions": 40},
+            "leetcode": {"solved": 30, "easy": 10, "medium": 15, "hard": 5, "contests": 2, "rating": 1555},
+            "gfg": {"solved": 12, "score": 40},
+            "codechef": {"solved": 20, "contests": 3, "rating": 1480},
+            "hackerrank": {"solved": 9},
+        }
+        for slug, values in counters.items():
+            platform = make_platform(slug)
+            platforms[platform.pk] = slug
+            extra = {key: value for key, value in values.items() if key != "solved"}
+            PlatformStats.objects.create(
+                user=user, platform=platform, solved=values.get("solved", 0), extra=extra
+            )
+
+        for version in XP_FORMULAS:
+            stored = dict(
+                PlatformStats.objects.annotate(rescored=xp_expression(platforms, version))
+                .values_list("platform__slug", "rescored")
+            )
+            expected = {slug: platform_xp(slug, values, version) for slug, values in counters.items()}
+            self.assertEqual(stored, expected, f"version {version}")
+
+    def test_missing_counters_count_as_zero(self):
+        self.assertEqual(platform_xp("hackerrank", {}), 0)
+        self.assertEqual(platform_xp("leetcode", {"rating": 1200}, version=1), 0)
+        self.assertEqual(platform_xp("codeforces", {"solved": 50}), 0)
+
+    def test_rating_term(self):
+        self.assertEqual(platform_xp("leetcode", {"rating": 1400}, version=1), 100 ** 2 // 10)
+        self.assertEqual(platform_xp("codechef", {"rating": 1300}, version=1), 100)
+        self.assertEqual(platform_xp("codechef", {"rating": 1300}, version=2), 100 ** 2 // 10)
+
+    def test_describe(self):
+        self.assertEqual(describe("hackerrank", 1), "problems solved × 6")
+        self.assertEqual(
+            describe("leetcode", 2), "problems solved × 10 + contests × 50 + (rating − 1300)² ÷ 10"
+        )
+        self.assertEqual(describe("codeforces", 1), "0")
+
+    def test_counters_read(self):
+        self.assertEqual(counters_read("leetcode", 2), {"solved", "contests", "rating"})
+        self.assertEqual(counters_read("gfg", 1), {"score", "solved"})
+
+    def test_rescorable_skips_incomplete_rows_missing_counters(self):
+        user = User.objects.create_user("dave")
+        leetcode = make_platform("leetcode")
+        hackerrank = make_platform("hackerrank")
+        copied = PlatformStats.objects.create(
+            user=user, platform=leetcode, extra={"easy": 1, "medium": 0, "hard": 0}, complete=False
+        )
+        PlatformStats.objects.create(user=user, platform=hackerrank, complete=False)
+        platforms = {leetcode.pk: "leetcode", hackerrank.pk: "hackerrank"}
+
+        eligible = PlatformStats.objects.filter(rescorable(platforms, version=1))
+        self.assertEqual(set(eligible.values_list("platform__slug", flat=True)), {"hackerrank"})
+
+        copied.extra.update(contests=0, rating=0)
+        copied.save()
+        self.assertEqual(eligible.count(), 2)
+
+
+class RecomputeXPTests(TestCase):
+    COUNTERS = {"solved": 20, "contests": 3, "rating": 1480}
+
+    def setUp(self):
+        self.user = User.objects.create_user("frank")
+        codechef = make_platform("codechef")
+        extra = {"contests": 3, "rating": 1480}
+        with override_settings(XP_FORMULA_VERSION=1), self.captureOnCommitCallbacks(execute=True):
+            update_platform_stats(self.user, {
+                codechef.pk: stats_row(20, platform_xp("codechef", self.COUNTERS, 1), **extra)
+            })
+
+    def _recompute(self, **options):
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("recompute_xp", stdout=StringIO(), **options)
+
+    @override_settings(XP_FORMULA_VERSION=2)
+    def test_rescores_rows_and_rebuilds_totals(self):
+        self._recompute()
+
+        row = PlatformStats.objects.get(user=self.user)
+        self.assertEqual((row.xp, row.formula_version), (platform_xp("codechef", self.COUNTERS, 2), 2))
+        self.assertEqual(UserStats.objects.get(user=self.user).total_xp, row.xp)
+
+    def test_dry_run_and_version_guard(self):
+        stored = PlatformStats.objects.get(user=self.user).xp
+
+        self._recompute(formula=2, dry_run=True)
+        self.assertEqual(PlatformStats.objects.get(user=self.user).xp, stored)
+
+        with self.assertRaisesMessage(CommandError, "XP_FORMULA_VERSION=1"):
+            self._recompute(formula=2)
+
+
+class MarkCopiedRowsMigrationTests(TransactionTestCase):
+    """0043 flags PlatformStats rows missing counters their fetcher reports."""
+
+    before = [("core", "0042_xpdistribution")]
+    after = [("core", "0043_platformstats_complete")]
+
+    def _migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self._migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_marks_rows_copied_from_userstats(self):
+        apps = self._migrate(self.before)
+        user = apps.get_model("auth", "User").objects.create(username="erin")
+        Platform = apps.get_model("core", "Platform")
+        # as 0036 copied them: leetcode without rating and contests
+        extras = {
+            "leetcode": {"easy": 10, "medium": 15, "hard": 5},
+            "github": {"repos": 3, "contributions": 10},
+            "hackerrank": {},
+        }
+        for slug, extra in extras.items():
+            platform = Platform.objects.create(slug=slug, name=slug.title())
+            apps.get_model("core", "PlatformStats").objects.create(user=user, platform=platform, extra=extra)
+
+        apps = self._migrate(self.after)
+        complete = dict(
+            apps.get_model("core", "PlatformStats").objects.values_list("platform__slug", "complete")
+        )
+        self.assertEqual(complete, {"leetcode": False, "github": True, "hackerrank": True})
@@ -41,6 +41,13 @@ urlpatterns = [
     # ================= PROFILE =================
     path("profile/", views.profile, name="profile"),
 
+    # ================= LEADERBOARD =================
+    path("leaderboard/", views.leaderboard, name="leaderboard"),
+
+    # ================= SYNC ALL =================
+    path("sync/all/", views.sync_all, name="sync_all"),
+    path("jobs/<int:job_id>/", views.job_status_view, name="job_status"),
+
     # ================= GITHUB =================
     path("github/add/", views.add_github_username, name="add_github"),
     path("github/sync/", views.sync_github, name="github_sync"),
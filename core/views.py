@@ -1,7 +1,10 @@
-from django.shortcuts import render, redirect, get_object_or_404
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.shortcuts import render, redirect, get_object_or_404, aget_object_or_404
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
+from django.core.paginator import Paginator
 from django.utils import timezone
 from django.db.models import Sum
 from django.contrib import messages
@@ -14,7 +17,7 @@ logger = logging.getLogger(__name__)
 from .models import (
     Subject, Task, TaskMessage, Note, StudyStreak, LearningGoal,
     StudySession, Topic, Platform, PlatformAccount,
-    UserStats, DailyActivity, Resource
+    UserStats, PlatformStats, LeaderboardEntry, XPRollup, DailyActivity, Resource, BackgroundJob
 )
 
 from .forms import (
@@ -22,8 +25,17 @@ from .forms import (
     LearningGoalForm, StudySessionForm, GitHubUsernameForm
 )
 
-from core.services.groq import generate_goal_solution, generate_task_ai_reply
+from core.services.freshness import request_sync, request_sync_all, revalidate_stale
+from core.services.distribution import TOTAL, current_distribution, top_percent
+from core.services.groq import agenerate_goal_solution, agenerate_task_ai_reply
+from core.services.jobs import active_jobs, enqueue, job_status, store_task_reply
+from core.services.sync import async_sync_all_platforms
 from core.services.resources import seed_resources_by_goal
+from core.services.snapshots import week_start, xp_gained
+from core.services.xp import describe as describe_xp
+from core.services.rank_index import rank_index
+from core.services.rollups import PERIODS as ROLLUP_PERIODS, period_leaderboard, period_rank, period_start
+from core.services.stats import clear_platform_stats
 
 
 # ==================================================
@@ -143,62 +155,89 @@ def toggle_task(request, task_id):
     return redirect("tasks_hub")
 
 
+def _inline_twin(async_view):
+    """
+    Serve `async_view` in place of the decorated view when settings.SYNC_INLINE
+    is on (ASGI deployments). Chosen once at import, so under WSGI the queueing
+    view runs as plain sync code, without an async_to_sync hop per request.
+    """
+    def choose(view):
+        return async_view if settings.SYNC_INLINE else view
+    return choose
+
+
+def _task_help_prompt(task):
+    return (
+        f"User needs help with this task.\n\n"
+        f"Title: {task.title}\n"
+        f"Subject: {task.custom_subject or task.subject}\n"
+        f"Type: {task.get_task_type_display()}\n"
+        f"Deadline: {task.deadline or 'Not set'}\n"
+        f"Estimated hours: {task.estimated_hours or 'Not set'}"
+    )
+
+
+async def _reply_to_task_inline(task, message):
+    ai_reply = await agenerate_task_ai_reply(task, message)
+    await sync_to_async(store_task_reply)(task, ai_reply)
+
+
+async def _task_detail_inline(request, task_id):
+    user = await request.auser()
+    task = await aget_object_or_404(Task.objects.select_related("subject"), id=task_id, user=user)
+
+    if request.method == "POST":
+        user_msg = request.POST.get("message", "").strip()
+        if user_msg:
+            await TaskMessage.objects.acreate(task=task, sender="user", content=user_msg)
+            await _reply_to_task_inline(task, user_msg)
+
+        return redirect("task_detail", task_id=task.id)
+
+    return await sync_to_async(render)(request, "core/task_detail.html", {
+        "task": task,
+        "messages": task.messages.all(),
+        "pending_jobs": active_jobs(user, kind="task_reply", payload__task_id=task.id),
+    })
+
+
 @login_required
+@_inline_twin(_task_detail_inline)
 def task_detail(request, task_id):
     """View for task details and AI-assisted chat."""
-    task = get_object_or_404(Task, id=task_id, user=request.user)
+    task = get_object_or_404(Task.objects.select_related("subject"), id=task_id, user=request.user)
     chat_messages = task.messages.all()
 
     if request.method == "POST":
         user_msg = request.POST.get("message", "").strip()
         if user_msg:
             TaskMessage.objects.create(task=task, sender="user", content=user_msg)
-
-            try:
-                ai_reply = generate_task_ai_reply(task, user_msg)
-            except Exception as e:
-                logger.error(f"AI response failed for task {task_id}: {str(e)}", exc_info=True)
-                ai_reply = "AI is temporarily unavailable. Please try again later."
-                messages.error(request, "Could not generate AI response. Please check your API keys.")
-
-            TaskMessage.objects.create(task=task, sender="ai", content=ai_reply)
-            task.ai_solution = ai_reply
-            task.needs_help = False
-            task.save(update_fields=["ai_solution", "needs_help"])
+            enqueue(request.user, "task_reply", task_id=task.id, message=user_msg)
 
         return redirect("task_detail", task_id=task.id)
 
     return render(request, "core/task_detail.html", {
         "task": task,
         "messages": chat_messages,
+        "pending_jobs": active_jobs(request.user, kind="task_reply", payload__task_id=task.id),
     })
 
 
+async def _task_need_help_inline(request, task_id):
+    user = await request.auser()
+    task = await aget_object_or_404(Task.objects.select_related("subject"), id=task_id, user=user)
+    await _reply_to_task_inline(task, _task_help_prompt(task))
+    return redirect("task_detail", task_id=task.id)
+
+
 @login_required
+@_inline_twin(_task_need_help_inline)
 def task_need_help(request, task_id):
     """Generate AI assistance for a task."""
-    task = get_object_or_404(Task, id=task_id, user=request.user)
-
-    prompt = (
-        f"User needs help with this task.\n\n"
-        f"Title: {task.title}\n"
-        f"Subject: {task.custom_subject or task.subject}\n"
-        f"Type: {task.get_task_type_display()}\n"
-        f"Deadline: {task.deadline or 'Not set'}\n"
-        f"Estimated hours: {task.estimated_hours or 'Not set'}"
-    )
+    task = get_object_or_404(Task.objects.select_related("subject"), id=task_id, user=request.user)
 
-    try:
-        ai_reply = generate_task_ai_reply(task, prompt)
-    except Exception as e:
-        logger.error(f"AI help generation failed for task {task_id}: {str(e)}", exc_info=True)
-        ai_reply = "AI is temporarily unavailable. Please try again later."
-        messages.error(request, "Could not generate AI help. Please check your API keys.")
-
-    TaskMessage.objects.create(task=task, sender="ai", content=ai_reply)
-    task.ai_solution = ai_reply
-    task.needs_help = False
-    task.save(update_fields=["ai_solution", "needs_help"])
+    enqueue(request.user, "task_reply", task_id=task.id, message=_task_help_prompt(task))
+    messages.info(request, "AI help is being generated…")
 
     return redirect("task_detail", task_id=task.id)
 
@@ -253,50 +292,190 @@ def public_library(request):
 def profile(request):
     stats, _ = UserStats.objects.get_or_create(user=request.user)
 
-    github = PlatformAccount.objects.filter(
-        user=request.user, platform__slug="github"
-    ).first()
+    accounts = {
+        account.platform.slug: account
+        for account in PlatformAccount.objects.filter(
+            user=request.user
+        ).select_related("platform")
+    }
 
-    leetcode = PlatformAccount.objects.filter(
-        user=request.user, platform__slug="leetcode"
-    ).first()
+    github = accounts.get("github")
+    leetcode = accounts.get("leetcode")
+    gfg = accounts.get("gfg")
+    codechef = accounts.get("codechef")
+    hackerrank = accounts.get("hackerrank")
 
-    gfg = PlatformAccount.objects.filter(
-        user=request.user, platform__slug="gfg"
-    ).first()
+    # show last-known stats now, refresh stale platforms in the background
+    revalidate_stale(request.user, accounts.values())
 
-    codechef = PlatformAccount.objects.filter(
-        user=request.user, platform__slug="codechef"
-    ).first()
+    gained = xp_gained(request.user, since=week_start())
 
-    hackerrank = PlatformAccount.objects.filter(
-        user=request.user, platform__slug="hackerrank"
-    ).first()
+    platform_stats = {
+        row.platform.slug: row
+        for row in PlatformStats.objects.filter(
+            user=request.user
+        ).select_related("platform")
+    }
+
+    def counter(slug, name):
+        row = platform_stats.get(slug)
+        return row.counter(name) if row else 0
+
+    distribution = current_distribution()
+
+    def top(slug):
+        row = platform_stats.get(slug)
+        return top_percent(distribution, row.platform_id, row.xp) if row else None
+
+    neighbours = rank_index.neighbours(request.user.pk)
+    names = dict(
+        User.objects.filter(pk__in=[user_id for _, user_id, _ in neighbours])
+        .values_list("pk", "username")
+    )
 
     context = {
         "stats": stats,
         "total_xp": stats.total_xp,
+        "rank": rank_index.rank(request.user.pk),
+        "ranked_users": rank_index.size(),
+        "rank_neighbours": [
+            {"rank": rank, "username": names.get(user_id, ""), "xp": xp, "me": user_id == request.user.pk}
+            for rank, user_id, xp in neighbours
+        ],
         "level": stats.level,
+        "total_top": top_percent(distribution, TOTAL, stats.total_xp),
         "github": github,
-        "github_commits": stats.total_commits,
-        "github_repos": stats.github_repos,
+        "github_commits": counter("github", "contributions"),
+        "github_repos": counter("github", "repos"),
+        "github_xp": counter("github", "xp"),
+        "github_top": top("github"),
         "leetcode": leetcode,
-        "leetcode_solved": stats.leetcode_solved,
-        "leetcode_xp": stats.leetcode_xp,
+        "leetcode_solved": counter("leetcode", "solved"),
+        "leetcode_xp": counter("leetcode", "xp"),
+        "leetcode_top": top("leetcode"),
+        "leetcode_easy": counter("leetcode", "easy"),
+        "leetcode_medium": counter("leetcode", "medium"),
+        "leetcode_hard": counter("leetcode", "hard"),
         "gfg": gfg,
-        "gfg_solved": stats.gfg_solved,
-        "gfg_xp": stats.gfg_xp,
+        "gfg_solved": counter("gfg", "solved"),
+        "gfg_xp": counter("gfg", "xp"),
+        "gfg_top": top("gfg"),
         "codechef": codechef,
-        "codechef_solved": stats.codechef_solved,
-        "codechef_xp": stats.codechef_xp,
+        "codechef_solved": counter("codechef", "solved"),
+        "codechef_rating": counter("codechef", "rating"),
+        "codechef_contests": counter("codechef", "contests"),
+        "codechef_xp": counter("codechef", "xp"),
+        "codechef_top": top("codechef"),
         "hackerrank": hackerrank,
-        "hackerrank_solved": stats.hackerrank_solved,
-        "hackerrank_xp": stats.hackerrank_xp,
+        "hackerrank_solved": counter("hackerrank", "solved"),
+        "hackerrank_xp": counter("hackerrank", "xp"),
+        "hackerrank_top": top("hackerrank"),
+        "xp_this_week": sum(gained.values()),
+        "xp_rules": {slug: describe_xp(slug) for slug in ("github", "leetcode", "gfg", "codechef", "hackerrank")},
+        "pending_jobs": active_jobs(request.user, kind__startswith="sync_"),
     }
 
     return render(request, "core/profile.html", context)
 
 
+# ==================================================
+# LEADERBOARD
+# Reads only the materialized LeaderboardEntry rows
+# (core.services.leaderboard) or, per platform and
+# week/month, the XPRollup rows (core.services.rollups);
+# never sorts UserStats or sums activity.
+# ==================================================
+
+@login_required
+def leaderboard(request):
+    platforms = Platform.objects.order_by("name")
+    platform = next((p for p in platforms if p.slug == request.GET.get("platform")), None)
+    period = request.GET.get("period")
+
+    if platform and period in ROLLUP_PERIODS:
+        entries = period_leaderboard(platform, period)
+        mine = XPRollup.objects.filter(
+            user=request.user, platform=platform, period=period,
+            start=period_start(period, timezone.localdate()),
+        ).first()
+        if mine:
+            mine.rank = period_rank(mine)
+        query = f"platform={platform.slug}&period={period}&"
+    else:
+        platform = period = None
+        entries = LeaderboardEntry.objects.select_related("user").order_by("rank", "id")
+        mine = LeaderboardEntry.objects.filter(user=request.user).first()
+        query = ""
+
+    page = Paginator(entries, settings.LEADERBOARD_PAGE_SIZE).get_page(request.GET.get("page"))
+
+    return render(request, "core/leaderboard.html", {
+        "page": page,
+        "mine": mine if mine and mine.rank else None,
+        "platforms": platforms,
+        "platform": platform,
+        "period": period,
+        "query": query,
+        "updated_at": page.object_list[0].updated_at if page.object_list and not period else None,
+    })
+
+
+# ==================================================
+# SYNC ALL PLATFORMS
+# ==================================================
+
+def _sync_platform_view(request, slug, label):
+    """Shared body of the per-platform sync views: queue a job unless fresh."""
+    if request_sync(request.user, slug):
+        messages.info(request, f"{label} sync started…")
+    else:
+        messages.info(request, f"{label} is already up to date.")
+    return redirect("profile")
+
+
+async def _sync_platform_view_inline(request, slug, label):
+    """_sync_platform_view() with the fetch awaited in the request (SYNC_INLINE)."""
+    user = await request.auser()
+    result = await async_sync_all_platforms(user, stale_only=True, slugs=[slug])
+    if slug in result["failed"]:
+        messages.error(request, f"{label} sync failed: {result['failed'][slug]}")
+    elif slug in result["synced"]:
+        messages.success(request, f"{label} synced!")
+    elif slug in result["busy"]:
+        messages.info(request, f"{label} is already syncing…")
+    else:
+        messages.info(request, f"{label} is already up to date.")
+    return redirect("profile")
+
+
+async def _sync_all_inline(request):
+    user = await request.auser()
+    result = await async_sync_all_platforms(user, stale_only=True)
+    if result["synced"]:
+        messages.success(request, f"Synced {len(result['synced'])} platform(s).")
+    for slug, error in result["failed"].items():
+        messages.error(request, f"{slug} sync failed: {error}")
+    if result["busy"]:
+        messages.info(request, f"Already syncing: {', '.join(result['busy'])}.")
+    if not (result["synced"] or result["failed"] or result["busy"]):
+        messages.info(request, "All platforms are already up to date.")
+    return redirect("profile")
+
+
+@login_required
+@_inline_twin(_sync_all_inline)
+def sync_all(request):
+    request_sync_all(request.user)
+    messages.info(request, "Syncing all platforms in the background…")
+    return redirect("profile")
+
+
+@login_required
+def job_status_view(request, job_id):
+    job = get_object_or_404(BackgroundJob, id=job_id, user=request.user)
+    return JsonResponse(job_status(job))
+
+
 # ==================================================
 # PLATFORM CONNECT / SYNC
 # FIX: removed duplicate add_github_username and sync_github definitions.
@@ -320,11 +499,12 @@ def add_github_username(request):
                 defaults={
                     "username": username,
                     "profile_url": f"https://github.com/{username}",
+                    # a (re)connected username starts with no sync history
+                    "last_synced": None,
+                    "fetch_strategy": "",
+                    "http_cache": {},
                 }
             )
-            stats, _ = UserStats.objects.get_or_create(user=request.user)
-            stats.github_username = username
-            stats.save(update_fields=["github_username"])
             messages.success(request, f"GitHub account @{username} connected!")
             return redirect("profile")
     else:
@@ -333,18 +513,20 @@ def add_github_username(request):
     return render(request, "core/add_github.html", {"form": form})
 
 
+async def _sync_github_inline(request):
+    await aget_object_or_404(
+        PlatformAccount, user=await request.auser(), platform__slug="github"
+    )
+    return await _sync_platform_view_inline(request, "github", "GitHub")
+
+
 @login_required
+@_inline_twin(_sync_github_inline)
 def sync_github(request):
-    account = get_object_or_404(
+    get_object_or_404(
         PlatformAccount, user=request.user, platform__slug="github"
     )
-    try:
-        from core.services.github import sync_github_activity
-        sync_github_activity(account)
-        messages.success(request, "GitHub synced successfully!")
-    except Exception as e:
-        messages.error(request, f"GitHub sync failed: {e}")
-    return redirect("profile")
+    return _sync_platform_view(request, "github", "GitHub")
 
 
 @login_required
@@ -352,12 +534,7 @@ def disconnect_github(request):
     PlatformAccount.objects.filter(
         user=request.user, platform__slug="github"
     ).delete()
-    stats, _ = UserStats.objects.get_or_create(user=request.user)
-    stats.github_username = None
-    stats.github_xp = 0
-    stats.total_commits = 0
-    stats.github_repos = 0
-    stats.recalculate_totals()
+    clear_platform_stats(request.user, "github")
     messages.success(request, "GitHub disconnected.")
     return redirect("profile")
 
@@ -367,18 +544,20 @@ def github_activity(request):
     account = PlatformAccount.objects.filter(
         user=request.user, platform__slug="github"
     ).first()
-    stats, _ = UserStats.objects.get_or_create(user=request.user)
+    stats = PlatformStats.objects.filter(
+        user=request.user, platform__slug="github"
+    ).first()
 
     activities = (
-        DailyActivity.objects.filter(account=account).order_by("-date")
+        DailyActivity.objects.filter(account=account, count__gt=0).order_by("-date")
         if account else []
     )
 
     return render(request, "core/github_activity.html", {
         "account": account,
         "activities": activities,
-        "total_commits": stats.total_commits,
-        "total_xp": stats.github_xp,
+        "total_commits": stats.counter("contributions") if stats else 0,
+        "total_xp": stats.xp if stats else 0,
     })
 
 
@@ -402,25 +581,24 @@ def add_leetcode(request):
                 defaults={
                     "username": username,
                     "profile_url": f"https://leetcode.com/{username}",
+                    "last_synced": None,
+                    "fetch_strategy": "",
+                    "http_cache": {},
                 }
             )
-            stats, _ = UserStats.objects.get_or_create(user=request.user)
-            stats.leetcode_username = username
-            stats.save(update_fields=["leetcode_username"])
             return redirect("leetcode_sync")
 
     return render(request, "core/add_leetcode.html")
 
 
+async def _leetcode_sync_inline(request):
+    return await _sync_platform_view_inline(request, "leetcode", "LeetCode")
+
+
 @login_required
+@_inline_twin(_leetcode_sync_inline)
 def leetcode_sync(request):
-    try:
-        from core.services.leetcode import sync_leetcode_by_username
-        sync_leetcode_by_username(request.user)
-        messages.success(request, "LeetCode synced!")
-    except Exception as e:
-        messages.error(request, f"LeetCode sync failed: {e}")
-    return redirect("profile")
+    return _sync_platform_view(request, "leetcode", "LeetCode")
 
 
 @login_required
@@ -428,18 +606,7 @@ def disconnect_leetcode(request):
     PlatformAccount.objects.filter(
         user=request.user, platform__slug="leetcode"
     ).delete()
-    stats, _ = UserStats.objects.get_or_create(user=request.user)
-    stats.leetcode_solved = 0
-    stats.leetcode_xp = 0
-    stats.leetcode_username = ""
-    stats.leetcode_easy = 0
-    stats.leetcode_medium = 0
-    stats.leetcode_hard = 0
-    stats.save(update_fields=[
-        "leetcode_solved", "leetcode_xp", "leetcode_username",
-        "leetcode_easy", "leetcode_medium", "leetcode_hard"
-    ])
-    stats.recalculate_totals()
+    clear_platform_stats(request.user, "leetcode")
     messages.success(request, "LeetCode disconnected.")
     return redirect("profile")
 
@@ -464,25 +631,24 @@ def add_gfg(request):
                 defaults={
                     "username": username,
                     "profile_url": f"https://auth.geeksforgeeks.org/user/{username}/",
+                    "last_synced": None,
+                    "fetch_strategy": "",
+                    "http_cache": {},
                 }
             )
-            stats, _ = UserStats.objects.get_or_create(user=request.user)
-            stats.gfg_username = username
-            stats.save(update_fields=["gfg_username"])
             return redirect("gfg_sync")
 
     return render(request, "core/add_gfg.html")
 
 
+async def _gfg_sync_inline(request):
+    return await _sync_platform_view_inline(request, "gfg", "GFG")
+
+
 @login_required
+@_inline_twin(_gfg_sync_inline)
 def gfg_sync(request):
-    try:
-        from core.services.gfg import sync_gfg_by_username
-        sync_gfg_by_username(request.user)
-        messages.success(request, "GFG synced!")
-    except Exception as e:
-        messages.error(request, f"GFG sync failed: {e}")
-    return redirect("profile")
+    return _sync_platform_view(request, "gfg", "GFG")
 
 
 @login_required
@@ -490,12 +656,7 @@ def disconnect_gfg(request):
     PlatformAccount.objects.filter(
         user=request.user, platform__slug="gfg"
     ).delete()
-    stats, _ = UserStats.objects.get_or_create(user=request.user)
-    stats.gfg_solved = 0
-    stats.gfg_xp = 0
-    stats.gfg_username = ""
-    stats.save(update_fields=["gfg_solved", "gfg_xp", "gfg_username"])
-    stats.recalculate_totals()
+    clear_platform_stats(request.user, "gfg")
     messages.success(request, "GFG disconnected.")
     return redirect("profile")
 
@@ -520,25 +681,24 @@ def add_codechef(request):
                 defaults={
                     "username": username,
                     "profile_url": f"https://www.codechef.com/users/{username}",
+                    "last_synced": None,
+                    "fetch_strategy": "",
+                    "http_cache": {},
                 }
             )
-            stats, _ = UserStats.objects.get_or_create(user=request.user)
-            stats.codechef_username = username
-            stats.save(update_fields=["codechef_username"])
             return redirect("codechef_sync")
 
     return render(request, "core/add_codechef.html")
 
 
+async def _codechef_sync_inline(request):
+    return await _sync_platform_view_inline(request, "codechef", "CodeChef")
+
+
 @login_required
+@_inline_twin(_codechef_sync_inline)
 def codechef_sync(request):
-    try:
-        from core.services.codechef import sync_codechef_by_username
-        sync_codechef_by_username(request.user)
-        messages.success(request, "CodeChef synced!")
-    except Exception as e:
-        messages.error(request, f"CodeChef sync failed: {e}")
-    return redirect("profile")
+    return _sync_platform_view(request, "codechef", "CodeChef")
 
 
 @login_required
@@ -546,20 +706,7 @@ def disconnect_codechef(request):
     PlatformAccount.objects.filter(
         user=request.user, platform__slug="codechef"
     ).delete()
-    stats, _ = UserStats.objects.get_or_create(user=request.user)
-    stats.codechef_username = ""
-    stats.codechef_solved = 0
-    stats.codechef_rating = 0
-    stats.codechef_contests = 0
-    stats.codechef_xp = 0
-    stats.save(update_fields=[
-        "codechef_username",
-        "codechef_solved",
-        "codechef_rating",
-        "codechef_contests",
-        "codechef_xp",
-    ])
-    stats.recalculate_totals()
+    clear_platform_stats(request.user, "codechef")
     messages.success(request, "CodeChef disconnected.")
     return redirect("profile")
 
@@ -584,25 +731,24 @@ def add_hackerrank(request):
                 defaults={
                     "username": username,
                     "profile_url": f"https://www.hackerrank.com/profile/{username}",
+                    "last_synced": None,
+                    "fetch_strategy": "",
+                    "http_cache": {},
                 }
             )
-            stats, _ = UserStats.objects.get_or_create(user=request.user)
-            stats.hackerrank_username = username
-            stats.save(update_fields=["hackerrank_username"])
             return redirect("hackerrank_sync")
 
     return render(request, "core/add_hackerrank.html")
 
 
+async def _hackerrank_sync_inline(request):
+    return await _sync_platform_view_inline(request, "hackerrank", "HackerRank")
+
+
 @login_required
+@_inline_twin(_hackerrank_sync_inline)
 def hackerrank_sync(request):
-    try:
-        from core.services.hackerrank import sync_hackerrank_by_username
-        sync_hackerrank_by_username(request.user)
-        messages.success(request, "HackerRank synced!")
-    except Exception as e:
-        messages.error(request, f"HackerRank sync failed: {e}")
-    return redirect("profile")
+    return _sync_platform_view(request, "hackerrank", "HackerRank")
 
 
 @login_required
@@ -610,16 +756,7 @@ def disconnect_hackerrank(request):
     PlatformAccount.objects.filter(
         user=request.user, platform__slug="hackerrank"
     ).delete()
-    stats, _ = UserStats.objects.get_or_create(user=request.user)
-    stats.hackerrank_username = ""
-    stats.hackerrank_solved = 0
-    stats.hackerrank_xp = 0
-    stats.save(update_fields=[
-        "hackerrank_username",
-        "hackerrank_solved",
-        "hackerrank_xp",
-    ])
-    stats.recalculate_totals()
+    clear_platform_stats(request.user, "hackerrank")
     messages.success(request, "HackerRank disconnected.")
     return redirect("profile")
 
@@ -674,24 +811,11 @@ def learning_goals(request):
     })
 
 
-@login_required
-def start_learning(request, goal_id):
-    """Generate learning path and resources for a goal."""
-    goal = get_object_or_404(LearningGoal, id=goal_id, user=request.user)
-
-    if not goal.ai_solution:
-        try:
-            goal.ai_solution = generate_goal_solution(goal.title)
-            goal.save(update_fields=["ai_solution"])
-        except Exception as e:
-            logger.error(f"AI solution generation failed for goal {goal_id}: {str(e)}", exc_info=True)
-            goal.ai_solution = "AI unavailable. Try again later."
-            messages.warning(request, "Could not generate AI learning path. Please check your API configuration.")
-
+def _learning_page(request, goal):
     try:
         seed_resources_by_goal(goal.title)
     except Exception as e:
-        logger.warning(f"Resource seeding failed for goal {goal_id}: {str(e)}")
+        logger.warning(f"Resource seeding failed for goal {goal.id}: {str(e)}")
         # Don't fail completely if resources can't be seeded
 
     # Get resources for this goal only
@@ -701,9 +825,33 @@ def start_learning(request, goal_id):
         "goal": goal,
         "solution": goal.ai_solution,
         "resources": resources,
+        "pending_jobs": active_jobs(request.user, kind="goal_solution", payload__goal_id=goal.id),
     })
 
 
+async def _start_learning_inline(request, goal_id):
+    goal = await aget_object_or_404(LearningGoal, id=goal_id, user=await request.auser())
+    if not goal.ai_solution:
+        goal.ai_solution = await agenerate_goal_solution(goal.title)
+        await goal.asave(update_fields=["ai_solution"])
+    return await sync_to_async(_learning_page)(request, goal)
+
+
+@login_required
+@_inline_twin(_start_learning_inline)
+def start_learning(request, goal_id):
+    """Generate learning path and resources for a goal."""
+    goal = get_object_or_404(LearningGoal, id=goal_id, user=request.user)
+
+    if not goal.ai_solution:
+        enqueue(
+            request.user, "goal_solution",
+            dedupe_key=f"goal_solution:{goal.id}", goal_id=goal.id,
+        )
+
+    return _learning_page(request, goal)
+
+
 # ==================================================
 # STUDY SESSIONS
 # ==================================================